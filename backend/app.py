@@ -4,37 +4,67 @@ import json
 import os
 import tempfile
 import threading
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Literal
 
 from fastapi import Body, FastAPI, File, Form, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
-from .attribution import apply_assignments, build_assignment_map
-from .comparison import compare_tasks
-from .csv_import import parse_tasks_from_csv_bytes
+from .assignment_store import DEFAULT_ASSIGNMENT, comparison_identity, is_default_assignment, open_assignment_store
+from .attribution import AttributionAggregates, apply_assignments
+from .attribution_history import AttributionHistory
+from .bundle import input_file_record, iter_bundle, iter_file, iter_result_json
+from .carry_forward import carry_forward_assignments
+from .columnar_export import export_columnar
+from .comparison import compare_tasks, compare_tasks_to_store
+from .csv_import import header_signature, parse_tasks_from_csv_bytes, read_csv_headers
+from .csv_profiles import open_csv_profile_store
 from .parser_bridge import MppParseError, parse_mpp
 from .preview import (
     apply_preview_match_edits,
     analyze_preview_session,
     build_preview_init_response,
+    build_preview_result_delta,
     build_preview_rows_response,
     create_preview_session,
     get_preview_session,
 )
-from .progress_jobs import ProgressJobStore
-from .reporting import build_csv, build_pdf
+from .pdf_cache import PageGroupCache, open_pdf_cache, pdf_cache_key
+from .progress_jobs import JobCancelled, ProgressJobStore
+from .reporting import build_pdf, build_windows_csv, iter_csv_chunks
+from .result_store import create_result_store, get_result_store
+from .rollup import RollupTree
+from .rules import CompiledRule, compile_rules, index_hierarchy, plan_rule_assignments
 from .schemas import (
     AttributionApplyRequest,
+    AttributionPatch,
+    AttributionRule,
+    AttributionRulesRequest,
+    AttributionRulesResponse,
+    BundleManifest,
+    CarryForwardRequest,
     CsvImportDiagnostics,
+    CsvProfilePinRequest,
     CompareResult,
+    CompareResultResponse,
+    InputFileRecord,
     MatchOverride,
     PreviewAnalyzeRequest,
     PreviewMatchEditRequest,
+    PreviewResultResponse,
+    ResultDiffPage,
+    RollupResponse,
+    TaskRecord,
+    WhatIfRequest,
+    WindowsReport,
 )
 from .versioning import read_version
+from .what_if import collect_what_if_inputs, run_what_if
+from .windows import ProgrammeUpdate, analyze_windows
+from .xlsx_report import XLSX_MEDIA_TYPE, iter_xlsx_chunks
 from .xml_import import parse_tasks_from_project_xml_bytes
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -45,6 +75,13 @@ PARSER_JAR = Path(
     )
 )
 
+# Process-pool size for partitioned compare; 1 keeps the serial path.
+COMPARE_WORKERS = max(1, int(os.environ.get("EOT_COMPARE_WORKERS", "1")))
+# Process-pool size for chunked PDF rendering; 1 renders on one canvas.
+PDF_WORKERS = max(1, int(os.environ.get("EOT_PDF_WORKERS", "1")))
+# Process-pool size for windows analysis; 1 compares the windows in turn.
+WINDOWS_WORKERS = max(1, int(os.environ.get("EOT_WINDOWS_WORKERS", "1")))
+
 DEFAULT_CSV_COLUMN_MAP = {
     "uid": "Unique ID",
     "name": "Task Name",
@@ -71,25 +108,146 @@ app.add_middleware(
 
 LAST_RESULT: CompareResult | None = None
 LAST_ASSIGNMENTS: dict[str, dict] = {}
+LAST_COMPARISON_ID = ""
+LAST_INPUT_FILES: list[InputFileRecord] = []
+PREVIOUS_RESULT: CompareResult | None = None
+PREVIOUS_ASSIGNMENTS: dict[str, dict] = {}
+LAST_TASKS: tuple[list[TaskRecord], list[TaskRecord]] = ([], [])
+LAST_RESULT_VERSION = 0
+LAST_ROLLUP: tuple[int, RollupTree] | None = None
+LAST_AGGREGATES: AttributionAggregates | None = None
+LAST_HISTORY = AttributionHistory()
 LAST_RESULT_LOCK = threading.Lock()
+LAST_WINDOWS_REPORT: WindowsReport | None = None
 PROGRESS_JOBS = ProgressJobStore(ttl_seconds=600, max_jobs=64)
+ASSIGNMENT_STORE = open_assignment_store(os.environ.get("EOT_DATA_DIR"))
+PDF_CACHE = open_pdf_cache(os.environ.get("EOT_DATA_DIR"))
+CSV_PROFILES = open_csv_profile_store(os.environ.get("EOT_DATA_DIR"))
+PDF_PAGE_CACHE = PageGroupCache()
+
+
+def _load_active_rules() -> list[CompiledRule]:
+    if ASSIGNMENT_STORE is None:
+        return []
+    return compile_rules([AttributionRule.model_validate(rule) for rule in ASSIGNMENT_STORE.load_rules()])
+
+
+ACTIVE_RULES: list[CompiledRule] = _load_active_rules()
 
 
 def _parse_overrides(overrides_json: str) -> list[MatchOverride]:
     return [MatchOverride.model_validate(item) for item in json.loads(overrides_json)]
 
 
-def _set_last_result(result: CompareResult) -> CompareResult:
-    global LAST_RESULT, LAST_ASSIGNMENTS
+def _set_last_result(
+    result: CompareResult,
+    left_tasks: list[TaskRecord] | None = None,
+    right_tasks: list[TaskRecord] | None = None,
+    comparison_id: str = "",
+    assignment_map: dict[str, dict] | None = None,
+    input_files: list[InputFileRecord] | None = None,
+) -> tuple[CompareResult, int]:
+    """Install `result` as the active comparison; returns it with its result version."""
+    global LAST_RESULT, LAST_ASSIGNMENTS, LAST_TASKS, LAST_RESULT_VERSION, LAST_COMPARISON_ID
+    global PREVIOUS_RESULT, PREVIOUS_ASSIGNMENTS, LAST_INPUT_FILES
     with LAST_RESULT_LOCK:
+        if LAST_RESULT is not None and (not comparison_id or comparison_id != LAST_COMPARISON_ID):
+            # Keep the outgoing comparison so its tags can be carried to the next revision.
+            PREVIOUS_RESULT, PREVIOUS_ASSIGNMENTS = LAST_RESULT, dict(LAST_ASSIGNMENTS)
         LAST_RESULT = result
-        LAST_ASSIGNMENTS = build_assignment_map(result.diffs, LAST_ASSIGNMENTS)
-        return LAST_RESULT
+        # Only rows with an explicit entry are tracked; a missing key means the default tag.
+        LAST_ASSIGNMENTS = dict(assignment_map) if assignment_map is not None else {}
+        LAST_TASKS = (list(left_tasks or []), list(right_tasks or []))
+        LAST_RESULT_VERSION += 1
+        LAST_COMPARISON_ID = comparison_id
+        LAST_INPUT_FILES = list(input_files or [])
+        if ACTIVE_RULES:
+            report = _apply_rules_locked(ACTIVE_RULES, record_history=False)
+            if report.rows_updated:
+                _persist_touched_assignments_locked(LAST_AGGREGATES)
+        return LAST_RESULT, LAST_RESULT_VERSION
+
+
+def _rollup_locked() -> RollupTree:
+    global LAST_ROLLUP
+    if LAST_ROLLUP is None or LAST_ROLLUP[0] != LAST_RESULT_VERSION:
+        left_tasks, right_tasks = LAST_TASKS
+        LAST_ROLLUP = (LAST_RESULT_VERSION, RollupTree(LAST_RESULT.diffs, left_tasks, right_tasks))
+    return LAST_ROLLUP[1]
+
+
+def _aggregates_locked() -> AttributionAggregates:
+    global LAST_AGGREGATES, LAST_HISTORY
+    if LAST_AGGREGATES is None or LAST_AGGREGATES.result is not LAST_RESULT:
+        # A new result invalidates both the running totals and its edit history.
+        LAST_AGGREGATES = AttributionAggregates(LAST_RESULT)
+        LAST_HISTORY = AttributionHistory()
+    return LAST_AGGREGATES
+
+
+def _apply_rules_locked(compiled: list[CompiledRule], *, record_history: bool = True, dry_run: bool = False):
+    global LAST_RESULT, LAST_ASSIGNMENTS
+
+    aggregates = _aggregates_locked()
+    left_tasks, right_tasks = LAST_TASKS
+    index_hierarchy(aggregates.index, LAST_RESULT.diffs, left_tasks, right_tasks)
+    assignments, rule_hits, report = plan_rule_assignments(compiled, aggregates, LAST_ASSIGNMENTS)
+    if assignments and not dry_run:
+        LAST_RESULT, LAST_ASSIGNMENTS = apply_assignments(
+            LAST_RESULT,
+            assignments=assignments,
+            assignment_map=LAST_ASSIGNMENTS,
+            aggregates=aggregates,
+            rule_hits=rule_hits,
+        )
+        if record_history:
+            LAST_HISTORY.record(f"rules {len(assignments)} row(s)", aggregates.last_changes)
+    return report
+
+
+def _persist_touched_assignments_locked(aggregates: AttributionAggregates) -> None:
+    if ASSIGNMENT_STORE is None or not LAST_COMPARISON_ID:
+        return
+    ASSIGNMENT_STORE.put_many(
+        LAST_COMPARISON_ID,
+        {key: LAST_ASSIGNMENTS.get(key, DEFAULT_ASSIGNMENT) for key in aggregates.touched_keys},
+    )
 
 
-def _get_assignment_map() -> dict[str, dict]:
+def _attribution_response_locked(response_mode: str, base_version: int, aggregates: AttributionAggregates) -> dict:
+    if response_mode != "patch":
+        return LAST_RESULT.model_dump()
+    patch = AttributionPatch(
+        version=LAST_RESULT_VERSION,
+        base_version=base_version,
+        rows=[aggregates.diff_by_key[key] for key in aggregates.touched_keys],
+        summary=LAST_RESULT.summary,
+        fault_allocation=LAST_RESULT.fault_allocation,
+    )
+    return patch.model_dump()
+
+
+def _history_label(payload: AttributionApplyRequest) -> str:
+    parts = []
+    if payload.assignments:
+        parts.append(f"{len(payload.assignments)} row edit(s)")
+    if payload.bulk is not None:
+        parts.append(f"bulk {payload.bulk.cause_tag}")
+    return ", ".join(parts) or "no-op"
+
+
+def _get_assignment_map(comparison_id: str = "") -> dict[str, dict]:
+    """Tags recorded for `comparison_id`; another comparison's tags are never reused.
+
+    The in-memory map only caches the active comparison; others come from disk.
+    Carrying tags over from the previous comparison is the explicit carry-forward step.
+    """
     with LAST_RESULT_LOCK:
-        return dict(LAST_ASSIGNMENTS)
+        if not comparison_id or comparison_id == LAST_COMPARISON_ID:
+            return dict(LAST_ASSIGNMENTS)
+    if ASSIGNMENT_STORE is None:
+        return {}
+    return ASSIGNMENT_STORE.load(comparison_id)
 
 
 def _file_kind(filename: str | None) -> str:
@@ -142,6 +300,45 @@ def _diagnostics_to_warnings(side_label: str, diagnostics: CsvImportDiagnostics)
     return warnings
 
 
+def _parse_file_from_bytes(
+    *,
+    filename: str | None,
+    data: bytes,
+    kind: str,
+    column_map_json: str,
+    side: str,
+    side_label: str,
+) -> tuple[list, list[str]]:
+    if kind == ".mpp":
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            safe_name = Path(filename or f"{side}.mpp").name
+            path = Path(tmp_dir) / f"{side}_{safe_name}"
+            path.write_bytes(data)
+            return parse_mpp(path, PARSER_JAR), []
+
+    if kind == ".xml":
+        return parse_tasks_from_project_xml_bytes(data), []
+
+    if kind == ".csv":
+        column_map = _parse_csv_map(column_map_json, side)
+        headers = read_csv_headers(data)
+        # A customised mapping wins; with the defaults, reuse what this template resolved to last time.
+        saved_profile = None
+        if column_map == DEFAULT_CSV_COLUMN_MAP:
+            saved_profile = CSV_PROFILES.get(header_signature(headers))
+        tasks, diagnostics = parse_tasks_from_csv_bytes(
+            data,
+            column_map,
+            allow_inference=True,
+            return_diagnostics=True,
+            saved_profile=saved_profile,
+        )
+        CSV_PROFILES.record_import(headers, diagnostics)
+        return tasks, _diagnostics_to_warnings(side_label, diagnostics)
+
+    raise ValueError(f"Unsupported file type: {kind}")
+
+
 def _parse_pair_from_bytes(
     *,
     left_filename: str | None,
@@ -154,51 +351,34 @@ def _parse_pair_from_bytes(
     progress: ProgressCallback | None = None,
 ) -> tuple[list, list, list[str]]:
     _emit(progress, 20, "Parsing inputs", "Normalizing file payloads")
-
-    if left_kind == ".mpp":
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            tmp = Path(tmp_dir)
-            left_safe = left_filename or "left.mpp"
-            right_safe = right_filename or "right.mpp"
-            left_path = tmp / f"left_{Path(left_safe).name}"
-            right_path = tmp / f"right_{Path(right_safe).name}"
-            left_path.write_bytes(left_bytes)
-            right_path.write_bytes(right_bytes)
-
-            _emit(progress, 35, "Parsing inputs", "Parsing Programme A .mpp")
-            left_tasks = parse_mpp(left_path, PARSER_JAR)
-            _emit(progress, 55, "Parsing inputs", "Parsing Programme B .mpp")
-            right_tasks = parse_mpp(right_path, PARSER_JAR)
-            return left_tasks, right_tasks, []
-
-    if left_kind == ".xml":
-        _emit(progress, 40, "Parsing inputs", "Parsing Programme A XML")
-        left_tasks = parse_tasks_from_project_xml_bytes(left_bytes)
-        _emit(progress, 60, "Parsing inputs", "Parsing Programme B XML")
-        right_tasks = parse_tasks_from_project_xml_bytes(right_bytes)
-        return left_tasks, right_tasks, []
+    if left_kind not in {".mpp", ".xml", ".csv"}:
+        raise ValueError(f"Unsupported file type: {left_kind}")
 
     if left_kind == ".csv":
-        left_map = _parse_csv_map(left_column_map_json, "left")
-        right_map = _parse_csv_map(right_column_map_json, "right")
-        _emit(progress, 40, "Parsing inputs", "Parsing Programme A CSV")
-        left_tasks, left_diag = parse_tasks_from_csv_bytes(
-            left_bytes,
-            left_map,
-            allow_inference=True,
-            return_diagnostics=True,
-        )
-        _emit(progress, 60, "Parsing inputs", "Parsing Programme B CSV")
-        right_tasks, right_diag = parse_tasks_from_csv_bytes(
-            right_bytes,
-            right_map,
-            allow_inference=True,
-            return_diagnostics=True,
-        )
-        warnings = _diagnostics_to_warnings("Programme A", left_diag) + _diagnostics_to_warnings("Programme B", right_diag)
-        return left_tasks, right_tasks, warnings
-
-    raise ValueError(f"Unsupported file type: {left_kind}")
+        # Validate both mappings before doing any parsing work.
+        _parse_csv_map(left_column_map_json, "left")
+        _parse_csv_map(right_column_map_json, "right")
+
+    kind_label = {".mpp": ".mpp", ".xml": "XML", ".csv": "CSV"}[left_kind]
+    _emit(progress, 35, "Parsing inputs", f"Parsing Programme A {kind_label}")
+    left_tasks, left_warnings = _parse_file_from_bytes(
+        filename=left_filename,
+        data=left_bytes,
+        kind=left_kind,
+        column_map_json=left_column_map_json,
+        side="left",
+        side_label="Programme A",
+    )
+    _emit(progress, 55, "Parsing inputs", f"Parsing Programme B {kind_label}")
+    right_tasks, right_warnings = _parse_file_from_bytes(
+        filename=right_filename,
+        data=right_bytes,
+        kind=left_kind,
+        column_map_json=right_column_map_json,
+        side="right",
+        side_label="Programme B",
+    )
+    return left_tasks, right_tasks, left_warnings + right_warnings
 
 
 async def _parse_uploaded_pair(
@@ -240,6 +420,7 @@ def _compare_auto_operation(
         raise ValueError(f"Both files must be the same type. Received {left_kind} and {right_kind}.")
 
     overrides = _parse_overrides(overrides_json)
+    comparison_id = comparison_identity(left_bytes, right_bytes)
 
     left_tasks, right_tasks, import_warnings = _parse_pair_from_bytes(
         left_filename=left_filename,
@@ -253,17 +434,141 @@ def _compare_auto_operation(
     )
 
     _emit(progress, 80, "Comparing programmes", "Running task matching and diff")
+    assignment_map = _get_assignment_map(comparison_id)
     result = compare_tasks(
         left_tasks=left_tasks,
         right_tasks=right_tasks,
         include_baseline=include_baseline,
         overrides=overrides,
-        assignment_map=_get_assignment_map(),
+        assignment_map=assignment_map,
+        max_workers=COMPARE_WORKERS,
     )
     result.import_warnings = import_warnings
 
     _emit(progress, 95, "Finalizing", "Preparing compare result")
-    return _set_last_result(result).model_dump()
+    input_files = [
+        input_file_record("left", left_filename, left_bytes),
+        input_file_record("right", right_filename, right_bytes),
+    ]
+    result, version = _set_last_result(result, left_tasks, right_tasks, comparison_id, assignment_map, input_files)
+    # The version lets the client patch attribution edits without refetching the result.
+    return {**result.model_dump(), "version": version}
+
+
+def _compare_stream_operation(
+    *,
+    left_filename: str | None,
+    right_filename: str | None,
+    left_bytes: bytes,
+    right_bytes: bytes,
+    include_baseline: bool,
+    overrides_json: str,
+    left_column_map_json: str,
+    right_column_map_json: str,
+    progress: ProgressCallback | None = None,
+) -> dict:
+    _emit(progress, 5, "Validating inputs", "Checking file extensions")
+    left_kind = _file_kind(left_filename)
+    right_kind = _file_kind(right_filename)
+    if left_kind != right_kind:
+        raise ValueError(f"Both files must be the same type. Received {left_kind} and {right_kind}.")
+
+    overrides = _parse_overrides(overrides_json)
+    comparison_id = comparison_identity(left_bytes, right_bytes)
+
+    left_tasks, right_tasks, import_warnings = _parse_pair_from_bytes(
+        left_filename=left_filename,
+        right_filename=right_filename,
+        left_bytes=left_bytes,
+        right_bytes=right_bytes,
+        left_kind=left_kind,
+        left_column_map_json=left_column_map_json,
+        right_column_map_json=right_column_map_json,
+        progress=progress,
+    )
+
+    _emit(progress, 80, "Comparing programmes", "Streaming task diffs to result store")
+    store = create_result_store()
+    result = compare_tasks_to_store(
+        left_tasks=left_tasks,
+        right_tasks=right_tasks,
+        include_baseline=include_baseline,
+        store=store,
+        overrides=overrides,
+        assignment_map=_get_assignment_map(comparison_id),
+    )
+    result.import_warnings = import_warnings
+
+    _emit(progress, 95, "Finalizing", "Preparing streamed compare summary")
+    return result.model_dump()
+
+
+def _parse_data_dates(data_dates_json: str, count: int) -> list[date | None]:
+    raw = json.loads(data_dates_json or "[]")
+    if not isinstance(raw, list):
+        raise ValueError("data_dates_json must be a JSON list of ISO dates")
+    if raw and len(raw) != count:
+        raise ValueError(f"Expected {count} data dates, received {len(raw)}")
+    if not raw:
+        return [None] * count
+    try:
+        return [date.fromisoformat(value) if value else None for value in raw]
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid data date: {exc}") from exc
+
+
+def _windows_operation(
+    *,
+    uploads: list[tuple[str | None, bytes]],
+    data_dates_json: str,
+    include_baseline: bool,
+    column_map_json: str,
+    progress: ProgressCallback | None = None,
+) -> dict:
+    global LAST_WINDOWS_REPORT
+
+    _emit(progress, 5, "Validating inputs", "Checking file extensions")
+    if len(uploads) < 2:
+        raise ValueError("Upload at least two programme updates for windows analysis")
+    kinds = {_file_kind(filename) for filename, _ in uploads}
+    if len(kinds) != 1:
+        raise ValueError(f"All updates must be the same type. Received {', '.join(sorted(kinds))}.")
+    kind = kinds.pop()
+    data_dates = _parse_data_dates(data_dates_json, len(uploads))
+
+    updates: list[ProgrammeUpdate] = []
+    import_warnings: list[str] = []
+    for index, (filename, data) in enumerate(uploads):
+        label = f"Update {index + 1}"
+        _emit(progress, 10 + (60 * index / len(uploads)), "Parsing inputs", f"Parsing {label}")
+        tasks, warnings = _parse_file_from_bytes(
+            filename=filename,
+            data=data,
+            kind=kind,
+            column_map_json=column_map_json,
+            side=f"update{index + 1}",
+            side_label=label,
+        )
+        updates.append(ProgrammeUpdate(label=filename or label, tasks=tasks, data_date=data_dates[index]))
+        import_warnings.extend(warnings)
+
+    _emit(progress, 75, "Analyzing windows", f"Comparing {len(updates) - 1} window(s)")
+    # Each window only picks up tags recorded for its own pair of files.
+    assignment_maps = [
+        _get_assignment_map(comparison_identity(before, after))
+        for (_, before), (_, after) in zip(uploads, uploads[1:])
+    ]
+    report = analyze_windows(
+        updates,
+        include_baseline=include_baseline,
+        assignment_maps=assignment_maps,
+        max_workers=WINDOWS_WORKERS,
+    )
+    report.import_warnings = import_warnings
+    with LAST_RESULT_LOCK:
+        LAST_WINDOWS_REPORT = report
+    _emit(progress, 95, "Finalizing", "Preparing windows report")
+    return report.model_dump()
 
 
 def _preview_init_operation(
@@ -304,6 +609,11 @@ def _preview_init_operation(
         left_tasks=left_tasks,
         right_tasks=right_tasks,
         import_warnings=import_warnings,
+        comparison_id=comparison_identity(left_bytes, right_bytes),
+        input_files=[
+            input_file_record("left", left_filename, left_bytes),
+            input_file_record("right", right_filename, right_bytes),
+        ],
     )
     response = build_preview_init_response(
         session,
@@ -321,11 +631,32 @@ def _preview_analyze_operation(
 ) -> dict:
     _emit(progress, 10, "Resolving session", "Loading preview session")
     session = get_preview_session(payload.session_id)
+    previous, previous_version = session.last_result, session.result_version
+    if payload.base_version is not None and payload.base_version != previous_version:
+        # The client is out of sync; send a delta from empty so it can rebuild its state.
+        previous = None
     _emit(progress, 65, "Analyzing preview", "Running full compare with selected matches")
-    result = analyze_preview_session(session, assignment_map=_get_assignment_map())
+    assignment_map = _get_assignment_map(session.comparison_id)
+    result = analyze_preview_session(
+        session,
+        assignment_map=assignment_map,
+        max_workers=COMPARE_WORKERS,
+    )
     result.import_warnings = list(session.import_warnings)
     _emit(progress, 95, "Finalizing", "Preparing analysis result")
-    return _set_last_result(result).model_dump()
+    result, version = _set_last_result(
+        result,
+        session.left_tasks,
+        session.right_tasks,
+        session.comparison_id,
+        assignment_map,
+        session.input_files,
+    )
+    if payload.response_mode == "delta":
+        delta = build_preview_result_delta(session, previous, previous_version)
+        delta.result_version = version
+        return delta.model_dump()
+    return {**result.model_dump(), "version": version}
 
 
 def _start_progress_job(operation: str, runner: Callable[[ProgressCallback], dict]) -> str:
@@ -333,6 +664,8 @@ def _start_progress_job(operation: str, runner: Callable[[ProgressCallback], dic
 
     def target() -> None:
         def progress(pct: float, stage: str, detail: str) -> None:
+            if PROGRESS_JOBS.is_cancelled(job_id):
+                raise JobCancelled(job_id)
             PROGRESS_JOBS.update_job(
                 job_id,
                 status="running",
@@ -345,6 +678,8 @@ def _start_progress_job(operation: str, runner: Callable[[ProgressCallback], dic
             progress(2, "Starting", "Initializing background job")
             result = runner(progress)
             PROGRESS_JOBS.complete_job(job_id, result)
+        except JobCancelled:
+            pass
         except (ValueError, KeyError, MppParseError, json.JSONDecodeError) as exc:
             PROGRESS_JOBS.fail_job(job_id, str(exc))
         except Exception as exc:  # pragma: no cover - defensive
@@ -368,6 +703,13 @@ def progress_job_status(job_id: str):
     return payload
 
 
+@app.post("/api/progress/jobs/{job_id}/cancel")
+def progress_job_cancel(job_id: str):
+    if PROGRESS_JOBS.get_job(job_id) is None:
+        return JSONResponse(status_code=404, content={"error": "Progress job not found or expired"})
+    return {"job_id": job_id, "cancelled": PROGRESS_JOBS.cancel_job(job_id)}
+
+
 @app.post("/api/progress/compare-auto")
 async def compare_auto_progress(
     left_file: UploadFile = File(...),
@@ -460,6 +802,71 @@ async def compare_auto(
         return JSONResponse(status_code=400, content={"error": str(exc)})
 
 
+@app.post("/api/compare-auto/stream")
+async def compare_auto_stream(
+    left_file: UploadFile = File(...),
+    right_file: UploadFile = File(...),
+    include_baseline: bool = Form(False),
+    overrides_json: str = Form("[]"),
+    left_column_map_json: str = Form(""),
+    right_column_map_json: str = Form(""),
+):
+    try:
+        left_bytes, right_bytes = await _read_upload_pair_bytes(left_file, right_file)
+        return _compare_stream_operation(
+            left_filename=left_file.filename,
+            right_filename=right_file.filename,
+            left_bytes=left_bytes,
+            right_bytes=right_bytes,
+            include_baseline=include_baseline,
+            overrides_json=overrides_json,
+            left_column_map_json=left_column_map_json,
+            right_column_map_json=right_column_map_json,
+        )
+    except (json.JSONDecodeError, ValueError, MppParseError) as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+
+
+@app.post("/api/windows/analyze")
+async def windows_analyze(
+    files: list[UploadFile] = File(...),
+    data_dates_json: str = Form("[]"),
+    include_baseline: bool = Form(False),
+    column_map_json: str = Form(""),
+):
+    try:
+        uploads = [(upload.filename, await upload.read()) for upload in files]
+        return _windows_operation(
+            uploads=uploads,
+            data_dates_json=data_dates_json,
+            include_baseline=include_baseline,
+            column_map_json=column_map_json,
+        )
+    except (json.JSONDecodeError, ValueError, MppParseError) as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+
+
+@app.get("/api/results/{result_id}/diffs")
+def result_diffs(result_id: str, offset: int = 0, limit: int = 200):
+    try:
+        store = get_result_store(result_id)
+    except KeyError as exc:
+        return JSONResponse(status_code=404, content={"error": str(exc.args[0])})
+
+    offset = max(0, offset)
+    limit = max(1, min(limit, 1000))
+    total_rows = store.count_diffs()
+    page = ResultDiffPage(
+        result_id=result_id,
+        offset=offset,
+        limit=limit,
+        total_rows=total_rows,
+        has_more=offset + limit < total_rows,
+        diffs=store.page_diffs(offset, limit),
+    )
+    return page.model_dump()
+
+
 @app.post("/api/preview/init")
 async def preview_init(
     left_file: UploadFile = File(...),
@@ -533,21 +940,206 @@ def preview_analyze(payload: PreviewAnalyzeRequest = Body(...)):
         return JSONResponse(status_code=400, content={"error": str(exc)})
 
 
+@app.get("/api/preview/result")
+def preview_result(session_id: str):
+    try:
+        session = get_preview_session(session_id)
+        if session.last_result is None:
+            raise ValueError("Preview session has not been analyzed yet")
+        response = PreviewResultResponse(
+            session_id=session.session_id,
+            version=session.result_version,
+            result=session.last_result,
+        )
+        return response.model_dump()
+    except (ValueError, KeyError) as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+
+
+@app.get("/api/result")
+def current_result():
+    with LAST_RESULT_LOCK:
+        if LAST_RESULT is None:
+            return JSONResponse(status_code=400, content={"error": "No comparison result available"})
+        return CompareResultResponse(version=LAST_RESULT_VERSION, result=LAST_RESULT).model_dump()
+
+
 @app.post("/api/attribution/apply")
 def attribution_apply(payload: AttributionApplyRequest = Body(...)):
-    global LAST_RESULT, LAST_ASSIGNMENTS
+    global LAST_RESULT, LAST_ASSIGNMENTS, LAST_RESULT_VERSION
 
     with LAST_RESULT_LOCK:
         if LAST_RESULT is None:
             return JSONResponse(status_code=400, content={"error": "No comparison result available"})
 
-        LAST_RESULT, LAST_ASSIGNMENTS = apply_assignments(
+        aggregates = _aggregates_locked()
+        try:
+            LAST_RESULT, LAST_ASSIGNMENTS = apply_assignments(
+                LAST_RESULT,
+                assignments=payload.assignments,
+                bulk=payload.bulk,
+                assignment_map=LAST_ASSIGNMENTS,
+                aggregates=aggregates,
+            )
+        except ValueError as exc:
+            return JSONResponse(status_code=400, content={"error": str(exc)})
+        LAST_HISTORY.record(_history_label(payload), aggregates.last_changes)
+        base_version = LAST_RESULT_VERSION
+        LAST_RESULT_VERSION += 1
+        _persist_touched_assignments_locked(aggregates)
+        return _attribution_response_locked(payload.response_mode, base_version, aggregates)
+
+
+def _step_history(step: str, response_mode: str):
+    global LAST_RESULT_VERSION
+
+    with LAST_RESULT_LOCK:
+        if LAST_RESULT is None:
+            return JSONResponse(status_code=400, content={"error": "No comparison result available"})
+
+        aggregates = _aggregates_locked()
+        try:
+            if step == "undo":
+                LAST_HISTORY.undo(aggregates, LAST_ASSIGNMENTS)
+            else:
+                LAST_HISTORY.redo(aggregates, LAST_ASSIGNMENTS)
+        except ValueError as exc:
+            return JSONResponse(status_code=400, content={"error": str(exc)})
+        base_version = LAST_RESULT_VERSION
+        LAST_RESULT_VERSION += 1
+        _persist_touched_assignments_locked(aggregates)
+        return _attribution_response_locked(response_mode, base_version, aggregates)
+
+
+@app.post("/api/attribution/undo")
+def attribution_undo(response_mode: Literal["full", "patch"] = "full"):
+    return _step_history("undo", response_mode)
+
+
+@app.post("/api/attribution/redo")
+def attribution_redo(response_mode: Literal["full", "patch"] = "full"):
+    return _step_history("redo", response_mode)
+
+
+@app.get("/api/attribution/history")
+def attribution_history():
+    with LAST_RESULT_LOCK:
+        if LAST_RESULT is None:
+            return JSONResponse(status_code=400, content={"error": "No comparison result available"})
+        _aggregates_locked()
+        return LAST_HISTORY.describe().model_dump()
+
+
+@app.post("/api/attribution/carry-forward")
+def attribution_carry_forward(payload: CarryForwardRequest = Body(...)):
+    global LAST_RESULT, LAST_ASSIGNMENTS, LAST_RESULT_VERSION
+
+    with LAST_RESULT_LOCK:
+        if LAST_RESULT is None:
+            return JSONResponse(status_code=400, content={"error": "No comparison result available"})
+        if PREVIOUS_RESULT is None:
+            return JSONResponse(status_code=400, content={"error": "No previous comparison to carry assignments from"})
+
+        assignments, report = carry_forward_assignments(
+            PREVIOUS_RESULT,
+            PREVIOUS_ASSIGNMENTS,
             LAST_RESULT,
-            assignments=payload.assignments,
-            bulk=payload.bulk,
-            assignment_map=LAST_ASSIGNMENTS,
+            LAST_ASSIGNMENTS,
+            min_similarity=payload.min_similarity,
         )
-        return LAST_RESULT.model_dump()
+        if assignments and not payload.dry_run:
+            aggregates = _aggregates_locked()
+            LAST_RESULT, LAST_ASSIGNMENTS = apply_assignments(
+                LAST_RESULT,
+                assignments=assignments,
+                assignment_map=LAST_ASSIGNMENTS,
+                aggregates=aggregates,
+            )
+            LAST_HISTORY.record(f"carry forward {len(assignments)} row(s)", aggregates.last_changes)
+            LAST_RESULT_VERSION += 1
+            _persist_touched_assignments_locked(aggregates)
+        report.version = LAST_RESULT_VERSION
+        return report.model_dump()
+
+
+@app.post("/api/attribution/rules")
+def attribution_rules(payload: AttributionRulesRequest = Body(...)):
+    global ACTIVE_RULES, LAST_RESULT_VERSION
+
+    try:
+        compiled = compile_rules(payload.rules)
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+
+    with LAST_RESULT_LOCK:
+        if not payload.dry_run:
+            ACTIVE_RULES = compiled
+            if ASSIGNMENT_STORE is not None:
+                ASSIGNMENT_STORE.put_rules([rule.model_dump() for rule in payload.rules])
+        response = AttributionRulesResponse(rules=payload.rules)
+        if LAST_RESULT is not None:
+            report = _apply_rules_locked(compiled, dry_run=payload.dry_run)
+            if report.rows_updated and not payload.dry_run:
+                LAST_RESULT_VERSION += 1
+                _persist_touched_assignments_locked(LAST_AGGREGATES)
+            report.version = LAST_RESULT_VERSION
+            response.report = report
+        return response.model_dump()
+
+
+@app.get("/api/attribution/rules")
+def attribution_rules_list():
+    with LAST_RESULT_LOCK:
+        return AttributionRulesResponse(rules=[compiled.rule for compiled in ACTIVE_RULES]).model_dump()
+
+
+@app.post("/api/attribution/what-if")
+def attribution_what_if(payload: WhatIfRequest = Body(...)):
+    with LAST_RESULT_LOCK:
+        if LAST_RESULT is None:
+            return JSONResponse(status_code=400, content={"error": "No comparison result available"})
+        try:
+            inputs = collect_what_if_inputs(LAST_RESULT, payload)
+        except ValueError as exc:
+            return JSONResponse(status_code=400, content={"error": str(exc)})
+    # Sampling only touches the snapshot, so it runs without holding the result lock.
+    return run_what_if(inputs, payload).model_dump()
+
+
+@app.get("/api/rollup")
+def rollup(node_id: int = 0, include_rows: bool = False):
+    with LAST_RESULT_LOCK:
+        if LAST_RESULT is None:
+            return JSONResponse(status_code=400, content={"error": "No comparison result available"})
+        try:
+            tree = _rollup_locked()
+            response = RollupResponse(node=tree.node(node_id), children=tree.children(node_id))
+            if include_rows:
+                wanted = set(tree.row_keys(node_id))
+                response.rows = [diff for diff in LAST_RESULT.diffs if diff.row_key in wanted]
+        except KeyError as exc:
+            return JSONResponse(status_code=404, content={"error": str(exc.args[0])})
+        return response.model_dump()
+
+
+@app.get("/api/csv-profiles")
+def csv_profiles_list():
+    return {"profiles": [profile.model_dump() for profile in CSV_PROFILES.list()]}
+
+
+@app.post("/api/csv-profiles/{signature}/pin")
+def csv_profile_pin(signature: str, payload: CsvProfilePinRequest = Body(...)):
+    profile = CSV_PROFILES.set_pinned(signature, payload.pinned)
+    if profile is None:
+        return JSONResponse(status_code=404, content={"error": "Unknown CSV mapping profile"})
+    return profile.model_dump()
+
+
+@app.delete("/api/csv-profiles/{signature}")
+def csv_profile_delete(signature: str):
+    if not CSV_PROFILES.delete(signature):
+        return JSONResponse(status_code=404, content={"error": "Unknown CSV mapping profile"})
+    return {"deleted": signature}
 
 
 @app.get("/api/export/csv")
@@ -555,29 +1147,161 @@ def export_csv():
     with LAST_RESULT_LOCK:
         if LAST_RESULT is None:
             return JSONResponse(status_code=400, content={"error": "No comparison result available"})
-        data = build_csv(LAST_RESULT)
+        # Only the snapshot is taken under the lock; rows are encoded while streaming.
+        snapshot = _aggregates_locked().snapshot()
+    return StreamingResponse(
+        iter_csv_chunks(snapshot),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="evidence-pack.csv"'},
+    )
+
+
+@app.get("/api/export/xlsx")
+def export_xlsx():
+    with LAST_RESULT_LOCK:
+        if LAST_RESULT is None:
+            return JSONResponse(status_code=400, content={"error": "No comparison result available"})
+        snapshot = _aggregates_locked().snapshot()
+    try:
+        chunks = iter_xlsx_chunks(snapshot)
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+    return StreamingResponse(
+        chunks,
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="evidence-pack.xlsx"'},
+    )
+
+
+@app.get("/api/export/columnar")
+def export_columnar_result(format: str = "auto"):
+    with LAST_RESULT_LOCK:
+        if LAST_RESULT is None:
+            return JSONResponse(status_code=400, content={"error": "No comparison result available"})
+        snapshot = _aggregates_locked().snapshot()
+    try:
+        export = export_columnar(snapshot, format)
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+    return Response(
+        content=export.content,
+        media_type=export.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{export.filename}"'},
+    )
+
+
+@app.get("/api/export/windows-csv")
+def export_windows_csv():
+    with LAST_RESULT_LOCK:
+        if LAST_WINDOWS_REPORT is None:
+            return JSONResponse(status_code=400, content={"error": "No windows analysis available"})
+        data = build_windows_csv(LAST_WINDOWS_REPORT)
     return Response(
         content=data,
         media_type="text/csv",
-        headers={"Content-Disposition": 'attachment; filename="evidence-pack.csv"'},
+        headers={"Content-Disposition": 'attachment; filename="windows-analysis.csv"'},
     )
 
 
+def _export_pdf_operation(cache_key: str, result: CompareResult, progress: ProgressCallback) -> dict:
+    """Render into the PDF cache unless an identical pack is already there."""
+    cached = PDF_CACHE.get(cache_key) is not None
+    if not cached:
+        partial = PDF_CACHE.reserve(cache_key)
+        try:
+            build_pdf(
+                result,
+                partial,
+                on_page=lambda pages, fraction: progress(
+                    5 + 90 * fraction, "Rendering PDF", f"{pages} page(s) rendered"
+                ),
+                workers=PDF_WORKERS,
+                page_cache=PDF_PAGE_CACHE,
+            )
+        except BaseException:
+            PDF_CACHE.discard(partial)
+            raise
+        PDF_CACHE.commit(cache_key, partial)
+    return {"cache_key": cache_key, "cached": cached, "download_url": f"/api/export/pdf/{cache_key}"}
+
+
+def _pdf_export_inputs() -> tuple[str, CompareResult] | JSONResponse:
+    with LAST_RESULT_LOCK:
+        if LAST_RESULT is None:
+            return JSONResponse(status_code=400, content={"error": "No comparison result available"})
+        # Rendering happens outside the lock from a snapshot that later edits cannot change.
+        snapshot = _aggregates_locked().snapshot()
+    return pdf_cache_key(snapshot, read_version()), snapshot
+
+
+def _pdf_file_response(cache_key: str):
+    path = PDF_CACHE.get(cache_key)
+    if path is None:
+        return JSONResponse(status_code=404, content={"error": "PDF not found or evicted; export it again"})
+    return FileResponse(str(path), media_type="application/pdf", filename="evidence-pack.pdf")
+
+
+@app.post("/api/progress/export/pdf")
+def export_pdf_progress():
+    inputs = _pdf_export_inputs()
+    if isinstance(inputs, JSONResponse):
+        return inputs
+    cache_key, snapshot = inputs
+    job_id = _start_progress_job("export_pdf", lambda progress: _export_pdf_operation(cache_key, snapshot, progress))
+    return {"job_id": job_id}
+
+
+@app.get("/api/export/pdf/{cache_key}")
+def export_pdf_download(cache_key: str):
+    try:
+        return _pdf_file_response(cache_key)
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+
+
 @app.get("/api/export/pdf")
 def export_pdf():
+    inputs = _pdf_export_inputs()
+    if isinstance(inputs, JSONResponse):
+        return inputs
+    cache_key, snapshot = inputs
+    _export_pdf_operation(cache_key, snapshot, lambda pct, stage, detail: None)
+    return _pdf_file_response(cache_key)
+
+
+@app.get("/api/export/bundle")
+def export_bundle():
     with LAST_RESULT_LOCK:
         if LAST_RESULT is None:
             return JSONResponse(status_code=400, content={"error": "No comparison result available"})
-        result = LAST_RESULT
-
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
-        pdf_path = Path(tmp_file.name)
+        snapshot = _aggregates_locked().snapshot()
+        assignments = {key: entry for key, entry in LAST_ASSIGNMENTS.items() if not is_default_assignment(entry)}
+        manifest = BundleManifest(
+            generated_at=datetime.now(timezone.utc).isoformat(),
+            app_version=read_version(),
+            comparison_id=LAST_COMPARISON_ID,
+            result_version=LAST_RESULT_VERSION,
+            inputs=list(LAST_INPUT_FILES),
+        )
 
-    build_pdf(result, pdf_path)
-    return FileResponse(
-        str(pdf_path),
-        media_type="application/pdf",
-        filename="evidence-pack.pdf",
+    def pdf_chunks():
+        # Rendered (or fetched from the PDF cache) only once the archive reaches this member.
+        cache_key = pdf_cache_key(snapshot, read_version())
+        _export_pdf_operation(cache_key, snapshot, lambda pct, stage, detail: None)
+        path = PDF_CACHE.get(cache_key)
+        if path is None:
+            raise ValueError("Rendered PDF was evicted before it could be bundled")
+        return iter_file(path)
+
+    members = [
+        ("evidence-pack.csv", lambda: iter_csv_chunks(snapshot)),
+        ("result.json", lambda: iter_result_json(snapshot, assignments)),
+        ("evidence-pack.pdf", pdf_chunks),
+    ]
+    return StreamingResponse(
+        iter_bundle(members, manifest),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="evidence-bundle.zip"'},
     )
 
 
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+STORE_FILENAME = "assignments.sqlite3"
+
+DEFAULT_ASSIGNMENT = {
+    "cause_tag": "unassigned",
+    "reason_code": "",
+    "confirm_low_confidence": False,
+    "override_auto": False,
+}
+
+
+def comparison_identity(left_bytes: bytes, right_bytes: bytes) -> str:
+    """Stable identity for a comparison, derived from the two input files."""
+    digest = hashlib.sha256()
+    digest.update(hashlib.sha256(left_bytes).digest())
+    digest.update(hashlib.sha256(right_bytes).digest())
+    return digest.hexdigest()
+
+
+def is_default_assignment(entry: dict) -> bool:
+    return all(entry.get(key, default) == default for key, default in DEFAULT_ASSIGNMENT.items())
+
+
+class AssignmentStore:
+    """Durable attribution assignments keyed by comparison identity and row key.
+
+    Rows tagged by rules keep the matching rule ids as ``rule_hits`` in their
+    payload, and the active rule set is stored alongside so both survive a restart.
+
+    SQLite in WAL mode: each apply is one short upsert transaction appended to the
+    log, and loading a comparison is a single primary-key range scan.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS assignments ("
+            "comparison_id TEXT NOT NULL, row_key TEXT NOT NULL, payload TEXT NOT NULL, "
+            "updated_at REAL NOT NULL, PRIMARY KEY (comparison_id, row_key)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS attribution_rules ("
+            "slot INTEGER PRIMARY KEY CHECK (slot = 0), payload TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def load(self, comparison_id: str) -> dict[str, dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT row_key, payload FROM assignments WHERE comparison_id = ?",
+                (comparison_id,),
+            ).fetchall()
+        return {row_key: json.loads(payload) for row_key, payload in rows}
+
+    def put_many(self, comparison_id: str, entries: dict[str, dict]) -> None:
+        if not entries:
+            return
+        now = time.time()
+        rows = [
+            (comparison_id, row_key, json.dumps(entry, separators=(",", ":"), sort_keys=True), now)
+            for row_key, entry in entries.items()
+        ]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO assignments (comparison_id, row_key, payload, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (comparison_id, row_key) DO UPDATE SET "
+                    "payload = excluded.payload, updated_at = excluded.updated_at",
+                    rows,
+                )
+
+    def load_rules(self) -> list[dict]:
+        """The active attribution rule set, in precedence order."""
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM attribution_rules WHERE slot = 0").fetchone()
+        return json.loads(row[0]) if row else []
+
+    def put_rules(self, rules: list[dict]) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO attribution_rules (slot, payload, updated_at) VALUES (0, ?, ?) "
+                    "ON CONFLICT (slot) DO UPDATE SET payload = excluded.payload, updated_at = excluded.updated_at",
+                    (json.dumps(rules, separators=(",", ":")), time.time()),
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_assignment_store(data_dir: str | None) -> AssignmentStore | None:
+    """Open the store under `data_dir`; persistence is disabled when it is unset."""
+    if not data_dir:
+        return None
+    return AssignmentStore(Path(data_dir) / STORE_FILENAME)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import date
 
+from .assignment_store import DEFAULT_ASSIGNMENT
+from .diff_query import DiffIndex, Term, parse_filter
 from .schemas import (
     AttributionAssignment,
     AttributionBulkFilter,
     AttributionStatus,
-    CauseTag,
     CompareResult,
     FaultAllocation,
     FaultMetric,
@@ -16,6 +18,20 @@ from .schemas import (
 
 ATTRIBUTION_SCOPE = {"changed", "added", "removed"}
 
+# TaskDiff fields that attribution edits may change; everything else is fixed by compare.
+ATTRIBUTION_ROW_FIELDS = (
+    "cause_tag",
+    "reason_code",
+    "auto_overridden",
+    "change_category",
+    "requires_user_input",
+    "auto_reason",
+    "flow_on_from_right_uids",
+    "attribution_status",
+    "included_in_totals",
+    "rule_hits",
+)
+
 
 def _safe_days(left: date | None, right: date | None) -> float:
     if left is None or right is None:
@@ -43,17 +59,6 @@ def _update_percentages(metric: FaultMetric) -> FaultMetric:
     return metric
 
 
-def _bucket_metric(metric: FaultMetric, cause_tag: CauseTag, days: float) -> None:
-    if cause_tag == "client":
-        metric.client_days += days
-    elif cause_tag == "contractor":
-        metric.contractor_days += days
-    elif cause_tag == "neutral":
-        metric.neutral_days += days
-    else:
-        metric.unassigned_days += days
-
-
 def _determine_status(diff: TaskDiff, confirmed_low_confidence: bool) -> tuple[AttributionStatus, bool]:
     if diff.status not in ATTRIBUTION_SCOPE:
         return "ready", False
@@ -74,28 +79,38 @@ def initialize_attribution(diffs: list[TaskDiff], assignment_map: dict[str, dict
     assignment_map = assignment_map or {}
 
     for diff in diffs:
-        diff.row_key = row_key_for_diff(diff)
-        diff.task_slippage_days = _safe_days(diff.left_finish, diff.right_finish)
-
-        prev = assignment_map.get(diff.row_key, {})
-        diff.cause_tag = prev.get("cause_tag", diff.cause_tag)
-        diff.reason_code = prev.get("reason_code", diff.reason_code)
-        override_auto = bool(prev.get("override_auto", diff.auto_overridden))
-        diff.auto_overridden = override_auto
-        if override_auto:
-            diff.change_category = "manual_override_actionable"
-            diff.requires_user_input = True
-            diff.auto_reason = "Promoted from automated classification by user override."
-            diff.flow_on_from_right_uids = []
-        confirmed_low_confidence = bool(prev.get("confirm_low_confidence", False))
-
-        status, included = _determine_status(diff, confirmed_low_confidence)
-        diff.attribution_status = status
-        diff.included_in_totals = included
+        _initialize_row(diff, assignment_map)
 
     return diffs
 
 
+def _initialize_row(diff: TaskDiff, assignment_map: dict[str, dict]) -> None:
+    diff.row_key = row_key_for_diff(diff)
+    diff.task_slippage_days = _safe_days(diff.left_finish, diff.right_finish)
+
+    prev = assignment_map.get(diff.row_key, {})
+    diff.cause_tag = prev.get("cause_tag", diff.cause_tag)
+    diff.reason_code = prev.get("reason_code", diff.reason_code)
+    # Rule provenance travels with the stored entry so rules still own the row after a reload.
+    diff.rule_hits = list(prev.get("rule_hits", diff.rule_hits))
+    override_auto = bool(prev.get("override_auto", diff.auto_overridden))
+    diff.auto_overridden = override_auto
+    if override_auto:
+        _promote_to_actionable(diff)
+    confirmed_low_confidence = bool(prev.get("confirm_low_confidence", False))
+
+    status, included = _determine_status(diff, confirmed_low_confidence)
+    diff.attribution_status = status
+    diff.included_in_totals = included
+
+
+def _promote_to_actionable(diff: TaskDiff) -> None:
+    diff.change_category = "manual_override_actionable"
+    diff.requires_user_input = True
+    diff.auto_reason = "Promoted from automated classification by user override."
+    diff.flow_on_from_right_uids = []
+
+
 def build_assignment_map(diffs: list[TaskDiff], previous: dict[str, dict] | None = None) -> dict[str, dict]:
     previous = previous or {}
     out: dict[str, dict] = {}
@@ -107,31 +122,170 @@ def build_assignment_map(diffs: list[TaskDiff], previous: dict[str, dict] | None
             "confirm_low_confidence": prev.get("confirm_low_confidence", False),
             "override_auto": prev.get("override_auto", diff.auto_overridden),
         }
+        if diff.rule_hits:
+            out[diff.row_key]["rule_hits"] = list(diff.rule_hits)
     return out
 
 
+@dataclass(frozen=True)
+class RowChange:
+    """Before/after attribution state of one row for a single apply."""
+
+    row_key: str
+    before: dict
+    after: dict
+
+
+def snapshot_row(diff: TaskDiff, assignment_map: dict[str, dict]) -> dict:
+    state = {name: getattr(diff, name) for name in ATTRIBUTION_ROW_FIELDS}
+    state["flow_on_from_right_uids"] = list(diff.flow_on_from_right_uids)
+    state["rule_hits"] = list(diff.rule_hits)
+    entry = assignment_map.get(diff.row_key)
+    state["assignment"] = dict(entry) if entry is not None else None
+    return state
+
+
+class AttributionAggregates:
+    """Running summary counters and fault-allocation totals for one result.
+
+    Built once per result in O(n); afterwards each row edit is applied as a
+    remove/add delta so totals stay current without rescanning every diff.
+    """
+
+    def __init__(self, result: CompareResult) -> None:
+        self.result = result
+        self.allocation = FaultAllocationAccumulator()
+        self.diff_by_key: dict[str, TaskDiff] = {}
+        self.action_required = 0
+        self.auto_flow_on = 0
+        self.identity_conflict = 0
+        self.touched_keys: list[str] = []
+        self.last_changes: list[RowChange] = []
+        self._shared: set[str] = set()
+        self._positions: dict[str, int] | None = None
+        for diff in result.diffs:
+            self.diff_by_key[diff.row_key] = diff
+            self.add(diff)
+        self.index = DiffIndex(result.diffs)
+
+    def add(self, diff: TaskDiff) -> None:
+        self.allocation.add(diff)
+        self.action_required += int(diff.requires_user_input)
+        self.auto_flow_on += int(diff.change_category == "date_shift_flow_on")
+        self.identity_conflict += int(diff.change_category == "identity_conflict")
+
+    def remove(self, diff: TaskDiff) -> None:
+        self.allocation.remove(diff)
+        self.action_required -= int(diff.requires_user_input)
+        self.auto_flow_on -= int(diff.change_category == "date_shift_flow_on")
+        self.identity_conflict -= int(diff.change_category == "identity_conflict")
+
+    def apply_to_result(self) -> None:
+        summary = self.result.summary
+        summary.action_required_tasks = self.action_required
+        summary.auto_resolved_tasks = len(self.result.diffs) - self.action_required
+        summary.auto_flow_on_tasks = self.auto_flow_on
+        summary.identity_conflict_tasks = self.identity_conflict
+        self.result.fault_allocation = self.allocation.fault_allocation(summary.project_finish_delay_days)
+
+    def snapshot(self) -> CompareResult:
+        """Return a point-in-time view of the result for reading outside the lock.
+
+        Rows are shared with the live result rather than copied; the next edit to a
+        shared row first swaps a private copy into the live result (copy-on-write),
+        so taking a snapshot costs O(n) references instead of O(n) row copies.
+        """
+        self._shared = set(self.diff_by_key)
+        result = self.result
+        return CompareResult.model_construct(
+            summary=result.summary.model_copy(),
+            candidates=list(result.candidates),
+            diffs=list(result.diffs),
+            fault_allocation=result.fault_allocation,
+            import_warnings=list(result.import_warnings),
+        )
+
+    def writable(self, row_key: str) -> TaskDiff:
+        """Live row for `row_key`, copied first if a snapshot still references it."""
+        diff = self.diff_by_key[row_key]
+        if row_key not in self._shared:
+            return diff
+        self._shared.discard(row_key)
+        if self._positions is None:
+            self._positions = {item.row_key: position for position, item in enumerate(self.result.diffs)}
+        diff = diff.model_copy()
+        self.result.diffs[self._positions[row_key]] = diff
+        self.diff_by_key[row_key] = diff
+        return diff
+
+    def restore_rows(self, states: list[tuple[str, dict]], assignment_map: dict[str, dict]) -> None:
+        """Put rows back to recorded snapshots, updating totals only for those rows."""
+        for row_key, state in states:
+            diff = self.writable(row_key)
+            self.remove(diff)
+            for name in ATTRIBUTION_ROW_FIELDS:
+                value = state[name]
+                setattr(diff, name, list(value) if isinstance(value, list) else value)
+            if state["assignment"] is None:
+                assignment_map.pop(row_key, None)
+            else:
+                assignment_map[row_key] = dict(state["assignment"])
+            self.add(diff)
+            self.index.refresh(diff)
+        self.touched_keys = [row_key for row_key, _ in states]
+        self.apply_to_result()
+
+
+def _bulk_row_keys(bulk: AttributionBulkFilter, index: DiffIndex) -> set[str]:
+    """Resolve a bulk filter to row keys through the secondary indexes."""
+    keys = set(index.all_keys)
+    if bulk.row_keys:
+        keys &= set(bulk.row_keys)
+    if bulk.statuses:
+        keys &= Term("status", tuple(bulk.statuses)).evaluate(index)
+    if bulk.confidence_bands:
+        keys &= Term("band", tuple(bulk.confidence_bands)).evaluate(index)
+    if bulk.query and keys:
+        keys &= parse_filter(bulk.query).evaluate(index)
+    return keys
+
+
 def apply_assignments(
     result: CompareResult,
     assignments: list[AttributionAssignment],
     bulk: AttributionBulkFilter | None = None,
     assignment_map: dict[str, dict] | None = None,
+    aggregates: AttributionAggregates | None = None,
+    rule_hits: dict[str, list[str]] | None = None,
 ) -> tuple[CompareResult, dict[str, dict]]:
-    assignment_map = assignment_map or build_assignment_map(result.diffs)
-
-    diff_by_key = {diff.row_key: diff for diff in result.diffs}
+    if assignment_map is None:
+        assignment_map = build_assignment_map(result.diffs)
+    if aggregates is None or aggregates.result is not result:
+        aggregates = AttributionAggregates(result)
+
+    # Bulk filters see the rows as they were before this request's edits.
+    bulk_keys = _bulk_row_keys(bulk, aggregates.index) if bulk is not None else set()
+    touched: dict[str, TaskDiff] = {}
+    before: dict[str, dict] = {}
+
+    def begin_edit(diff: TaskDiff) -> TaskDiff:
+        if diff.row_key not in touched:
+            before[diff.row_key] = snapshot_row(diff, assignment_map)
+            aggregates.remove(diff)
+            touched[diff.row_key] = aggregates.writable(diff.row_key)
+        return touched[diff.row_key]
 
     for item in assignments:
-        diff = diff_by_key.get(item.row_key)
+        diff = aggregates.diff_by_key.get(item.row_key)
         if diff is None:
             continue
+        diff = begin_edit(diff)
         diff.cause_tag = item.cause_tag
         diff.reason_code = item.reason_code
+        diff.rule_hits = []
         if item.override_auto:
             diff.auto_overridden = True
-            diff.change_category = "manual_override_actionable"
-            diff.requires_user_input = True
-            diff.auto_reason = "Promoted from automated classification by user override."
-            diff.flow_on_from_right_uids = []
+            _promote_to_actionable(diff)
         assignment_map[item.row_key] = {
             "cause_tag": item.cause_tag,
             "reason_code": item.reason_code,
@@ -140,16 +294,12 @@ def apply_assignments(
         }
 
     if bulk is not None:
-        for diff in result.diffs:
-            if bulk.row_keys and diff.row_key not in bulk.row_keys:
-                continue
-            if bulk.statuses and diff.status not in bulk.statuses:
-                continue
-            if bulk.confidence_bands and diff.confidence_band not in bulk.confidence_bands:
-                continue
-
+        for key in bulk_keys:
+            diff = aggregates.diff_by_key[key]
+            diff = begin_edit(diff)
             diff.cause_tag = bulk.cause_tag
             diff.reason_code = bulk.reason_code
+            diff.rule_hits = []
             assignment_map[diff.row_key] = {
                 "cause_tag": bulk.cause_tag,
                 "reason_code": bulk.reason_code,
@@ -157,61 +307,95 @@ def apply_assignments(
                 "override_auto": bool(assignment_map.get(diff.row_key, {}).get("override_auto", diff.auto_overridden)),
             }
 
-    initialize_attribution(result.diffs, assignment_map)
-    result.summary.action_required_tasks = sum(1 for diff in result.diffs if diff.requires_user_input)
-    result.summary.auto_resolved_tasks = sum(1 for diff in result.diffs if not diff.requires_user_input)
-    result.summary.auto_flow_on_tasks = sum(1 for diff in result.diffs if diff.change_category == "date_shift_flow_on")
-    result.summary.identity_conflict_tasks = sum(1 for diff in result.diffs if diff.change_category == "identity_conflict")
-    result.fault_allocation = compute_fault_allocation(result)
+    for key, hits in (rule_hits or {}).items():
+        diff = aggregates.diff_by_key.get(key)
+        if diff is None:
+            continue
+        diff = begin_edit(diff)
+        diff.rule_hits = list(hits)
+        entry = assignment_map.setdefault(key, dict(DEFAULT_ASSIGNMENT))
+        if hits:
+            entry["rule_hits"] = list(hits)
+        else:
+            entry.pop("rule_hits", None)
+
+    for diff in touched.values():
+        _initialize_row(diff, assignment_map)
+        aggregates.add(diff)
+        aggregates.index.refresh(diff)
+
+    aggregates.touched_keys = list(touched)
+    aggregates.last_changes = [
+        RowChange(row_key=key, before=before[key], after=snapshot_row(diff, assignment_map))
+        for key, diff in touched.items()
+    ]
+    aggregates.apply_to_result()
     return result, assignment_map
 
 
-def _project_share_by_row(result: CompareResult) -> dict[str, float]:
-    base_delay = result.summary.project_finish_delay_days
-    contributors = [
-        diff
-        for diff in result.diffs
-        if diff.status == "changed" and diff.task_slippage_days > 0 and (diff.requires_user_input or diff.auto_overridden)
-    ]
+def _is_project_contributor(diff: TaskDiff) -> bool:
+    return diff.status == "changed" and diff.task_slippage_days > 0 and (diff.requires_user_input or diff.auto_overridden)
 
-    total_weight = sum(diff.task_slippage_days for diff in contributors)
-    if base_delay <= 0 or total_weight <= 0:
-        return {}
 
-    shares: dict[str, float] = {}
-    for diff in contributors:
-        shares[diff.row_key] = base_delay * (diff.task_slippage_days / total_weight)
-    return shares
+class FaultAllocationAccumulator:
+    """Accumulates fault allocation one diff at a time.
 
+    Project finish impact is a pro-rata split of the base delay over contributor
+    slippage, so per-bucket contributor weights are enough to derive it once the
+    stream is complete.
+    """
 
-def compute_fault_allocation(result: CompareResult) -> FaultAllocation:
-    task_metric = FaultMetric()
-    project_metric = FaultMetric()
+    BUCKETS = ("client", "contractor", "neutral", "unassigned", "excluded_low_confidence")
 
-    project_shares = _project_share_by_row(result)
+    def __init__(self) -> None:
+        self.task_days: dict[str, float] = {bucket: 0.0 for bucket in self.BUCKETS}
+        self.project_weight: dict[str, float] = {bucket: 0.0 for bucket in self.BUCKETS}
+        self.total_project_weight = 0.0
 
-    for diff in result.diffs:
-        if diff.status not in ATTRIBUTION_SCOPE:
-            continue
-        if not diff.requires_user_input and not diff.auto_overridden:
-            continue
+    def add(self, diff: TaskDiff) -> None:
+        self._apply(diff, 1)
 
-        task_days = diff.task_slippage_days
-        project_days = project_shares.get(diff.row_key, 0.0)
+    def remove(self, diff: TaskDiff) -> None:
+        self._apply(diff, -1)
 
-        if diff.attribution_status == "pending_low_confidence":
-            task_metric.excluded_low_confidence_days += task_days
-            project_metric.excluded_low_confidence_days += project_days
-            continue
+    def _apply(self, diff: TaskDiff, sign: int) -> None:
+        days = sign * diff.task_slippage_days
+        contributor = _is_project_contributor(diff)
+        if contributor:
+            self.total_project_weight += days
 
-        if diff.cause_tag == "unassigned":
-            task_metric.unassigned_days += task_days
-            project_metric.unassigned_days += project_days
-            continue
+        bucket = allocation_bucket(diff)
+        if bucket is None:
+            return
+        self.task_days[bucket] += days
+        if contributor:
+            self.project_weight[bucket] += days
+
+    def fault_allocation(self, base_delay: float) -> FaultAllocation:
+        task_metric = FaultMetric()
+        project_metric = FaultMetric()
+        share = base_delay / self.total_project_weight if base_delay > 0 and self.total_project_weight > 0 else 0.0
+
+        for bucket in self.BUCKETS:
+            field = f"{bucket}_days"
+            setattr(task_metric, field, self.task_days[bucket])
+            setattr(project_metric, field, self.project_weight[bucket] * share)
 
-        _bucket_metric(task_metric, diff.cause_tag, task_days)
-        _bucket_metric(project_metric, diff.cause_tag, project_days)
+        return _finalize_allocation(task_metric, project_metric)
 
+
+def allocation_bucket(diff: TaskDiff) -> str | None:
+    """Return the fault-allocation bucket a diff counts towards, or None if excluded."""
+    if diff.status not in ATTRIBUTION_SCOPE:
+        return None
+    if not diff.requires_user_input and not diff.auto_overridden:
+        return None
+    if diff.attribution_status == "pending_low_confidence":
+        return "excluded_low_confidence"
+    return diff.cause_tag
+
+
+def _finalize_allocation(task_metric: FaultMetric, project_metric: FaultMetric) -> FaultAllocation:
     _update_percentages(task_metric)
     _update_percentages(project_metric)
 
@@ -228,6 +412,30 @@ def compute_fault_allocation(result: CompareResult) -> FaultAllocation:
     )
 
 
+def merge_fault_allocations(allocations: Iterable[FaultAllocation]) -> FaultAllocation:
+    """Sum day buckets across several allocations and recompute percentages."""
+    task_metric = FaultMetric()
+    project_metric = FaultMetric()
+    for allocation in allocations:
+        for total, metric in (
+            (task_metric, allocation.task_slippage_days),
+            (project_metric, allocation.project_finish_impact_days),
+        ):
+            total.client_days += metric.client_days
+            total.contractor_days += metric.contractor_days
+            total.neutral_days += metric.neutral_days
+            total.unassigned_days += metric.unassigned_days
+            total.excluded_low_confidence_days += metric.excluded_low_confidence_days
+    return _finalize_allocation(task_metric, project_metric)
+
+
+def compute_fault_allocation(result: CompareResult) -> FaultAllocation:
+    accumulator = FaultAllocationAccumulator()
+    for diff in result.diffs:
+        accumulator.add(diff)
+    return accumulator.fault_allocation(result.summary.project_finish_delay_days)
+
+
 def assignment_rows_for_result(result: CompareResult) -> Iterable[dict]:
     for diff in result.diffs:
         yield {
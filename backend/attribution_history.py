@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from .attribution import AttributionAggregates, RowChange
+from .schemas import AttributionHistoryEntry, AttributionHistoryResponse
+
+MAX_HISTORY_ENTRIES = 200
+
+
+@dataclass
+class _Operation:
+    entry_id: int
+    label: str
+    changes: list[RowChange]
+    created_at: float = field(default_factory=time.time)
+
+    def describe(self) -> AttributionHistoryEntry:
+        return AttributionHistoryEntry(
+            entry_id=self.entry_id,
+            label=self.label,
+            row_count=len(self.changes),
+            created_at=self.created_at,
+        )
+
+
+class AttributionHistory:
+    """Undo/redo operation log for attribution edits on one compare result.
+
+    Each entry holds only the before/after state of the rows it changed, so memory
+    grows with edits rather than result size and undo/redo cost O(changed rows).
+    """
+
+    def __init__(self, max_entries: int = MAX_HISTORY_ENTRIES) -> None:
+        self._undo: deque[_Operation] = deque(maxlen=max_entries)
+        self._redo: list[_Operation] = []
+        self._next_id = 1
+
+    def record(self, label: str, changes: list[RowChange]) -> None:
+        if not changes:
+            return
+        self._undo.append(_Operation(entry_id=self._next_id, label=label, changes=list(changes)))
+        self._next_id += 1
+        self._redo.clear()
+
+    def undo(self, aggregates: AttributionAggregates, assignment_map: dict[str, dict]) -> AttributionHistoryEntry:
+        if not self._undo:
+            raise ValueError("Nothing to undo")
+        operation = self._undo.pop()
+        aggregates.restore_rows([(change.row_key, change.before) for change in operation.changes], assignment_map)
+        self._redo.append(operation)
+        return operation.describe()
+
+    def redo(self, aggregates: AttributionAggregates, assignment_map: dict[str, dict]) -> AttributionHistoryEntry:
+        if not self._redo:
+            raise ValueError("Nothing to redo")
+        operation = self._redo.pop()
+        aggregates.restore_rows([(change.row_key, change.after) for change in operation.changes], assignment_map)
+        self._undo.append(operation)
+        return operation.describe()
+
+    def describe(self) -> AttributionHistoryResponse:
+        return AttributionHistoryResponse(
+            undo=[operation.describe() for operation in reversed(self._undo)],
+            redo=[operation.describe() for operation in reversed(self._redo)],
+        )
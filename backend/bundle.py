@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+from .schemas import BundleManifest, BundleMember, CompareResult, InputFileRecord
+from .zip_stream import iter_zip
+
+JSON_CHUNK_ROWS = 1000
+FILE_CHUNK_BYTES = 256 * 1024
+
+# A member's chunks are produced only when the archive reaches it.
+MemberSource = Callable[[], Iterable[bytes]]
+
+
+def input_file_record(side: str, filename: str | None, data: bytes) -> InputFileRecord:
+    return InputFileRecord(side=side, filename=filename, sha256=hashlib.sha256(data).hexdigest(), size_bytes=len(data))
+
+
+def iter_result_json(
+    result: CompareResult,
+    assignments: dict[str, dict],
+    chunk_rows: int = JSON_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """Compact JSON of the result and its non-default assignments, written row batch by row batch."""
+    head = result.model_dump_json(include={"summary", "fault_allocation", "import_warnings", "candidates"})
+    yield (head[:-1] + ',"diffs":[').encode("utf-8")
+    batch: list[str] = []
+    for index, diff in enumerate(result.diffs):
+        batch.append(("," if index else "") + diff.model_dump_json())
+        if len(batch) >= chunk_rows:
+            yield "".join(batch).encode("utf-8")
+            batch.clear()
+    batch.append('],"assignments":')
+    batch.append(json.dumps(assignments, sort_keys=True, separators=(",", ":")))
+    batch.append("}")
+    yield "".join(batch).encode("utf-8")
+
+
+def iter_file(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as handle:
+        while chunk := handle.read(FILE_CHUNK_BYTES):
+            yield chunk
+
+
+def iter_bundle(members: list[tuple[str, MemberSource]], manifest: BundleManifest) -> Iterator[bytes]:
+    """Stream a zip of `members` followed by `manifest.json` listing each member's hash and size."""
+
+    def hashed(name: str, source: MemberSource) -> Iterator[bytes]:
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in source():
+            digest.update(chunk)
+            size += len(chunk)
+            yield chunk
+        manifest.members.append(BundleMember(name=name, sha256=digest.hexdigest(), size_bytes=size))
+
+    def manifest_json() -> Iterator[bytes]:
+        yield manifest.model_dump_json(indent=2).encode("utf-8")
+
+    entries = [(name, hashed(name, source)) for name, source in members]
+    entries.append(("manifest.json", manifest_json()))
+    return iter_zip(entries)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from .assignment_store import is_default_assignment
+from .matching import normalize_task_name
+from .schemas import AttributionAssignment, CarryForwardItem, CarryForwardReport, CompareResult, TaskDiff
+
+DEFAULT_MIN_SIMILARITY = 0.85
+
+
+def _fuzzy_target(name: str, pool: list[TaskDiff], min_similarity: float) -> tuple[list[TaskDiff], float]:
+    """Best fuzzy name matches in `pool`; more than one result means a tie."""
+    matcher = SequenceMatcher(None)
+    # seq2 holds the fixed name so its character index is built only once.
+    matcher.set_seq2(normalize_task_name(name))
+    best: list[TaskDiff] = []
+    best_score = min_similarity
+    for diff in pool:
+        matcher.set_seq1(normalize_task_name(diff.left_name or ""))
+        # Cheap upper bounds first; full ratio only for plausible candidates.
+        if matcher.real_quick_ratio() < best_score or matcher.quick_ratio() < best_score:
+            continue
+        score = matcher.ratio()
+        if score > best_score:
+            best, best_score = [diff], score
+        elif score == best_score:
+            best.append(diff)
+    return best, best_score
+
+
+def carry_forward_assignments(
+    previous: CompareResult,
+    previous_map: dict[str, dict],
+    current: CompareResult,
+    current_map: dict[str, dict],
+    *,
+    min_similarity: float = DEFAULT_MIN_SIMILARITY,
+) -> tuple[list[AttributionAssignment], CarryForwardReport]:
+    """Map assignments from the previous comparison onto the current one.
+
+    The previous comparison's right-side programme is the current comparison's
+    left-side programme, so old right tasks are looked up among new left tasks:
+    first by UID + normalized name, then by name alone, and only the residue is
+    fuzzy-matched by name similarity.
+    """
+    by_identity: dict[tuple[int, str], list[TaskDiff]] = defaultdict(list)
+    by_name: dict[str, list[TaskDiff]] = defaultdict(list)
+    for diff in current.diffs:
+        if diff.left_uid is None:
+            continue
+        name = normalize_task_name(diff.left_name or "")
+        by_identity[(diff.left_uid, name)].append(diff)
+        by_name[name].append(diff)
+
+    report = CarryForwardReport()
+    # Target row -> every previous row carried onto it (all with the same entry) and that entry.
+    claimed: dict[str, tuple[list[CarryForwardItem], dict]] = {}
+    contested: set[str] = set()
+    residue: list[tuple[TaskDiff, dict]] = []
+
+    def claim(source: TaskDiff, target: TaskDiff, entry: dict, method: str, similarity: float = 1.0) -> None:
+        item = CarryForwardItem(
+            source_row_key=source.row_key,
+            target_row_key=target.row_key,
+            task_name=source.right_name,
+            method=method,
+            similarity=round(similarity, 3),
+        )
+        existing = current_map.get(target.row_key, {})
+        if target.row_key in contested:
+            item.reason = "Several previous rows with different assignments map to this task"
+            report.conflicted.append(item)
+            return
+        if target.row_key in claimed:
+            others, other_entry = claimed[target.row_key]
+            if other_entry == entry:
+                # Agrees with the earlier claim, so it is carried too rather than dropped from the report.
+                others.append(item)
+                return
+            # Neither side wins: every previous row is reported for manual review.
+            del claimed[target.row_key]
+            contested.add(target.row_key)
+            for conflicting in (*others, item):
+                conflicting.reason = "Several previous rows with different assignments map to this task"
+                report.conflicted.append(conflicting)
+            return
+        if not is_default_assignment(existing) and not existing.get("rule_hits") and existing != entry:
+            item.reason = "Target row already has a different assignment"
+            report.conflicted.append(item)
+            return
+        if target.status == "unchanged":
+            item.reason = "Task is unchanged in the new comparison"
+            report.dropped.append(item)
+            return
+        claimed[target.row_key] = ([item], entry)
+
+    previous_by_key = {diff.row_key: diff for diff in previous.diffs}
+    for row_key, entry in previous_map.items():
+        source = previous_by_key.get(row_key)
+        # Rule-owned tags are not carried; the active rules re-tag the new comparison themselves.
+        if source is None or is_default_assignment(entry) or entry.get("rule_hits"):
+            continue
+        if source.right_uid is None:
+            report.dropped.append(
+                CarryForwardItem(source_row_key=row_key, task_name=source.left_name, reason="Task was removed")
+            )
+            continue
+        name = normalize_task_name(source.right_name or "")
+        for method, targets in (("uid_name", by_identity.get((source.right_uid, name))), ("name", by_name.get(name))):
+            if not targets:
+                continue
+            if len(targets) == 1:
+                claim(source, targets[0], entry, method)
+            else:
+                report.conflicted.append(
+                    CarryForwardItem(
+                        source_row_key=row_key,
+                        task_name=source.right_name,
+                        method=method,
+                        reason=f"{len(targets)} tasks share this identity",
+                    )
+                )
+            break
+        else:
+            residue.append((source, entry))
+
+    if residue:
+        pool = [diff for diff in current.diffs if diff.left_uid is not None and diff.row_key not in claimed]
+        for source, entry in residue:
+            targets, score = _fuzzy_target(source.right_name or "", pool, min_similarity)
+            if len(targets) == 1:
+                claim(source, targets[0], entry, "fuzzy", score)
+            elif targets:
+                report.conflicted.append(
+                    CarryForwardItem(
+                        source_row_key=source.row_key,
+                        task_name=source.right_name,
+                        method="fuzzy",
+                        similarity=round(score, 3),
+                        reason=f"{len(targets)} tasks are equally similar",
+                    )
+                )
+            else:
+                report.dropped.append(
+                    CarryForwardItem(
+                        source_row_key=source.row_key,
+                        task_name=source.right_name,
+                        reason="No matching task in the new comparison",
+                    )
+                )
+
+    assignments: list[AttributionAssignment] = []
+    for target_key, (items, entry) in claimed.items():
+        report.carried.extend(items)
+        assignments.append(
+            AttributionAssignment(
+                row_key=target_key,
+                cause_tag=entry.get("cause_tag", "unassigned"),
+                reason_code=entry.get("reason_code", ""),
+                confirm_low_confidence=bool(entry.get("confirm_low_confidence", False)),
+                override_auto=bool(entry.get("override_auto", False)),
+            )
+        )
+    return assignments, report
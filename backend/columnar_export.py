@@ -0,0 +1,282 @@
+"""Columnar export of a comparison result for analysis tools.
+
+Three tables are written: ``diffs`` (one row per task diff), ``evidence`` (one
+row per changed field, linked by ``diff_index``) and ``fault_allocation`` (one
+row per basis and metric). Columns are typed; low-cardinality labels are
+dictionary encoded and dates are stored as day ordinals since 1970-01-01.
+
+With pyarrow installed the tables are Arrow IPC files (or Parquet files) inside
+an uncompressed zip, one ``<table>.arrow``/``<table>.parquet`` entry per table,
+with categories as dictionary arrays and dates as ``date32``.
+
+Without pyarrow the tables go into a single uncompressed ``.npz`` whose arrays
+are keyed ``<table>.<column>``. The ``.npy`` members are written directly, so
+this format needs no optional dependency:
+
+- ``category`` columns hold ``int32`` codes (``-1`` for null) and a
+  ``<table>.<column>.categories`` string array the codes index into;
+- ``date`` columns are ``datetime64[D]`` with ``NaT`` for null;
+- ``float`` columns are ``float64`` with ``NaN`` for null;
+- ``int``, ``bool`` and ``string`` columns are ``int64``, ``bool`` and
+  fixed-width unicode arrays, with a ``<table>.<column>.valid`` boolean mask
+  when the column has nulls;
+- ``<table>.__columns__`` lists the column names in order.
+
+Every array is a plain little-endian dtype, so ``numpy.load(path)`` reads it
+without pickle.
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+import zipfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+
+from .reporting import _metric_rows
+from .schemas import ChangeField, CompareResult, TaskDiff
+from .zip_stream import iter_zip
+
+try:  # pyarrow is optional; it gives Arrow IPC and Parquet output.
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+
+COLUMNAR_FORMATS = ("auto", "arrow", "parquet", "npz")
+ZIP_MEDIA_TYPE = "application/zip"
+NPZ_MEDIA_TYPE = "application/octet-stream"
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_NAT = -(2**63)
+_DATE_FIELDS = {"start", "finish", "baseline_start", "baseline_finish"}
+
+
+@dataclass
+class Column:
+    """One typed column: `kind` is category, string, int, float, bool or date."""
+
+    kind: str
+    values: list
+
+    def encoded(self) -> tuple[list[int], list[str]]:
+        """Dictionary codes (-1 for null) and categories in first-seen order."""
+        index: dict[str, int] = {}
+        codes = []
+        for value in self.values:
+            if value is None:
+                codes.append(-1)
+                continue
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(index)
+            codes.append(code)
+        return codes, list(index)
+
+
+@dataclass
+class ColumnarExport:
+    content: bytes
+    media_type: str
+    filename: str
+
+
+def _day_ordinal(value: date | None) -> int | None:
+    return None if value is None else value.toordinal() - _EPOCH_ORDINAL
+
+
+def _text(value: object) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return ",".join(str(item) for item in value)
+    return str(value)
+
+
+def _number(value: object) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _evidence_date(change: ChangeField, value: object) -> int | None:
+    if change.field not in _DATE_FIELDS or not isinstance(value, str):
+        return None
+    try:
+        return _day_ordinal(date.fromisoformat(value[:10]))
+    except ValueError:
+        return None
+
+
+DIFF_COLUMNS: list[tuple[str, str, Callable[[TaskDiff], object]]] = [
+    ("row_key", "string", lambda diff: diff.row_key),
+    ("status", "category", lambda diff: diff.status),
+    ("change_category", "category", lambda diff: diff.change_category),
+    ("left_uid", "int", lambda diff: diff.left_uid),
+    ("right_uid", "int", lambda diff: diff.right_uid),
+    ("left_name", "string", lambda diff: diff.left_name),
+    ("right_name", "string", lambda diff: diff.right_name),
+    ("left_finish", "date", lambda diff: _day_ordinal(diff.left_finish)),
+    ("right_finish", "date", lambda diff: _day_ordinal(diff.right_finish)),
+    ("confidence", "float", lambda diff: diff.confidence),
+    ("confidence_band", "category", lambda diff: diff.confidence_band),
+    ("cause_tag", "category", lambda diff: diff.cause_tag),
+    ("reason_code", "category", lambda diff: diff.reason_code),
+    ("attribution_status", "category", lambda diff: diff.attribution_status),
+    ("task_slippage_days", "float", lambda diff: diff.task_slippage_days),
+    ("included_in_totals", "bool", lambda diff: diff.included_in_totals),
+    ("requires_user_input", "bool", lambda diff: diff.requires_user_input),
+    ("auto_overridden", "bool", lambda diff: diff.auto_overridden),
+    ("auto_reason", "string", lambda diff: diff.auto_reason),
+    ("flow_on_from_right_uids", "string", lambda diff: _text(diff.flow_on_from_right_uids)),
+]
+
+
+def columnar_tables(result: CompareResult) -> dict[str, dict[str, Column]]:
+    """Build the diffs, evidence and fault allocation tables as typed Python columns."""
+    diffs = {name: Column(kind, []) for name, kind, _getter in DIFF_COLUMNS}
+    evidence_kinds = {
+        "diff_index": "int",
+        "field": "category",
+        "left_value": "string",
+        "right_value": "string",
+        "left_number": "float",
+        "right_number": "float",
+        "left_date": "date",
+        "right_date": "date",
+    }
+    evidence = {name: Column(kind, []) for name, kind in evidence_kinds.items()}
+
+    for diff_index, diff in enumerate(result.diffs):
+        for name, _kind, getter in DIFF_COLUMNS:
+            diffs[name].values.append(getter(diff))
+        for change in diff.evidence:
+            row = {
+                "diff_index": diff_index,
+                "field": change.field,
+                "left_value": _text(change.left_value),
+                "right_value": _text(change.right_value),
+                "left_number": _number(change.left_value),
+                "right_number": _number(change.right_value),
+                "left_date": _evidence_date(change, change.left_value),
+                "right_date": _evidence_date(change, change.right_value),
+            }
+            for name, value in row.items():
+                evidence[name].values.append(value)
+
+    metric_rows = _metric_rows("project_finish_impact_days", result.fault_allocation.project_finish_impact_days)
+    metric_rows += _metric_rows("task_slippage_days", result.fault_allocation.task_slippage_days)
+    fault_allocation = {
+        "basis": Column("category", [row[0] for row in metric_rows]),
+        "metric": Column("category", [row[1] for row in metric_rows]),
+        "value": Column("float", [float(row[2]) for row in metric_rows]),
+    }
+    return {"diffs": diffs, "evidence": evidence, "fault_allocation": fault_allocation}
+
+
+def resolve_format(requested: str) -> str:
+    """Pick the concrete format for `requested`, or raise ValueError when it cannot be written."""
+    if requested not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format '{requested}'; expected one of {', '.join(COLUMNAR_FORMATS)}")
+    if requested == "auto":
+        return "arrow" if pa is not None else "npz"
+    if requested in {"arrow", "parquet"} and pa is None:
+        raise ValueError(f"The {requested} format needs pyarrow installed")
+    return requested
+
+
+def _arrow_array(column: Column):
+    if column.kind == "category":
+        codes, categories = column.encoded()
+        return pa.DictionaryArray.from_arrays(
+            pa.array([None if code < 0 else code for code in codes], type=pa.int32()),
+            pa.array(categories, type=pa.string()),
+        )
+    if column.kind == "date":
+        return pa.array(column.values, type=pa.int32()).cast(pa.date32())
+    arrow_type = {"string": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}[column.kind]
+    return pa.array(column.values, type=arrow_type)
+
+
+def _arrow_table_bytes(columns: dict[str, Column], fmt: str) -> bytes:
+    table = pa.table({name: _arrow_array(column) for name, column in columns.items()})
+    sink = io.BytesIO()
+    if fmt == "parquet":
+        pa_parquet.write_table(table, sink)
+    else:
+        with pa_ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue()
+
+
+def _npy(descr: str, count: int, data: bytes) -> bytes:
+    """One-dimensional ``.npy`` (format 1.0) file, header padded so data is 64-byte aligned."""
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({count},), }}".encode("latin-1")
+    header += b" " * (-(len(_NPY_MAGIC) + 2 + len(header) + 1) % 64) + b"\n"
+    return _NPY_MAGIC + struct.pack("<H", len(header)) + header + data
+
+
+def _npy_strings(values: list[str]) -> bytes:
+    width = max((len(value) for value in values), default=0) or 1
+    data = b"".join(value.encode("utf-32-le").ljust(4 * width, b"\0") for value in values)
+    return _npy(f"<U{width}", len(values), data)
+
+
+def _npy_numbers(code: str, values: list) -> bytes:
+    descr = {"i": "<i4", "q": "<i8", "d": "<f8"}[code]
+    return _npy(descr, len(values), struct.pack(f"<{len(values)}{code}", *values))
+
+
+def _npy_bools(values: list[bool]) -> bytes:
+    return _npy("|b1", len(values), bytes(bool(value) for value in values))
+
+
+def _npz_arrays(table_name: str, columns: dict[str, Column]) -> dict[str, bytes]:
+    arrays = {f"{table_name}.__columns__": _npy_strings(list(columns))}
+    for name, column in columns.items():
+        key = f"{table_name}.{name}"
+        values = column.values
+        if column.kind == "category":
+            codes, categories = column.encoded()
+            arrays[key] = _npy_numbers("i", codes)
+            arrays[f"{key}.categories"] = _npy_strings(categories)
+        elif column.kind == "date":
+            days = [_NAT if value is None else value for value in values]
+            arrays[key] = _npy("<M8[D]", len(days), struct.pack(f"<{len(days)}q", *days))
+        elif column.kind == "float":
+            arrays[key] = _npy_numbers("d", [float("nan") if value is None else value for value in values])
+        else:
+            if column.kind == "int":
+                arrays[key] = _npy_numbers("q", [0 if value is None else value for value in values])
+            elif column.kind == "bool":
+                arrays[key] = _npy_bools([False if value is None else value for value in values])
+            else:
+                arrays[key] = _npy_strings(["" if value is None else value for value in values])
+            if any(value is None for value in values):
+                arrays[f"{key}.valid"] = _npy_bools([value is not None for value in values])
+    return arrays
+
+
+def export_columnar(result: CompareResult, requested: str = "auto") -> ColumnarExport:
+    """Write the result's tables in the requested (or best available) columnar format."""
+    fmt = resolve_format(requested)
+    tables = columnar_tables(result)
+    if fmt == "npz":
+        arrays: dict[str, bytes] = {}
+        for table_name, columns in tables.items():
+            arrays.update(_npz_arrays(table_name, columns))
+        # Stored, like numpy.savez, so readers can load (or memory-map) each array without inflating it.
+        entries = [(f"{key}.npy", [data]) for key, data in arrays.items()]
+        content = b"".join(iter_zip(entries, compression=zipfile.ZIP_STORED))
+        return ColumnarExport(content, NPZ_MEDIA_TYPE, "evidence-columns.npz")
+
+    suffix = "parquet" if fmt == "parquet" else "arrow"
+    entries = [
+        (f"{table_name}.{suffix}", [_arrow_table_bytes(columns, fmt)]) for table_name, columns in tables.items()
+    ]
+    content = b"".join(iter_zip(entries, compression=zipfile.ZIP_STORED))
+    return ColumnarExport(content, ZIP_MEDIA_TYPE, f"evidence-columns-{suffix}.zip")
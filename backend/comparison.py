@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque
-
-from .attribution import compute_fault_allocation, initialize_attribution
+from collections import Counter, defaultdict, deque, namedtuple
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
+from operator import attrgetter
+
+from .attribution import FaultAllocationAccumulator, compute_fault_allocation, initialize_attribution
 from .matching import auto_match, confidence_band, has_identity_signature
+from .result_store import ResultStore
+from .rollup import summary_paths
 from .schemas import (
     ChangeField,
     CompareResult,
     CompareSummary,
+    MatchCandidate,
     MatchOverride,
+    StreamedCompareResult,
     TaskDiff,
     TaskRecord,
 )
@@ -24,6 +33,7 @@ COMPARE_FIELDS = [
 
 BASELINE_FIELDS = ["baseline_start", "baseline_finish"]
 DATE_FIELDS = {"start", "finish"}
+ROOT_CHANGE_FIELDS = ["duration_minutes", "predecessors"]
 
 
 def _serialize(value):
@@ -51,7 +61,7 @@ def _classify_change(
     *,
     left: TaskRecord,
     right: TaskRecord,
-    evidence: list[ChangeField],
+    changed_fields: set[str],
     match_needs_review: bool,
 ) -> tuple[str, bool, str | None]:
     if match_needs_review:
@@ -61,7 +71,6 @@ def _classify_change(
             "Potential UID repurpose detected; manual review required.",
         )
 
-    changed_fields = {item.field for item in evidence}
     if not changed_fields:
         if has_identity_signature(left, right):
             return (
@@ -124,167 +133,444 @@ def _flow_sources(
     return sources
 
 
-def _apply_flow_on_classification(diffs: list[TaskDiff], right_tasks: list[TaskRecord]) -> None:
-    successors, missing_predecessors = _build_successor_graph(right_tasks)
+def _root_change_right_uids(
+    left_leaf: list[TaskRecord],
+    matched: dict[int, int],
+    right_by_uid: dict[int, TaskRecord],
+) -> set[int]:
+    roots: set[int] = set()
+    for left in left_leaf:
+        right_uid = matched.get(left.uid)
+        if right_uid is None:
+            continue
+        right = right_by_uid[right_uid]
+        if any(_serialize(getattr(left, field)) != _serialize(getattr(right, field)) for field in ROOT_CHANGE_FIELDS):
+            roots.add(right_uid)
+    return roots
+
 
-    root_change_right_uids = {
-        diff.right_uid
-        for diff in diffs
-        if diff.right_uid is not None
-        and any(field.field in {"duration_minutes", "predecessors"} for field in diff.evidence)
-    }
+def _flow_on_context(
+    successor_graph: tuple[dict[int, set[int]], set[int]],
+    root_change_right_uids: set[int],
+) -> tuple[dict[int, set[int]], set[int]]:
+    successors, missing_predecessors = successor_graph
     if not root_change_right_uids:
+        return {}, missing_predecessors
+    return _flow_sources(successors, root_change_right_uids), missing_predecessors
+
+
+def _apply_flow_on_classification(
+    diff: TaskDiff,
+    propagation_sources: dict[int, set[int]],
+    missing_predecessors: set[int],
+) -> None:
+    if diff.change_category != "date_shift_unexplained":
+        return
+    if diff.right_uid is None:
         return
 
-    propagation_sources = _flow_sources(successors, {uid for uid in root_change_right_uids if uid is not None})
+    upstream_sources = sorted(propagation_sources.get(diff.right_uid, set()))
+    if upstream_sources:
+        diff.change_category = "date_shift_flow_on"
+        diff.requires_user_input = False
+        diff.auto_reason = (
+            "Start/finish drift propagated from upstream duration/predecessor changes."
+        )
+        diff.flow_on_from_right_uids = upstream_sources
+        return
 
-    for diff in diffs:
-        if diff.change_category != "date_shift_unexplained":
-            continue
-        if diff.right_uid is None:
-            continue
+    # Explicitly retain actionable status when dependency proof is ambiguous/missing.
+    if diff.right_uid in missing_predecessors:
+        diff.auto_reason = None
+    diff.requires_user_input = True
 
-        upstream_sources = sorted(propagation_sources.get(diff.right_uid, set()))
-        if upstream_sources:
-            diff.change_category = "date_shift_flow_on"
-            diff.requires_user_input = False
-            diff.auto_reason = (
-                "Start/finish drift propagated from upstream duration/predecessor changes."
-            )
-            diff.flow_on_from_right_uids = upstream_sources
-            continue
 
-        # Explicitly retain actionable status when dependency proof is ambiguous/missing.
-        if diff.right_uid in missing_predecessors:
-            diff.auto_reason = None
-        diff.requires_user_input = True
+def _pair_diff_row(
+    left: TaskRecord,
+    right: TaskRecord,
+    candidate: MatchCandidate | None,
+    fields: list[str],
+) -> tuple:
+    """Field diff and classification of one matched pair as plain values.
+
+    Returns `(confidence, evidence, status, change_category, requires_user_input,
+    auto_reason)` with evidence as `(field, left_value, right_value)` tuples, so
+    compare workers can hand results back without pickling models.
+    """
+    # Defensive fallback: keep compare resilient even if candidate generation changes.
+    candidate_confidence = candidate.confidence if candidate is not None else 0.0
+
+    evidence: list[tuple] = []
+    for name in fields:
+        left_val = _serialize(getattr(left, name))
+        right_val = _serialize(getattr(right, name))
+        if left_val != right_val:
+            evidence.append((name, left_val, right_val))
+
+    change_category, requires_user_input, auto_reason = _classify_change(
+        left=left,
+        right=right,
+        changed_fields={item[0] for item in evidence},
+        match_needs_review=bool(candidate and candidate.match_needs_review),
+    )
+    status = "changed" if evidence else "unchanged"
+    return candidate_confidence, evidence, status, change_category, requires_user_input, auto_reason
+
+
+def _diff_from_row(left: TaskRecord, right: TaskRecord, row: tuple) -> TaskDiff:
+    confidence, evidence, status, change_category, requires_user_input, auto_reason = row
+    return TaskDiff(
+        left_uid=left.uid,
+        right_uid=right.uid,
+        left_name=left.name,
+        right_name=right.name,
+        left_finish=left.finish,
+        right_finish=right.finish,
+        status=status,
+        confidence=confidence,
+        confidence_band=confidence_band(confidence),
+        evidence=[
+            ChangeField(field=name, left_value=left_val, right_value=right_val)
+            for name, left_val, right_val in evidence
+        ],
+        change_category=change_category,
+        requires_user_input=requires_user_input,
+        auto_reason=auto_reason,
+    )
 
 
-def compare_tasks(
-    left_tasks: list[TaskRecord],
-    right_tasks: list[TaskRecord],
-    include_baseline: bool,
-    overrides: list[MatchOverride] | None = None,
-    assignment_map: dict[str, dict] | None = None,
-) -> CompareResult:
-    left_leaf = [t for t in left_tasks if not t.is_summary]
-    right_leaf = [t for t in right_tasks if not t.is_summary]
+def _diff_matched_pair(
+    left: TaskRecord,
+    right: TaskRecord,
+    candidate: MatchCandidate | None,
+    fields: list[str],
+) -> TaskDiff:
+    return _diff_from_row(left, right, _pair_diff_row(left, right, candidate, fields))
+
+
+def _removed_diff(left: TaskRecord) -> TaskDiff:
+    return TaskDiff(
+        left_uid=left.uid,
+        right_uid=None,
+        left_name=left.name,
+        right_name=None,
+        left_finish=left.finish,
+        right_finish=None,
+        status="removed",
+        confidence=0,
+        confidence_band="red",
+        change_category="removed",
+        requires_user_input=True,
+    )
 
-    matched, candidates = auto_match(left_leaf, right_leaf, overrides=overrides)
-    candidate_by_pair = {(candidate.left_uid, candidate.right_uid): candidate for candidate in candidates}
-    right_by_uid = {t.uid: t for t in right_leaf}
 
-    used_right = set(matched.values())
-    diffs: list[TaskDiff] = []
+def _added_diff(right: TaskRecord) -> TaskDiff:
+    return TaskDiff(
+        left_uid=None,
+        right_uid=right.uid,
+        left_name=None,
+        right_name=right.name,
+        left_finish=None,
+        right_finish=right.finish,
+        status="added",
+        confidence=0,
+        confidence_band="red",
+        change_category="added",
+        requires_user_input=True,
+    )
+
+
+@dataclass
+class PreparedProgramme:
+    """A parsed programme plus the derived structures compare needs, built once.
+
+    Callers comparing the same programme several times (for example consecutive
+    windows of a revision series) share one instance instead of re-deriving them.
+    """
+
+    tasks: list[TaskRecord]
+    leaf: list[TaskRecord] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.leaf = [task for task in self.tasks if not task.is_summary]
 
+    @cached_property
+    def leaf_by_uid(self) -> dict[int, TaskRecord]:
+        return {task.uid: task for task in self.leaf}
+
+    @cached_property
+    def successor_graph(self) -> tuple[dict[int, set[int]], set[int]]:
+        return _build_successor_graph(self.tasks)
+
+
+def _iter_leaf_diffs(
+    left: PreparedProgramme,
+    right: PreparedProgramme,
+    matched: dict[int, int],
+    candidates: list[MatchCandidate],
+    include_baseline: bool,
+) -> Iterator[TaskDiff]:
+    left_leaf = left.leaf
+    right_leaf = right.leaf
+    candidate_by_pair = {(candidate.left_uid, candidate.right_uid): candidate for candidate in candidates}
+    right_by_uid = right.leaf_by_uid
+
+    propagation_sources, missing_predecessors = _flow_on_context(
+        right.successor_graph,
+        _root_change_right_uids(left_leaf, matched, right_by_uid),
+    )
     fields = COMPARE_FIELDS + (BASELINE_FIELDS if include_baseline else [])
+    used_right = set(matched.values())
 
     for left in left_leaf:
         right_uid = matched.get(left.uid)
         if right_uid is None:
-            diffs.append(
-                TaskDiff(
-                    left_uid=left.uid,
-                    right_uid=None,
-                    left_name=left.name,
-                    right_name=None,
-                    left_finish=left.finish,
-                    right_finish=None,
-                    status="removed",
-                    confidence=0,
-                    confidence_band="red",
-                    change_category="removed",
-                    requires_user_input=True,
-                )
-            )
+            yield _removed_diff(left)
             continue
+        diff = _diff_matched_pair(left, right_by_uid[right_uid], candidate_by_pair.get((left.uid, right_uid)), fields)
+        _apply_flow_on_classification(diff, propagation_sources, missing_predecessors)
+        yield diff
 
-        right = right_by_uid[right_uid]
-        candidate = candidate_by_pair.get((left.uid, right_uid))
-        if candidate is None:
-            # Defensive fallback: keep compare resilient even if candidate generation changes.
-            candidate_confidence = 0.0
-            candidate_band = "red"
-        else:
-            candidate_confidence = candidate.confidence
-            candidate_band = confidence_band(candidate.confidence)
-
-        evidence: list[ChangeField] = []
-        for field in fields:
-            left_val = _serialize(getattr(left, field))
-            right_val = _serialize(getattr(right, field))
-            if left_val != right_val:
-                evidence.append(
-                    ChangeField(
-                        field=field,
-                        left_value=left_val,
-                        right_value=right_val,
-                    )
-                )
-
-        status = "changed" if evidence else "unchanged"
-        change_category, requires_user_input, auto_reason = _classify_change(
-            left=left,
-            right=right,
-            evidence=evidence,
-            match_needs_review=bool(candidate and candidate.match_needs_review),
+    for right in right_leaf:
+        if right.uid not in used_right:
+            yield _added_diff(right)
+
+
+# Tasks cross the process boundary as plain tuples in this field order; pickling
+# the pydantic models costs more than the diff itself.
+_TASK_FIELDS = tuple(TaskRecord.model_fields)
+_task_row = attrgetter(*_TASK_FIELDS)
+# Read-only stand-ins inside workers; diffing and classification only read attributes.
+_TaskView = namedtuple("_TaskView", _TASK_FIELDS)
+_CandidateView = namedtuple("_CandidateView", ("confidence", "match_needs_review"))
+
+
+def _diff_partition(pairs: list[tuple[tuple, tuple, tuple | None]], fields: list[str]) -> list[tuple]:
+    """Field diff and classification of one branch's matched pairs, one diff row per pair."""
+    return [
+        _pair_diff_row(
+            _TaskView._make(left_row),
+            _TaskView._make(right_row),
+            _CandidateView._make(candidate_row) if candidate_row is not None else None,
+            fields,
         )
-        diffs.append(
-            TaskDiff(
-                left_uid=left.uid,
-                right_uid=right.uid,
-                left_name=left.name,
-                right_name=right.name,
-                left_finish=left.finish,
-                right_finish=right.finish,
-                status=status,
-                confidence=candidate_confidence,
-                confidence_band=candidate_band,
-                evidence=evidence,
-                change_category=change_category,
-                requires_user_input=requires_user_input,
-                auto_reason=auto_reason,
+        for left_row, right_row, candidate_row in pairs
+    ]
+
+
+def _top_level_branches(programme: PreparedProgramme) -> dict[int, str]:
+    paths = summary_paths(programme.tasks)
+    return {task.uid: (paths.get(task.uid) or ("",))[0] for task in programme.leaf}
+
+
+def _partitioned_compare(
+    left: PreparedProgramme,
+    right: PreparedProgramme,
+    include_baseline: bool,
+    overrides: list[MatchOverride] | None,
+    max_workers: int,
+) -> tuple[list[MatchCandidate], list[TaskDiff]] | None:
+    """Diff and classify the matched pairs of each top-level WBS branch in a process pool.
+
+    Matching runs once over the whole programme, exactly as on the serial path:
+    it is a greedy pass in left-task order in which a task can claim a right task
+    from any branch (a moved UID, a same-name task, or a similarity fallback), so
+    splitting it by branch would change which pairs are made. Pairs are grouped by
+    the left task's branch for the field diff and classification, and flow-on,
+    removed and added rows are resolved once over the merged result. Returns None
+    when the matched pairs span fewer than two branches.
+    """
+    matched, candidates = auto_match(left.leaf, right.leaf, overrides=overrides)
+    left_branch = _top_level_branches(left)
+    right_by_uid = right.leaf_by_uid
+    candidate_by_pair = {(candidate.left_uid, candidate.right_uid): candidate for candidate in candidates}
+
+    pairs_by_branch: dict[str, list[tuple[tuple, tuple, tuple | None]]] = defaultdict(list)
+    left_uids_by_branch: dict[str, list[int]] = defaultdict(list)
+    for left_task in left.leaf:
+        right_uid = matched.get(left_task.uid)
+        if right_uid is None:
+            continue
+        candidate = candidate_by_pair.get((left_task.uid, right_uid))
+        branch = left_branch[left_task.uid]
+        pairs_by_branch[branch].append(
+            (
+                _task_row(left_task),
+                _task_row(right_by_uid[right_uid]),
+                (candidate.confidence, candidate.match_needs_review) if candidate is not None else None,
             )
         )
+        left_uids_by_branch[branch].append(left_task.uid)
+    if len(pairs_by_branch) < 2:
+        return None
+
+    fields = COMPARE_FIELDS + (BASELINE_FIELDS if include_baseline else [])
+    branches = sorted(pairs_by_branch)
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(branches))) as executor:
+        outcomes = executor.map(
+            _diff_partition,
+            [pairs_by_branch[branch] for branch in branches],
+            [fields] * len(branches),
+        )
+        diff_row_by_left = {
+            left_uid: row
+            for branch, rows in zip(branches, outcomes)
+            for left_uid, row in zip(left_uids_by_branch[branch], rows)
+        }
+
+    propagation_sources, missing_predecessors = _flow_on_context(
+        right.successor_graph,
+        _root_change_right_uids(left.leaf, matched, right_by_uid),
+    )
+    diffs: list[TaskDiff] = []
+    for left_task in left.leaf:
+        right_uid = matched.get(left_task.uid)
+        if right_uid is None:
+            diffs.append(_removed_diff(left_task))
+            continue
+        diff = _diff_from_row(left_task, right_by_uid[right_uid], diff_row_by_left[left_task.uid])
+        _apply_flow_on_classification(diff, propagation_sources, missing_predecessors)
+        diffs.append(diff)
+
+    used_right = set(matched.values())
+    diffs.extend(_added_diff(right_task) for right_task in right.leaf if right_task.uid not in used_right)
+    return candidates, diffs
+
+
+def iter_task_diffs(
+    left_tasks: list[TaskRecord],
+    right_tasks: list[TaskRecord],
+    include_baseline: bool,
+    overrides: list[MatchOverride] | None = None,
+) -> Iterator[TaskDiff]:
+    """Yield classified leaf diffs one at a time, in generation (not sorted) order.
+
+    Matching and the flow-on graph are resolved up front; each diff is built only
+    when requested so callers can write rows out incrementally.
+    """
+    left = PreparedProgramme(left_tasks)
+    right = PreparedProgramme(right_tasks)
+    matched, candidates = auto_match(left.leaf, right.leaf, overrides=overrides)
+    yield from _iter_leaf_diffs(left, right, matched, candidates, include_baseline)
+
+
+class SummaryCounter:
+    """Accumulates `CompareSummary` counters one diff at a time."""
+
+    def __init__(self, left_leaf: list[TaskRecord], right_leaf: list[TaskRecord]) -> None:
+        self.total_left_leaf_tasks = len(left_leaf)
+        self.total_right_leaf_tasks = len(right_leaf)
+        self.project_finish_delay_days = _project_finish_delay_days(left_leaf, right_leaf)
+        self.status_counts: Counter[str] = Counter()
+        self.category_counts: Counter[str] = Counter()
+        self.action_required = 0
+
+    def add(self, diff: TaskDiff) -> None:
+        self.status_counts[diff.status] += 1
+        self.category_counts[diff.change_category] += 1
+        if diff.requires_user_input:
+            self.action_required += 1
+
+    def summary(self) -> CompareSummary:
+        total = sum(self.status_counts.values())
+        return CompareSummary(
+            total_left_leaf_tasks=self.total_left_leaf_tasks,
+            total_right_leaf_tasks=self.total_right_leaf_tasks,
+            matched_tasks=self.status_counts["changed"] + self.status_counts["unchanged"],
+            changed_tasks=self.status_counts["changed"],
+            added_tasks=self.status_counts["added"],
+            removed_tasks=self.status_counts["removed"],
+            unchanged_tasks=self.status_counts["unchanged"],
+            project_finish_delay_days=self.project_finish_delay_days,
+            action_required_tasks=self.action_required,
+            auto_resolved_tasks=total - self.action_required,
+            auto_flow_on_tasks=self.category_counts["date_shift_flow_on"],
+            identity_conflict_tasks=self.category_counts["identity_conflict"],
+        )
 
-    for right in right_leaf:
-        if right.uid not in used_right:
-            diffs.append(
-                TaskDiff(
-                    left_uid=None,
-                    right_uid=right.uid,
-                    left_name=None,
-                    right_name=right.name,
-                    left_finish=None,
-                    right_finish=right.finish,
-                    status="added",
-                    confidence=0,
-                    confidence_band="red",
-                    change_category="added",
-                    requires_user_input=True,
-                )
-            )
 
-    _apply_flow_on_classification(diffs, right_tasks)
-
-    summary = CompareSummary(
-        total_left_leaf_tasks=len(left_leaf),
-        total_right_leaf_tasks=len(right_leaf),
-        matched_tasks=sum(1 for d in diffs if d.status in {"changed", "unchanged"}),
-        changed_tasks=sum(1 for d in diffs if d.status == "changed"),
-        added_tasks=sum(1 for d in diffs if d.status == "added"),
-        removed_tasks=sum(1 for d in diffs if d.status == "removed"),
-        unchanged_tasks=sum(1 for d in diffs if d.status == "unchanged"),
-        project_finish_delay_days=_project_finish_delay_days(left_leaf, right_leaf),
-        action_required_tasks=sum(1 for d in diffs if d.requires_user_input),
-        auto_resolved_tasks=sum(1 for d in diffs if not d.requires_user_input),
-        auto_flow_on_tasks=sum(1 for d in diffs if d.change_category == "date_shift_flow_on"),
-        identity_conflict_tasks=sum(1 for d in diffs if d.change_category == "identity_conflict"),
+def diff_sort_key(diff: TaskDiff) -> tuple[str, str]:
+    return diff.status, diff.left_name or diff.right_name or ""
+
+
+def compare_tasks(
+    left_tasks: list[TaskRecord],
+    right_tasks: list[TaskRecord],
+    include_baseline: bool,
+    overrides: list[MatchOverride] | None = None,
+    assignment_map: dict[str, dict] | None = None,
+    max_workers: int = 1,
+) -> CompareResult:
+    return compare_prepared(
+        PreparedProgramme(left_tasks),
+        PreparedProgramme(right_tasks),
+        include_baseline,
+        overrides=overrides,
+        assignment_map=assignment_map,
+        max_workers=max_workers,
     )
 
-    diffs.sort(key=lambda d: (d.status, d.left_name or d.right_name or ""))
+
+def compare_prepared(
+    left: PreparedProgramme,
+    right: PreparedProgramme,
+    include_baseline: bool,
+    overrides: list[MatchOverride] | None = None,
+    assignment_map: dict[str, dict] | None = None,
+    max_workers: int = 1,
+) -> CompareResult:
+    partitioned = None
+    if max_workers > 1:
+        partitioned = _partitioned_compare(left, right, include_baseline, overrides, max_workers)
+    if partitioned is not None:
+        candidates, diffs = partitioned
+    else:
+        matched, candidates = auto_match(left.leaf, right.leaf, overrides=overrides)
+        diffs = list(_iter_leaf_diffs(left, right, matched, candidates, include_baseline))
+
+    counter = SummaryCounter(left.leaf, right.leaf)
+    for diff in diffs:
+        counter.add(diff)
+    summary = counter.summary()
+
+    diffs.sort(key=diff_sort_key)
     diffs = initialize_attribution(diffs, assignment_map)
 
     result = CompareResult(summary=summary, candidates=candidates, diffs=diffs)
     result.fault_allocation = compute_fault_allocation(result)
     return result
+
+
+def compare_tasks_to_store(
+    left_tasks: list[TaskRecord],
+    right_tasks: list[TaskRecord],
+    include_baseline: bool,
+    store: ResultStore,
+    overrides: list[MatchOverride] | None = None,
+    assignment_map: dict[str, dict] | None = None,
+) -> StreamedCompareResult:
+    """Streaming variant of `compare_tasks` that never holds the full diff list.
+
+    Diffs are written to `store` as they are produced while summary counters and
+    fault allocation are accumulated on the fly. Ordering matches `compare_tasks`
+    because the store pages rows by the same sort key.
+    """
+    left_leaf = [t for t in left_tasks if not t.is_summary]
+    right_leaf = [t for t in right_tasks if not t.is_summary]
+    counter = SummaryCounter(left_leaf, right_leaf)
+    allocation = FaultAllocationAccumulator()
+
+    for diff in iter_task_diffs(left_tasks, right_tasks, include_baseline, overrides=overrides):
+        counter.add(diff)
+        initialize_attribution([diff], assignment_map)
+        allocation.add(diff)
+        store.append_diff(diff, sort_key=diff_sort_key(diff))
+
+    summary = counter.summary()
+    store.finalize()
+    return StreamedCompareResult(
+        result_id=store.result_id,
+        summary=summary,
+        fault_allocation=allocation.fault_allocation(summary.project_finish_delay_days),
+        total_rows=store.count_diffs(),
+    )
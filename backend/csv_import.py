@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import io
+import json
 import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
 from datetime import date, datetime
-from io import StringIO
 
-from .schemas import CsvImportDiagnostics, TaskRecord
+from .schemas import CsvImportDiagnostics, CsvMappingProfile, TaskRecord
 
 INFER_FIELDS = [
     "uid",
@@ -40,6 +44,15 @@ PERCENT_PLANNED_ALIASES = {"planned percent complete", "planned percent complete
 
 DURATION_TOKEN = re.compile(r"([0-9]*\.?[0-9]+)\s*([wdhm])", re.IGNORECASE)
 
+SAMPLE_ROW_LIMIT = 200
+DATE_MEMO_ENTRIES = 8192
+
+DATE_FIELDS = ["start", "finish", "baseline_start", "baseline_finish"]
+# Column date formats: ISO year-month-day, or slashed day-first / month-first.
+DATE_FORMATS = ("iso", "dmy", "mdy")
+ISO_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2}))?)?")
+SLASH_DATE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})(?: (\d{1,2}):(\d{2}))?")
+
 
 def _parse_date(value: str | None) -> date | None:
     if not value:
@@ -47,6 +60,12 @@ def _parse_date(value: str | None) -> date | None:
     raw = value.strip()
     if not raw:
         return None
+    # Every accepted form starts with a digit and has a "-" or "/" separator, a compact
+    # YYYYMMDD prefix or an ISO week ("YYYYWww"); anything else cannot parse.
+    if not raw[0].isdigit() or (raw.isdigit() and len(raw) != 8):
+        return None
+    if "-" not in raw and "/" not in raw and not raw[:8].isdigit() and raw[4:5] != "W":
+        return None
 
     formats = [
         "%Y-%m-%d",
@@ -69,6 +88,84 @@ def _parse_date(value: str | None) -> date | None:
     return None
 
 
+def _date_votes(values: Iterable[str]) -> dict[str, int]:
+    """Count sample values per format; slashed dates with both parts <= 12 only count as ambiguous."""
+    votes = {"iso": 0, "dmy": 0, "mdy": 0, "ambiguous": 0}
+    for value in values:
+        raw = value.strip() if value else ""
+        if ISO_DATE.fullmatch(raw):
+            votes["iso"] += 1
+            continue
+        match = SLASH_DATE.fullmatch(raw)
+        if match is None:
+            continue
+        first, second = int(match.group(1)), int(match.group(2))
+        if first > 12 >= second:
+            votes["dmy"] += 1
+        elif second > 12 >= first:
+            votes["mdy"] += 1
+        else:
+            votes["ambiguous"] += 1
+    return votes
+
+
+def _format_from_votes(votes: dict[str, int], default_order: str = "dmy") -> str | None:
+    slashed = votes["dmy"] + votes["mdy"] + votes["ambiguous"]
+    if not slashed and not votes["iso"]:
+        return None
+    if votes["iso"] >= slashed:
+        return "iso"
+    if votes["mdy"] != votes["dmy"]:
+        return "mdy" if votes["mdy"] > votes["dmy"] else "dmy"
+    return default_order
+
+
+def infer_date_format(values: Iterable[str]) -> str | None:
+    """Pick one format for a column of sample values, or None when no value has a known shape.
+
+    Day-first wins ties, matching the per-value parser's format order.
+    """
+    return _format_from_votes(_date_votes(values))
+
+
+def _fast_date(raw: str, date_format: str) -> date | None:
+    if date_format == "iso":
+        match = ISO_DATE.fullmatch(raw)
+        if match is None:
+            return None
+        year, month, day, hour, minute, second = match.groups()
+    else:
+        match = SLASH_DATE.fullmatch(raw)
+        if match is None:
+            return None
+        first, second_part, year, hour, minute = match.groups()
+        day, month = (first, second_part) if date_format == "dmy" else (second_part, first)
+        second = None
+    if hour is not None and not (int(hour) < 24 and int(minute) < 60 and (second is None or int(second) < 60)):
+        return None
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _date_parser(date_format: str | None) -> Callable[[str | None], date | None]:
+    """Parser for one column: the format's fast path, with `_parse_date` only for outliers."""
+    if date_format is None:
+        return _parse_date
+
+    def parse(value: str | None) -> date | None:
+        if not value:
+            return None
+        raw = value.strip()
+        parsed = _fast_date(raw, date_format)
+        if parsed is None:
+            return _parse_date(raw)
+        return parsed
+
+    return parse
+
+
 def _parse_int(value: str | None) -> int | None:
     if value is None:
         return None
@@ -161,32 +258,48 @@ def _normalize_header(value: str | None) -> str:
     return normalized
 
 
-def _safe_get(row: dict[str, str], header_name: str | None) -> str | None:
-    if not header_name:
-        return None
-    return row.get(header_name)
-
-
 def _is_empty_row(row: list[str]) -> bool:
     return not any((cell or "").strip() for cell in row)
 
 
-def _is_duplicate_header_row(row: list[str], headers: list[str]) -> bool:
-    if len(headers) == 0:
-        return False
-    matches = 0
-    comparable = 0
-    for idx, header in enumerate(headers):
-        header_norm = _normalize_header(header)
-        cell_norm = _normalize_header(row[idx] if idx < len(row) else "")
-        if not header_norm and not cell_norm:
-            continue
-        comparable += 1
-        if header_norm == cell_norm:
-            matches += 1
-    if comparable == 0:
-        return False
-    return (matches / comparable) >= 0.8
+def _duplicate_header_checker(headers: list[str]) -> Callable[[list[str]], bool]:
+    """Return a test for rows that repeat the header (80% of comparable cells match).
+
+    Header names are normalized once. Every non-blank header is comparable, so
+    once more than a fifth of them mismatch the row cannot reach the threshold
+    and the remaining cells are not normalized at all.
+    """
+    normalized = [_normalize_header(header) for header in headers]
+    named = sum(1 for header_norm in normalized if header_norm)
+
+    def is_duplicate(row: list[str]) -> bool:
+        if not normalized:
+            return False
+        matches = 0
+        comparable = 0
+        mismatches = 0
+        for idx, header_norm in enumerate(normalized):
+            cell_norm = _normalize_header(row[idx] if idx < len(row) else "")
+            if not header_norm and not cell_norm:
+                continue
+            comparable += 1
+            if header_norm == cell_norm:
+                matches += 1
+            elif header_norm:
+                mismatches += 1
+                if 5 * mismatches > named:
+                    return False
+        if comparable == 0:
+            return False
+        return (matches / comparable) >= 0.8
+
+    return is_duplicate
+
+
+def _iter_csv_rows(data: bytes) -> Iterator[list[str]]:
+    """Stream parsed rows straight from the upload bytes, decoding incrementally."""
+    text = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", errors="replace", newline="")
+    yield from csv.reader(text)
 
 
 def _unique_non_empty(values: list[str]) -> list[str]:
@@ -211,31 +324,85 @@ def _pick_best(items: list[tuple[str, float]]) -> tuple[str | None, float, float
     return best_header, best_score, second_score
 
 
-def _value_score(field: str, values: list[str]) -> float:
+SUMMARY_TOKENS = {"1", "0", "true", "false", "yes", "no", "y", "n"}
+
+
+@dataclass
+class ColumnProfile:
+    """Parse outcomes for one column's sample cells, each cell typed exactly once."""
+
+    non_empty: int
+    distinct: int
+    ints: int
+    distinct_ints: int
+    dates: int
+    durations: int
+    floats: int
+    predecessors: int
+    summary_tokens: int
+    names: int
+    date_votes: dict[str, int]
+    date_format: str | None
+
+    @property
+    def unique(self) -> bool:
+        return self.non_empty > 0 and self.distinct == self.non_empty
+
+    def value_score(self, field: str) -> float:
+        if not self.non_empty:
+            return 0.0
+        if field == "uid":
+            # A UID column holds integers without repeats; repeated values dilute the score.
+            matches = self.distinct_ints
+        elif field in DATE_FIELDS:
+            matches = self.dates
+        else:
+            matches = {
+                "outline_level": self.ints,
+                "duration_minutes": self.durations,
+                "percent_complete": self.floats,
+                "predecessors": self.predecessors,
+                "is_summary": self.summary_tokens,
+                "name": self.names,
+            }.get(field, 0)
+        return matches / self.non_empty
+
+
+def profile_column(values: Iterable[str | None]) -> ColumnProfile:
+    """Type every non-empty sample cell once as int, date, duration, float, predecessors and flag."""
     non_empty = [value.strip() for value in values if value is not None and value.strip()]
-    if not non_empty:
-        return 0.0
-
-    if field in {"uid", "outline_level"}:
-        return sum(1 for value in non_empty if _parse_int(value) is not None) / len(non_empty)
-    if field in {"start", "finish", "baseline_start", "baseline_finish"}:
-        return sum(1 for value in non_empty if _parse_date(value) is not None) / len(non_empty)
-    if field == "duration_minutes":
-        return sum(1 for value in non_empty if _parse_duration_minutes(value) is not None) / len(non_empty)
-    if field == "percent_complete":
-        return sum(1 for value in non_empty if _parse_float(value) is not None) / len(non_empty)
-    if field == "predecessors":
-        return sum(1 for value in non_empty if bool(_parse_predecessors(value))) / len(non_empty)
-    if field == "is_summary":
-        truthy = {"1", "0", "true", "false", "yes", "no", "y", "n"}
-        return sum(1 for value in non_empty if value.strip().lower() in truthy) / len(non_empty)
-    if field == "name":
-        return sum(
-            1
-            for value in non_empty
-            if _parse_date(value) is None and _parse_int(value) is None
-        ) / len(non_empty)
-    return 0.0
+    date_votes = _date_votes(non_empty)
+    date_format = _format_from_votes(date_votes)
+    parse_date = _date_parser(date_format)
+    counts = dict.fromkeys(("ints", "dates", "durations", "floats", "predecessors", "summary_tokens", "names"), 0)
+    seen_ints: set[int] = set()
+    for value in non_empty:
+        as_int = _parse_int(value)
+        is_date = parse_date(value) is not None
+        if as_int is not None:
+            counts["ints"] += 1
+            seen_ints.add(as_int)
+        if is_date:
+            counts["dates"] += 1
+        # `_parse_duration_minutes` accepts any integer before trying unit tokens.
+        if as_int is not None or _parse_duration_minutes(value) is not None:
+            counts["durations"] += 1
+        if _parse_float(value) is not None:
+            counts["floats"] += 1
+        if _parse_predecessors(value):
+            counts["predecessors"] += 1
+        if value.lower() in SUMMARY_TOKENS:
+            counts["summary_tokens"] += 1
+        if not is_date and as_int is None:
+            counts["names"] += 1
+    return ColumnProfile(
+        non_empty=len(non_empty),
+        distinct=len(set(non_empty)),
+        distinct_ints=len(seen_ints),
+        date_votes=date_votes,
+        date_format=date_format,
+        **counts,
+    )
 
 
 def _header_score(field: str, normalized_header: str) -> float:
@@ -285,27 +452,54 @@ def _inference_threshold(field: str) -> float:
     return 0.35
 
 
-def _build_sample_rows(headers: list[str], rows: list[list[str]], sample_limit: int = 200) -> list[dict[str, str]]:
-    samples: list[dict[str, str]] = []
+def _sample_rows(
+    headers: list[str],
+    rows: Iterable[list[str]],
+    sample_limit: int = SAMPLE_ROW_LIMIT,
+) -> list[list[str]]:
+    """First non-empty, non-header rows, padded or trimmed to the header width."""
+    samples: list[list[str]] = []
+    is_duplicate_header = _duplicate_header_checker(headers)
     for row in rows:
         padded = list(row[: len(headers)]) + [""] * max(0, len(headers) - len(row))
         if _is_empty_row(padded):
             continue
-        if _is_duplicate_header_row(padded, headers):
+        if is_duplicate_header(padded):
             continue
-        samples.append({headers[idx]: padded[idx] for idx in range(len(headers))})
+        samples.append(padded)
         if len(samples) >= sample_limit:
             break
     return samples
 
 
+def _build_sample_rows(
+    headers: list[str],
+    rows: Iterable[list[str]],
+    sample_limit: int = SAMPLE_ROW_LIMIT,
+) -> list[dict[str, str]]:
+    return [
+        {headers[idx]: padded[idx] for idx in range(len(headers))}
+        for padded in _sample_rows(headers, rows, sample_limit)
+    ]
+
+
+@dataclass
+class ColumnResolution:
+    resolved: dict[str, str]
+    inferred_fields: list[str]
+    warnings: list[str]
+    scored_best: list[tuple[str, float]]
+    date_formats: dict[str, str]
+    duration_convention: str | None
+
+
 def _resolve_column_map(
     headers: list[str],
-    rows: list[list[str]],
+    rows: Iterable[list[str]],
     provided_map: dict[str, str] | None,
     *,
     allow_inference: bool,
-) -> tuple[dict[str, str], list[str], list[str], list[tuple[str, float]]]:
+) -> ColumnResolution:
     provided_map = provided_map or {}
     resolved: dict[str, str] = {}
     inferred_fields: list[str] = []
@@ -314,6 +508,7 @@ def _resolve_column_map(
 
     samples = _build_sample_rows(headers, rows)
     column_values: dict[str, list[str]] = {header: [sample.get(header, "") for sample in samples] for header in headers}
+    profiles: dict[str, ColumnProfile] = {}
     normalized_headers = {header: _normalize_header(header) for header in headers}
 
     for field, requested in provided_map.items():
@@ -357,7 +552,10 @@ def _resolve_column_map(
                 if header in used_headers:
                     continue
                 h_score = _header_score(field, normalized_headers[header])
-                v_score = _value_score(field, column_values[header])
+                profile = profiles.get(header)
+                if profile is None:
+                    profile = profiles[header] = profile_column(column_values[header])
+                v_score = profile.value_score(field)
                 total = round((0.7 * h_score) + (0.3 * v_score), 4)
                 candidates.append((header, total))
 
@@ -376,85 +574,253 @@ def _resolve_column_map(
     else:
         scored_best = [(field, 0.0) for field in INFER_FIELDS if field not in resolved]
 
-    return resolved, inferred_fields, warnings, scored_best
+    return ColumnResolution(
+        resolved=resolved,
+        inferred_fields=inferred_fields,
+        warnings=warnings,
+        scored_best=scored_best,
+        date_formats=_resolve_date_formats(resolved, column_values),
+        duration_convention=_duration_convention(column_values.get(resolved.get("duration_minutes", ""), [])),
+    )
+
+
+def _resolve_date_formats(resolved: dict[str, str], column_values: dict[str, list[str]]) -> dict[str, str]:
+    """Choose each resolved date column's format from its samples.
+
+    A column whose samples are all ambiguous (both parts <= 12) follows the
+    day/month order the file's other date columns settle on.
+    """
+    votes = {field: _date_votes(column_values.get(resolved[field], [])) for field in DATE_FIELDS if resolved.get(field)}
+    month_first = sum(field_votes["mdy"] for field_votes in votes.values())
+    day_first = sum(field_votes["dmy"] for field_votes in votes.values())
+    default_order = "mdy" if month_first > day_first else "dmy"
+    date_formats: dict[str, str] = {}
+    for field, field_votes in votes.items():
+        date_format = _format_from_votes(field_votes, default_order)
+        if date_format is not None:
+            date_formats[field] = date_format
+    return date_formats
+
+
+def _duration_convention(values: list[str]) -> str | None:
+    """"minutes" when sampled durations are bare numbers, "units" when any uses w/d/h/m tokens."""
+    non_empty = [value.strip() for value in values if value and value.strip()]
+    if not non_empty:
+        return None
+    if any(_parse_int(value) is None and _parse_duration_minutes(value) is not None for value in non_empty):
+        return "units"
+    return "minutes"
+
 
+def header_signature(headers: list[str]) -> str:
+    """Identify an export template by its normalized header row, in order."""
+    normalized = [_normalize_header(header) for header in headers]
+    return hashlib.sha256(json.dumps(normalized, separators=(",", ":")).encode("utf-8")).hexdigest()
 
-def _build_tasks_from_rows(
+
+PROFILE_MIN_VALID_SAMPLE_SHARE = 0.5
+
+
+def _resolution_from_profile(
+    profile: CsvMappingProfile,
     headers: list[str],
-    data_rows: list[list[str]],
-    resolved_map: dict[str, str],
-) -> tuple[list[TaskRecord], int, int, bool, int]:
-    tasks: list[TaskRecord] = []
-    skipped_duplicate_header_rows = 0
-    skipped_invalid_rows = 0
-    synthetic_uid = not bool(resolved_map.get("uid"))
-    synthetic_uid_rows = 0
-    seen_uids: set[int] = set()
-    next_uid = 1
+    rows: Iterable[list[str]],
+) -> ColumnResolution | None:
+    """Reuse a saved mapping when a sample of this file still agrees with it, else None.
+
+    Pinned profiles skip the sample check. Otherwise at least half of the sampled
+    rows must yield a task under the saved mapping and formats, and no date or
+    duration column may now clearly use a different convention.
+    """
+    column_map: dict[str, str] = {}
+    for field, saved_header in profile.column_map.items():
+        actual = _resolve_requested_header(saved_header, headers)
+        if actual is None:
+            return None
+        column_map[field] = actual
+    if any(not column_map.get(field) for field in REQUIRED_FIELDS):
+        return None
+    resolution = ColumnResolution(
+        resolved=column_map,
+        inferred_fields=[],
+        warnings=["Applied saved column mapping profile for this header layout."],
+        scored_best=[],
+        date_formats=dict(profile.date_formats),
+        duration_convention=profile.duration_convention,
+    )
+    if profile.pinned:
+        return resolution
 
-    for row_cells in data_rows:
-        row = list(row_cells[: len(headers)]) + [""] * max(0, len(headers) - len(row_cells))
-        if _is_empty_row(row):
-            continue
+    samples = _build_sample_rows(headers, rows)
+    column_values = {header: [sample.get(header, "") for sample in samples] for header in column_map.values()}
+    for field, saved_format in profile.date_formats.items():
+        header = column_map.get(field)
+        if not header:
+            return None
+        default_order = saved_format if saved_format != "iso" else "dmy"
+        sampled_format = _format_from_votes(_date_votes(column_values[header]), default_order)
+        if sampled_format is not None and sampled_format != saved_format:
+            return None
+    duration_header = column_map.get("duration_minutes")
+    if duration_header and profile.duration_convention:
+        sampled_convention = _duration_convention(column_values[duration_header])
+        if sampled_convention is not None and sampled_convention != profile.duration_convention:
+            return None
+
+    parsers = {field: _date_parser(profile.date_formats.get(field)) for field in ("start", "finish")}
+    valid = sum(
+        1
+        for sample in samples
+        if sample[column_map["name"]].strip()
+        and parsers["start"](sample[column_map["start"]]) is not None
+        and parsers["finish"](sample[column_map["finish"]]) is not None
+    )
+    if not samples or valid < PROFILE_MIN_VALID_SAMPLE_SHARE * len(samples):
+        return None
+    return resolution
 
-        if _is_duplicate_header_row(row, headers):
-            skipped_duplicate_header_rows += 1
-            continue
 
-        row_dict = {headers[idx]: row[idx] for idx in range(len(headers))}
-        name = (_safe_get(row_dict, resolved_map.get("name")) or "").strip()
-        start = _parse_date(_safe_get(row_dict, resolved_map.get("start")))
-        finish = _parse_date(_safe_get(row_dict, resolved_map.get("finish")))
+def _memoized(parse: Callable[[str], object], max_entries: int) -> Callable[[str], object]:
+    """Cache a pure cell parser; schedule exports repeat the same date strings across many rows."""
+    cache: dict[str, object] = {}
+
+    def parse_cached(value: str) -> object:
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+        parsed = parse(value)
+        if len(cache) >= max_entries:
+            cache.clear()
+        cache[value] = parsed
+        return parsed
+
+    return parse_cached
+
+
+def _column_indexes(headers: list[str], resolved_map: dict[str, str]) -> dict[str, int]:
+    # A repeated header name resolves to its last column, as a header-keyed row dict would.
+    position = {header: idx for idx, header in enumerate(headers)}
+    return {field: position[header] for field, header in resolved_map.items() if header and header in position}
+
+
+class _TaskBuilder:
+    """Turn filtered rows into tasks under one column mapping, tracking its skip and UID counters."""
+
+    def __init__(self, headers: list[str], resolved_map: dict[str, str], date_formats: dict[str, str] | None) -> None:
+        self.tasks: list[TaskRecord] = []
+        self.skipped_invalid_rows = 0
+        self.synthetic_uid = not bool(resolved_map.get("uid"))
+        self.synthetic_uid_rows = 0
+        self._seen_uids: set[int] = set()
+        self._next_uid = 1
+
+        columns = _column_indexes(headers, resolved_map)
+        self._name_idx = columns.get("name")
+        self._start_idx = columns.get("start")
+        self._finish_idx = columns.get("finish")
+        self._uid_idx = columns.get("uid")
+        date_formats = date_formats or {}
+        date_parsers = {
+            date_format: _memoized(_date_parser(date_format), DATE_MEMO_ENTRIES)
+            for date_format in {date_formats.get(field) for field in DATE_FIELDS}
+        }
+        self._start_date, self._finish_date, baseline_start_date, baseline_finish_date = (
+            date_parsers[date_formats.get(field)] for field in DATE_FIELDS
+        )
+        self._optional = [
+            (field, columns[field], parser)
+            for field, parser in (
+                ("wbs", lambda value: value or None),
+                ("outline_level", _parse_int),
+                ("is_summary", _parse_bool),
+                ("duration_minutes", _parse_duration_minutes),
+                ("percent_complete", _parse_float),
+                ("predecessors", _parse_predecessors),
+                ("baseline_start", baseline_start_date),
+                ("baseline_finish", baseline_finish_date),
+            )
+            if field in columns
+        ]
+
+    def add(self, row: list[str]) -> None:
+        name = (row[self._name_idx] if self._name_idx is not None else "").strip()
+        start = self._start_date(row[self._start_idx]) if self._start_idx is not None else None
+        finish = self._finish_date(row[self._finish_idx]) if self._finish_idx is not None else None
 
         if not name or start is None or finish is None:
-            skipped_invalid_rows += 1
-            continue
+            self.skipped_invalid_rows += 1
+            return
 
-        uid = _parse_int(_safe_get(row_dict, resolved_map.get("uid")))
+        uid = _parse_int(row[self._uid_idx]) if self._uid_idx is not None else None
         uid_inferred = False
         if uid is None:
             uid_inferred = True
-            synthetic_uid_rows += 1
-            while next_uid in seen_uids:
-                next_uid += 1
-            uid = next_uid
-            next_uid += 1
+            self.synthetic_uid_rows += 1
+            while self._next_uid in self._seen_uids:
+                self._next_uid += 1
+            uid = self._next_uid
+            self._next_uid += 1
         else:
-            next_uid = max(next_uid, uid + 1)
-        seen_uids.add(uid)
-
-        task = TaskRecord(
-            uid=uid,
-            uid_inferred=uid_inferred,
-            name=name,
-            wbs=(_safe_get(row_dict, resolved_map.get("wbs")) or None) if resolved_map.get("wbs") else None,
-            outline_level=_parse_int(_safe_get(row_dict, resolved_map.get("outline_level")))
-            if resolved_map.get("outline_level")
-            else None,
-            is_summary=_parse_bool(_safe_get(row_dict, resolved_map.get("is_summary")))
-            if resolved_map.get("is_summary")
-            else False,
-            start=start,
-            finish=finish,
-            duration_minutes=_parse_duration_minutes(_safe_get(row_dict, resolved_map.get("duration_minutes")))
-            if resolved_map.get("duration_minutes")
-            else None,
-            percent_complete=_parse_float(_safe_get(row_dict, resolved_map.get("percent_complete")))
-            if resolved_map.get("percent_complete")
-            else None,
-            predecessors=_parse_predecessors(_safe_get(row_dict, resolved_map.get("predecessors")))
-            if resolved_map.get("predecessors")
-            else [],
-            baseline_start=_parse_date(_safe_get(row_dict, resolved_map.get("baseline_start")))
-            if resolved_map.get("baseline_start")
-            else None,
-            baseline_finish=_parse_date(_safe_get(row_dict, resolved_map.get("baseline_finish")))
-            if resolved_map.get("baseline_finish")
-            else None,
+            self._next_uid = max(self._next_uid, uid + 1)
+        self._seen_uids.add(uid)
+
+        self.tasks.append(
+            TaskRecord(
+                uid=uid,
+                uid_inferred=uid_inferred,
+                name=name,
+                start=start,
+                finish=finish,
+                **{field: parser(row[idx]) for field, idx, parser in self._optional},
+            )
         )
-        tasks.append(task)
 
-    return tasks, skipped_duplicate_header_rows, skipped_invalid_rows, synthetic_uid, synthetic_uid_rows
+
+def _build_tasks(
+    headers: list[str],
+    data_rows: Iterable[list[str]],
+    primary: _TaskBuilder,
+    fallback: _TaskBuilder | None = None,
+) -> int:
+    """Feed every data row to `primary` in one pass; returns the skipped duplicate-header count.
+
+    `fallback` only matters if `primary` ends up with no tasks, so it is fed
+    rows just until `primary` produces its first task and is then dropped.
+    """
+    skipped_duplicate_header_rows = 0
+    width = len(headers)
+    is_duplicate_header = _duplicate_header_checker(headers)
+
+    for row_cells in data_rows:
+        if len(row_cells) == width:
+            row = row_cells
+        else:
+            row = row_cells[:width] + [""] * max(0, width - len(row_cells))
+        if _is_empty_row(row):
+            continue
+
+        if is_duplicate_header(row):
+            skipped_duplicate_header_rows += 1
+            continue
+
+        primary.add(row)
+        if fallback is not None:
+            if primary.tasks:
+                fallback = None
+            else:
+                fallback.add(row)
+
+    return skipped_duplicate_header_rows
+
+
+def _sample_yields_task(headers: list[str], data: bytes, resolution: ColumnResolution) -> bool:
+    builder = _TaskBuilder(headers, resolution.resolved, resolution.date_formats)
+    for row in _sample_rows(headers, _iter_data_rows(data)):
+        builder.add(row)
+        if builder.tasks:
+            return True
+    return False
 
 
 def _format_inference_hint(scored_best: list[tuple[str, float]]) -> str:
@@ -464,28 +830,64 @@ def _format_inference_hint(scored_best: list[tuple[str, float]]) -> str:
     return ", ".join(items[:6])
 
 
+def read_csv_headers(data: bytes) -> list[str]:
+    first_row = next(_iter_csv_rows(data), None)
+    if first_row is None:
+        raise ValueError("CSV appears empty")
+    headers = [header.strip() for header in first_row]
+    if not any(headers):
+        raise ValueError("CSV header row is empty")
+    return headers
+
+
+def _iter_data_rows(data: bytes) -> Iterator[list[str]]:
+    rows = _iter_csv_rows(data)
+    next(rows, None)
+    return rows
+
+
 def parse_tasks_from_csv_bytes(
     data: bytes,
     column_map: dict[str, str] | None = None,
     *,
     allow_inference: bool = True,
     return_diagnostics: bool = False,
+    saved_profile: CsvMappingProfile | None = None,
 ) -> list[TaskRecord] | tuple[list[TaskRecord], CsvImportDiagnostics]:
-    text = data.decode("utf-8-sig", errors="replace")
-    reader = csv.reader(StringIO(text))
-    rows = list(reader)
-    if not rows:
-        raise ValueError("CSV appears empty")
-    headers = [header.strip() for header in rows[0]]
-    if not any(headers):
-        raise ValueError("CSV header row is empty")
-
-    resolved_map, inferred_fields, warnings, scored_best = _resolve_column_map(
-        headers,
-        rows[1:],
-        column_map,
-        allow_inference=allow_inference,
-    )
+    """Parse CSV task rows in streaming passes over the upload bytes.
+
+    Column inference reads only the header and a bounded sample of rows; a
+    single full pass then streams every row and reads the resolved columns by
+    index. No pass holds the decoded text or the full row list in memory.
+
+    A `saved_profile` for this header layout replaces `column_map` and inference
+    when a sample of the file still agrees with it.
+    """
+    headers = read_csv_headers(data)
+
+    resolution = None
+    profile_rejected = False
+    if saved_profile is not None:
+        resolution = _resolution_from_profile(saved_profile, headers, _iter_data_rows(data))
+        profile_rejected = resolution is None
+    profile_applied = resolution is not None
+    if resolution is None:
+        resolution = _resolve_column_map(
+            headers,
+            _iter_data_rows(data),
+            column_map,
+            allow_inference=allow_inference,
+        )
+        if profile_rejected:
+            resolution.warnings.append(
+                "Saved column mapping profile no longer matches this file; columns were re-detected."
+            )
+    resolved_map = resolution.resolved
+    inferred_fields = resolution.inferred_fields
+    warnings = resolution.warnings
+    scored_best = resolution.scored_best
+    date_formats = resolution.date_formats
+    duration_convention = resolution.duration_convention
 
     missing_required = [field for field in REQUIRED_FIELDS if not resolved_map.get(field)]
     if missing_required:
@@ -495,15 +897,17 @@ def parse_tasks_from_csv_bytes(
             f"{', '.join(missing_required)}. Available headers: {headers}. Inference hints: {hints}"
         )
 
-    tasks, skipped_duplicate_header_rows, skipped_invalid_rows, synthetic_uid, synthetic_uid_rows = _build_tasks_from_rows(
-        headers,
-        rows[1:],
-        resolved_map,
-    )
-
+    # Configured required columns that produce no tasks at all fall back to auto-detected
+    # ones. A single valid sampled row rules that out; otherwise the fallback mapping is
+    # resolved now and evaluated alongside the configured one in the same pass.
+    fallback: ColumnResolution | None = None
     provided_map = column_map or {}
     has_explicit_required_mappings = any((provided_map.get(field) or "").strip() for field in REQUIRED_FIELDS)
-    if not tasks and allow_inference and has_explicit_required_mappings:
+    if (
+        allow_inference
+        and has_explicit_required_mappings
+        and not _sample_yields_task(headers, data, resolution)
+    ):
         fallback_map = dict(provided_map)
         dropped_required_fields: list[str] = []
         for field in REQUIRED_FIELDS:
@@ -512,39 +916,35 @@ def parse_tasks_from_csv_bytes(
                 fallback_map.pop(field, None)
 
         if dropped_required_fields:
-            fallback_resolved, fallback_inferred, fallback_warnings, fallback_scored = _resolve_column_map(
+            candidate = _resolve_column_map(
                 headers,
-                rows[1:],
+                _iter_data_rows(data),
                 fallback_map,
                 allow_inference=allow_inference,
             )
-            fallback_missing_required = [field for field in REQUIRED_FIELDS if not fallback_resolved.get(field)]
-            if not fallback_missing_required:
-                (
-                    fallback_tasks,
-                    fallback_skipped_duplicate_header_rows,
-                    fallback_skipped_invalid_rows,
-                    fallback_synthetic_uid,
-                    fallback_synthetic_uid_rows,
-                ) = _build_tasks_from_rows(
-                    headers,
-                    rows[1:],
-                    fallback_resolved,
-                )
-                if fallback_tasks:
-                    tasks = fallback_tasks
-                    resolved_map = fallback_resolved
-                    inferred_fields = _unique_non_empty(inferred_fields + fallback_inferred)
-                    scored_best = fallback_scored
-                    warnings = _unique_non_empty(warnings + fallback_warnings)
-                    warnings.append(
-                        "Configured required-column mappings produced no valid rows; "
-                        "auto-detected required fields and recovered task rows."
-                    )
-                    skipped_duplicate_header_rows = fallback_skipped_duplicate_header_rows
-                    skipped_invalid_rows = fallback_skipped_invalid_rows
-                    synthetic_uid = fallback_synthetic_uid
-                    synthetic_uid_rows = fallback_synthetic_uid_rows
+            if all(candidate.resolved.get(field) for field in REQUIRED_FIELDS):
+                fallback = candidate
+
+    primary_builder = _TaskBuilder(headers, resolved_map, date_formats)
+    fallback_builder = _TaskBuilder(headers, fallback.resolved, fallback.date_formats) if fallback else None
+    skipped_duplicate_header_rows = _build_tasks(headers, _iter_data_rows(data), primary_builder, fallback_builder)
+    builder = primary_builder
+    if not primary_builder.tasks and fallback is not None and fallback_builder.tasks:
+        builder = fallback_builder
+        resolved_map = fallback.resolved
+        date_formats = fallback.date_formats
+        duration_convention = fallback.duration_convention
+        inferred_fields = _unique_non_empty(inferred_fields + fallback.inferred_fields)
+        scored_best = fallback.scored_best
+        warnings = _unique_non_empty(warnings + fallback.warnings)
+        warnings.append(
+            "Configured required-column mappings produced no valid rows; "
+            "auto-detected required fields and recovered task rows."
+        )
+    tasks = builder.tasks
+    skipped_invalid_rows = builder.skipped_invalid_rows
+    synthetic_uid = builder.synthetic_uid
+    synthetic_uid_rows = builder.synthetic_uid_rows
 
     if not tasks:
         hints = _format_inference_hint(scored_best)
@@ -562,6 +962,10 @@ def parse_tasks_from_csv_bytes(
 
     diagnostics = CsvImportDiagnostics(
         resolved_column_map=resolved_map,
+        date_formats=date_formats,
+        duration_convention=duration_convention,
+        header_signature=header_signature(headers),
+        profile_applied=profile_applied,
         inferred_fields=_unique_non_empty(inferred_fields),
         warnings=_unique_non_empty(warnings),
         synthetic_uid=synthetic_uid or synthetic_uid_rows > 0,
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .schemas import CsvImportDiagnostics, CsvMappingProfile
+
+STORE_FILENAME = "csv-profiles.sqlite3"
+
+
+class CsvProfileStore:
+    """Resolved CSV column mappings keyed by the export template's header signature.
+
+    Backed by SQLite under the data directory, or by an in-memory database when
+    persistence is disabled so repeat imports still skip inference this session.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path) if path is not None else ":memory:", check_same_thread=False)
+        if path is not None:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS csv_profiles ("
+            "signature TEXT PRIMARY KEY, payload TEXT NOT NULL, updated_at TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def get(self, signature: str) -> CsvMappingProfile | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM csv_profiles WHERE signature = ?",
+                (signature,),
+            ).fetchone()
+        return CsvMappingProfile.model_validate_json(row[0]) if row else None
+
+    def list(self) -> list[CsvMappingProfile]:
+        with self._lock:
+            rows = self._conn.execute("SELECT payload FROM csv_profiles ORDER BY updated_at DESC").fetchall()
+        return [CsvMappingProfile.model_validate_json(payload) for (payload,) in rows]
+
+    def save(self, profile: CsvMappingProfile) -> CsvMappingProfile:
+        profile = profile.model_copy(update={"updated_at": datetime.now(timezone.utc).isoformat()})
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO csv_profiles (signature, payload, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (signature) DO UPDATE SET "
+                    "payload = excluded.payload, updated_at = excluded.updated_at",
+                    (profile.signature, profile.model_dump_json(), profile.updated_at),
+                )
+        return profile
+
+    def record_import(self, headers: list[str], diagnostics: CsvImportDiagnostics) -> CsvMappingProfile:
+        """Remember the mapping an import resolved; a pinned profile keeps its mapping."""
+        existing = self.get(diagnostics.header_signature)
+        if existing is not None and existing.pinned:
+            return self.save(existing.model_copy(update={"use_count": existing.use_count + 1}))
+        return self.save(
+            CsvMappingProfile(
+                signature=diagnostics.header_signature,
+                headers=headers,
+                column_map=diagnostics.resolved_column_map,
+                date_formats=diagnostics.date_formats,
+                duration_convention=diagnostics.duration_convention,
+                use_count=(existing.use_count if existing is not None else 0) + 1,
+            )
+        )
+
+    def set_pinned(self, signature: str, pinned: bool) -> CsvMappingProfile | None:
+        existing = self.get(signature)
+        if existing is None:
+            return None
+        return self.save(existing.model_copy(update={"pinned": pinned}))
+
+    def delete(self, signature: str) -> bool:
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute("DELETE FROM csv_profiles WHERE signature = ?", (signature,))
+        return cursor.rowcount > 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_csv_profile_store(data_dir: str | None) -> CsvProfileStore:
+    """Persist under `data_dir` when set; otherwise keep profiles for this process only."""
+    return CsvProfileStore(Path(data_dir) / STORE_FILENAME if data_dir else None)
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Union
+
+from .matching import normalize_task_name
+from .schemas import TaskDiff
+
+# Query field name -> canonical index name. Long forms mirror TaskDiff attributes.
+FIELD_ALIASES = {
+    "status": "status",
+    "band": "band",
+    "confidence_band": "band",
+    "category": "category",
+    "change_category": "category",
+    "cause": "cause",
+    "cause_tag": "cause",
+    "input": "input",
+    "requires_user_input": "input",
+    "attr": "attr",
+    "attribution_status": "attr",
+    "name": "name",
+    "reason": "reason",
+    "reason_code": "reason",
+    "month": "month",
+    "wbs": "wbs",
+    "summary": "summary",
+}
+
+# Fields whose values are matched token-by-token against normalized names.
+TOKEN_FIELDS = {"name", "summary"}
+
+MONTH_NAMES = {
+    name: str(number)
+    for number, names in enumerate(
+        (
+            ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+            ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+            ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"), ("dec", "december"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+
+BOOLEAN_VALUES = {"true": "true", "yes": "true", "1": "true", "false": "false", "no": "false", "0": "false"}
+
+_NAME_TOKEN = re.compile(r"[^\w]+")
+
+
+def name_tokens(value: str | None) -> set[str]:
+    if not value:
+        return set()
+    return {token for token in _NAME_TOKEN.split(normalize_task_name(value)) if token}
+
+
+# Single-valued fields, in the order `_scalar_values` returns them.
+SCALAR_FIELDS = ("status", "band", "category", "cause", "input", "attr", "reason", "month")
+
+
+def _scalar_values(diff: TaskDiff) -> tuple[str, ...]:
+    finish = diff.right_finish or diff.left_finish
+    return (
+        diff.status,
+        diff.confidence_band,
+        diff.change_category,
+        diff.cause_tag,
+        "true" if diff.requires_user_input else "false",
+        diff.attribution_status,
+        diff.reason_code,
+        str(finish.month) if finish else "",
+    )
+
+
+class DiffIndex:
+    """Secondary indexes from field values to row keys over one result's diffs."""
+
+    def __init__(self, diffs: list[TaskDiff]) -> None:
+        self.all_keys: set[str] = set()
+        self._postings: dict[str, dict[str, set[str]]] = defaultdict(lambda: defaultdict(set))
+        self._scalar_postings = [self._postings[field] for field in SCALAR_FIELDS]
+        self._values: dict[str, tuple[tuple[str, ...], frozenset[str]]] = {}
+        self._static: dict[str, dict[str, set[str]]] = defaultdict(dict)
+        self._token_cache: dict[str, frozenset[str]] = {}
+        for diff in diffs:
+            self._add(diff)
+
+    def _tokens(self, name: str | None) -> frozenset[str]:
+        if not name:
+            return frozenset()
+        tokens = self._token_cache.get(name)
+        if tokens is None:
+            tokens = frozenset(name_tokens(name))
+            self._token_cache[name] = tokens
+        return tokens
+
+    def _add(self, diff: TaskDiff) -> None:
+        row_key = diff.row_key
+        scalars = _scalar_values(diff)
+        tokens = self._tokens(diff.left_name)
+        if diff.right_name != diff.left_name:
+            tokens = tokens | self._tokens(diff.right_name)
+        self._values[row_key] = (scalars, tokens)
+        self.all_keys.add(row_key)
+        for postings, value in zip(self._scalar_postings, scalars):
+            postings[value].add(row_key)
+        name_postings = self._postings["name"]
+        for token in tokens:
+            name_postings[token].add(row_key)
+
+    def refresh(self, diff: TaskDiff) -> None:
+        """Re-index one diff after its attribution or classification changed."""
+        previous = self._values.get(diff.row_key)
+        if previous is not None:
+            scalars, tokens = previous
+            for postings, value in zip(self._scalar_postings, scalars):
+                postings[value].discard(diff.row_key)
+            name_postings = self._postings["name"]
+            for token in tokens:
+                name_postings[token].discard(diff.row_key)
+        self._add(diff)
+
+    def add_static(self, field: str, values_by_key: dict[str, set[str]]) -> None:
+        """Index values that edits never change, such as WBS codes from the source tasks."""
+        postings = self._postings[field]
+        for row_key, values in values_by_key.items():
+            if row_key not in self._values:
+                continue
+            for value in self._static[row_key].get(field, set()):
+                postings[value].discard(row_key)
+            self._static[row_key][field] = set(values)
+            for value in values:
+                postings[value].add(row_key)
+
+    def lookup(self, field: str, value: str) -> set[str]:
+        return self._postings[field].get(value, set())
+
+
+@dataclass(frozen=True)
+class Term:
+    field: str
+    values: tuple[str, ...]
+
+    def evaluate(self, index: DiffIndex, memo: dict | None = None) -> set[str]:
+        if self.field in TOKEN_FIELDS:
+            # Every token of a value must appear; comma-separated values are alternatives.
+            matched: set[str] = set()
+            for value in self.values:
+                tokens = sorted(name_tokens(value), key=lambda token: len(index.lookup(self.field, token)))
+                if not tokens:
+                    continue
+                keys = set(index.lookup(self.field, tokens[0]))
+                for token in tokens[1:]:
+                    keys &= index.lookup(self.field, token)
+                matched |= keys
+            return matched
+        matched = set()
+        for value in self.values:
+            matched |= index.lookup(self.field, value)
+        return matched
+
+
+@dataclass(frozen=True)
+class Not:
+    operand: FilterNode
+
+    def evaluate(self, index: DiffIndex, memo: dict | None = None) -> set[str]:
+        return index.all_keys - evaluate_filter(self.operand, index, memo)
+
+
+@dataclass(frozen=True)
+class And:
+    operands: tuple[FilterNode, ...]
+
+    def evaluate(self, index: DiffIndex, memo: dict | None = None) -> set[str]:
+        operand_keys = []
+        for operand in self.operands:
+            keys = evaluate_filter(operand, index, memo)
+            if not keys:
+                return set()
+            operand_keys.append(keys)
+        # Intersect smallest first so each step scans as few keys as possible.
+        operand_keys.sort(key=len)
+        keys = set(operand_keys[0])
+        for other in operand_keys[1:]:
+            keys &= other
+        return keys
+
+
+@dataclass(frozen=True)
+class Or:
+    operands: tuple[FilterNode, ...]
+
+    def evaluate(self, index: DiffIndex, memo: dict | None = None) -> set[str]:
+        keys: set[str] = set()
+        for operand in self.operands:
+            keys |= evaluate_filter(operand, index, memo)
+        return keys
+
+
+FilterNode = Union[Term, Not, And, Or]
+
+
+def evaluate_filter(node: FilterNode, index: DiffIndex, memo: dict | None = None) -> set[str]:
+    """Evaluate a compiled filter; `memo` shares identical sub-expressions across filters."""
+    if memo is None:
+        return node.evaluate(index)
+    keys = memo.get(node)
+    if keys is None:
+        keys = node.evaluate(index, memo)
+        memo[node] = keys
+    return keys
+
+
+def _tokenize(text: str) -> list[str]:
+    """Split on whitespace and parentheses, honouring quoted values.
+
+    A quote only opens a quoted section at the start of a token or right after
+    `:` or `,`, so apostrophes inside words (`name:O'Brien`) stay literal.
+    """
+    tokens: list[str] = []
+    pos, end = 0, len(text)
+    while pos < end:
+        char = text[pos]
+        if char.isspace():
+            pos += 1
+            continue
+        if char in "()":
+            tokens.append(char)
+            pos += 1
+            continue
+        parts: list[str] = []
+        previous = ""
+        while pos < end and not text[pos].isspace() and text[pos] not in "()":
+            char = text[pos]
+            if char in "\"'" and previous in {"", ":", ","}:
+                close = text.find(char, pos + 1)
+                if close < 0:
+                    raise ValueError("Invalid filter expression: No closing quotation")
+                parts.append(text[pos + 1 : close])
+                pos = close + 1
+            else:
+                parts.append(char)
+                pos += 1
+            previous = text[pos - 1]
+        tokens.append("".join(parts))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: list[str]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Invalid filter expression: unexpected end of input")
+        self.pos += 1
+        return token
+
+    def parse(self) -> FilterNode:
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"Invalid filter expression: unexpected '{self.peek()}'")
+        return node
+
+    def parse_or(self) -> FilterNode:
+        operands = [self.parse_and()]
+        while (self.peek() or "").lower() == "or":
+            self.take()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def parse_and(self) -> FilterNode:
+        operands = [self.parse_not()]
+        while self.peek() is not None and self.peek() != ")" and self.peek().lower() != "or":
+            if self.peek().lower() == "and":
+                self.take()
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def parse_not(self) -> FilterNode:
+        if (self.peek() or "").lower() == "not":
+            self.take()
+            return Not(self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self) -> FilterNode:
+        token = self.take()
+        if token == "(":
+            node = self.parse_or()
+            if self.take() != ")":
+                raise ValueError("Invalid filter expression: missing ')'")
+            return node
+        return _parse_term(token)
+
+
+def _parse_term(token: str) -> Term:
+    raw_field, sep, raw_values = token.partition(":")
+    if not sep:
+        raise ValueError(f"Invalid filter term '{token}': expected field:value")
+    field = FIELD_ALIASES.get(raw_field.strip().lower())
+    if field is None:
+        raise ValueError(f"Unknown filter field '{raw_field}'. Supported: {', '.join(sorted(FIELD_ALIASES))}")
+    values = tuple(value.strip().lower() for value in raw_values.split(",") if value.strip())
+    if not values:
+        raise ValueError(f"Filter term '{token}' has no values")
+    if field == "month":
+        values = tuple(MONTH_NAMES.get(value, value) for value in values)
+    if field == "input":
+        try:
+            values = tuple(BOOLEAN_VALUES[value] for value in values)
+        except KeyError as exc:
+            raise ValueError(f"Invalid boolean value for '{raw_field}': {exc.args[0]}") from exc
+    return Term(field=field, values=values)
+
+
+def parse_filter(text: str) -> FilterNode:
+    """Compile a filter expression such as `band:amber category:duration_change name:"zone c"`.
+
+    Terms are `field:value[,value...]`; adjacent terms are AND-ed, and `and`,
+    `or`, `not` and parentheses are supported. Name values match on all tokens.
+    """
+    tokens = _tokenize(text)
+    if not tokens:
+        raise ValueError("Filter expression is empty")
+    return _Parser(tokens).parse()
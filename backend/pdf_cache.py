@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from .schemas import CompareResult
+
+DEFAULT_MAX_ENTRIES = 8
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_GROUP_CACHE_BYTES = 128 * 1024 * 1024
+PDF_SUFFIX = ".pdf"
+PARTIAL_SUFFIX = ".partial"
+# The cache directory may be shared with other running instances (the system temp
+# directory by default), so only partials older than any real render are removed.
+STALE_PARTIAL_SECONDS = 24 * 60 * 60
+
+
+def pdf_cache_key(result: CompareResult, renderer_version: str) -> str:
+    """Key a rendered evidence pack by the content it is rendered from.
+
+    The pack is a pure function of the result and the renderer, so hashing the
+    serialized result (which already reflects compare options, overrides, column
+    maps and tags) plus the app version is safe across restarts, where result
+    version numbers start again from zero.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{renderer_version}:".encode("utf-8"))
+    digest.update(result.model_dump_json().encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PdfCache:
+    """Bounded on-disk cache of rendered PDFs, evicting least recently used files.
+
+    Files are rendered to a private partial path and renamed into place, so a
+    reader never sees a half-written PDF and a cancelled render leaves nothing
+    behind.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._remove_stale_partials()
+
+    def _remove_stale_partials(self) -> None:
+        """Delete partials left behind by crashed renders, leaving in-progress ones alone."""
+        cutoff = time.time() - STALE_PARTIAL_SECONDS
+        for partial in self.directory.glob(f"*{PARTIAL_SUFFIX}"):
+            try:
+                if partial.stat().st_mtime < cutoff:
+                    partial.unlink()
+            except FileNotFoundError:
+                continue
+
+    def _path(self, key: str) -> Path:
+        if not key or not all(char in "0123456789abcdef" for char in key):
+            raise ValueError("Invalid PDF cache key")
+        return self.directory / f"{key}{PDF_SUFFIX}"
+
+    def get(self, key: str) -> Path | None:
+        path = self._path(key)
+        with self._lock:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                return None
+        return path
+
+    def reserve(self, key: str) -> Path:
+        """Return a fresh partial path to render `key` into before `commit`."""
+        self._path(key)
+        handle, name = tempfile.mkstemp(prefix=f"{key}.", suffix=PARTIAL_SUFFIX, dir=self.directory)
+        os.close(handle)
+        return Path(name)
+
+    def commit(self, key: str, partial: Path) -> Path:
+        path = self._path(key)
+        with self._lock:
+            os.replace(partial, path)
+            self._evict_locked(keep=path)
+        return path
+
+    def discard(self, partial: Path) -> None:
+        partial.unlink(missing_ok=True)
+
+    def _evict_locked(self, keep: Path) -> None:
+        entries = []
+        for path in self.directory.glob(f"*{PDF_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(key=lambda item: item[0], reverse=True)
+        total = 0
+        for position, (_mtime, size, path) in enumerate(entries):
+            total += size
+            if path != keep and (position >= self._max_entries or total > self._max_bytes):
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+class PageGroupCache:
+    """In-memory LRU of rendered evidence page groups, bounded by total size."""
+
+    def __init__(self, max_bytes: int = DEFAULT_GROUP_CACHE_BYTES) -> None:
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self._max_bytes and len(self._entries) > 1:
+                _key, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+def open_pdf_cache(data_dir: str | None) -> PdfCache:
+    """Cache under `EOT_DATA_DIR` when set, otherwise under the system temp directory."""
+    base = Path(data_dir) if data_dir else Path(tempfile.gettempdir()) / "eot-diff-tool"
+    return PdfCache(base / "pdf-cache")
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import io
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.errors import PyPdfError
+
+
+def _read(data: bytes, label: str) -> PdfReader:
+    """Parse one input strictly, surfacing malformed or encrypted PDFs as ValueError."""
+    try:
+        reader = PdfReader(io.BytesIO(data), strict=True)
+        encrypted = reader.is_encrypted
+        # Walk the page tree now so a broken one fails here rather than mid-merge.
+        len(reader.pages)
+    except PyPdfError as exc:
+        raise ValueError(f"Cannot read PDF {label}: {exc}") from exc
+    if encrypted:
+        raise ValueError(f"Encrypted PDFs cannot be merged ({label})")
+    return reader
+
+
+def merge_pdfs(parts: list[bytes], overlay: bytes | None = None) -> bytes:
+    """Concatenate the pages of several PDFs into one document, in order.
+
+    The first part's document info is kept. With `overlay` (a PDF with one page
+    per merged page), each overlay page is drawn on top of its merged page.
+    """
+    writer = PdfWriter()
+    for index, part in enumerate(parts):
+        reader = _read(part, f"part {index + 1}")
+        if index == 0 and reader.metadata:
+            writer.add_metadata(dict(reader.metadata))
+        for page in reader.pages:
+            writer.add_page(page)
+
+    if overlay is not None:
+        stamps = _read(overlay, "overlay").pages
+        if len(stamps) != len(writer.pages):
+            raise ValueError(f"Overlay has {len(stamps)} page(s) for {len(writer.pages)} merged page(s)")
+        for page, stamp in zip(writer.pages, stamps):
+            page.merge_page(stamp)
+            page.compress_content_streams()
+
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
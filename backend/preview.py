@@ -8,8 +8,11 @@ from typing import Literal
 
 from .comparison import compare_tasks
 from .matching import auto_match, confidence_band
+from .result_delta import diff_result_rows
 from .schemas import (
     CompareResult,
+    CompareResultDelta,
+    InputFileRecord,
     MatchOverride,
     PreviewInitResponse,
     PreviewMatchEdit,
@@ -34,6 +37,10 @@ class PreviewSession:
     right_tasks: list[TaskRecord]
     import_warnings: list[str] = field(default_factory=list)
     manual_overrides: dict[int, int] = field(default_factory=dict)
+    comparison_id: str = ""
+    input_files: list[InputFileRecord] = field(default_factory=list)
+    last_result: CompareResult | None = field(default=None, repr=False)
+    result_version: int = 0
     created_at: float = field(default_factory=time.time)
     updated_at: float = field(default_factory=time.time)
     _left_leaf: list[TaskRecord] = field(init=False, repr=False)
@@ -92,6 +99,8 @@ def create_preview_session(
     left_tasks: list[TaskRecord],
     right_tasks: list[TaskRecord],
     import_warnings: list[str] | None = None,
+    comparison_id: str = "",
+    input_files: list[InputFileRecord] | None = None,
 ) -> PreviewSession:
     cleanup_preview_sessions()
     session_id = uuid.uuid4().hex[:16]
@@ -102,6 +111,8 @@ def create_preview_session(
         left_tasks=left_tasks,
         right_tasks=right_tasks,
         import_warnings=list(import_warnings or []),
+        comparison_id=comparison_id,
+        input_files=list(input_files or []),
     )
     PREVIEW_SESSIONS[session_id] = session
     return session
@@ -409,6 +420,7 @@ def analyze_preview_session(
     session: PreviewSession,
     *,
     assignment_map: dict[str, dict] | None = None,
+    max_workers: int = 1,
 ) -> CompareResult:
     result = compare_tasks(
         left_tasks=session.left_tasks,
@@ -416,6 +428,39 @@ def analyze_preview_session(
         include_baseline=session.include_baseline,
         overrides=_manual_override_models(session),
         assignment_map=assignment_map,
+        max_workers=max_workers,
     )
+    session.last_result = result
+    session.result_version += 1
     session.touch()
     return result
+
+
+def build_preview_result_delta(
+    session: PreviewSession,
+    previous: CompareResult | None,
+    previous_version: int,
+) -> CompareResultDelta:
+    """Describe `session.last_result` as row changes relative to `previous`.
+
+    Passing `previous=None` yields a delta from an empty result (every row added),
+    which clients use to resynchronize after a version mismatch.
+    """
+    current = session.last_result
+    if current is None:
+        raise ValueError("Preview session has not been analyzed yet")
+
+    base_version = previous_version if previous is not None else 0
+    added, changed, removed = diff_result_rows(previous, current)
+    return CompareResultDelta(
+        session_id=session.session_id,
+        version=session.result_version,
+        base_version=base_version,
+        added=added,
+        changed=changed,
+        removed_row_keys=removed,
+        candidates=current.candidates if previous is None or previous.candidates != current.candidates else None,
+        summary=current.summary,
+        fault_allocation=current.fault_allocation,
+        import_warnings=list(current.import_warnings),
+    )
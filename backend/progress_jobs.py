@@ -7,7 +7,12 @@ import uuid
 from dataclasses import dataclass, field
 from typing import Any, Literal
 
-JobStatus = Literal["queued", "running", "completed", "failed"]
+JobStatus = Literal["queued", "running", "completed", "failed", "cancelled"]
+FINISHED_STATUSES = {"completed", "failed", "cancelled"}
+
+
+class JobCancelled(Exception):
+    """Raised inside a job runner once its job has been cancelled."""
 
 
 @dataclass
@@ -49,7 +54,7 @@ class ProgressJobStore:
     ) -> None:
         with self._lock:
             job = self._jobs.get(job_id)
-            if job is None:
+            if job is None or job.status == "cancelled":
                 return
             if status is not None:
                 job.status = status
@@ -64,7 +69,7 @@ class ProgressJobStore:
     def complete_job(self, job_id: str, result: dict[str, Any]) -> None:
         with self._lock:
             job = self._jobs.get(job_id)
-            if job is None:
+            if job is None or job.status == "cancelled":
                 return
             job.status = "completed"
             job.progress_pct = 100.0
@@ -77,7 +82,7 @@ class ProgressJobStore:
     def fail_job(self, job_id: str, error: str) -> None:
         with self._lock:
             job = self._jobs.get(job_id)
-            if job is None:
+            if job is None or job.status == "cancelled":
                 return
             job.status = "failed"
             job.stage = "Failed"
@@ -85,6 +90,23 @@ class ProgressJobStore:
             job.error = error
             job.updated_at = time.time()
 
+    def cancel_job(self, job_id: str) -> bool:
+        """Mark an unfinished job cancelled; its runner stops at the next progress update."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATUSES:
+                return False
+            job.status = "cancelled"
+            job.stage = "Cancelled"
+            job.detail = ""
+            job.updated_at = time.time()
+            return True
+
+    def is_cancelled(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job is not None and job.status == "cancelled"
+
     def get_job(self, job_id: str) -> dict[str, Any] | None:
         with self._lock:
             self._cleanup_locked()
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import io
+import itertools
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 
-from .schemas import CompareResult, FaultMetric
+from .pdf_cache import PageGroupCache
+from .pdf_merge import merge_pdfs
+from .schemas import CompareResult, FaultMetric, TaskDiff, WindowsReport
 
 SCL_NOTE = "Assessment support aligned to SCL Delay and Disruption Protocol concepts; not legal advice."
 
@@ -25,9 +32,20 @@ def _metric_rows(label: str, metric: FaultMetric) -> list[list[str | float]]:
     ]
 
 
-def build_csv(result: CompareResult) -> bytes:
+CSV_CHUNK_ROWS = 1000
+
+
+def iter_csv_chunks(result: CompareResult, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[bytes]:
+    """Yield the evidence-pack CSV as UTF-8 chunks of roughly `chunk_rows` rows each."""
     buffer = io.StringIO()
     writer = csv.writer(buffer)
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
     writer.writerow(
         [
             "status",
@@ -52,7 +70,7 @@ def build_csv(result: CompareResult) -> bytes:
         ]
     )
 
-    for diff in result.diffs:
+    for index, diff in enumerate(result.diffs, start=1):
         changed_fields = ", ".join(
             f"{change.field}: {change.left_value} -> {change.right_value}" for change in diff.evidence
         )
@@ -79,6 +97,8 @@ def build_csv(result: CompareResult) -> bytes:
                 changed_fields,
             ]
         )
+        if index % chunk_rows == 0:
+            yield drain()
 
     writer.writerow([])
     writer.writerow(["Fault Allocation Summary"])
@@ -91,6 +111,77 @@ def build_csv(result: CompareResult) -> bytes:
 
     writer.writerow([])
     writer.writerow(["SCL Reference", SCL_NOTE])
+    yield drain()
+
+
+def build_csv(result: CompareResult) -> bytes:
+    return b"".join(iter_csv_chunks(result))
+
+
+def build_windows_csv(report: WindowsReport) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(
+        [
+            "window",
+            "from_label",
+            "to_label",
+            "from_data_date",
+            "to_data_date",
+            "period_days",
+            "from_finish",
+            "to_finish",
+            "finish_movement_days",
+            "cumulative_movement_days",
+            "changed_tasks",
+            "added_tasks",
+            "removed_tasks",
+            "action_required_tasks",
+            "project_client_days",
+            "project_contractor_days",
+            "project_neutral_days",
+            "project_unassigned_days",
+            "project_excluded_low_confidence_days",
+        ]
+    )
+
+    for window in report.windows:
+        project = window.fault_allocation.project_finish_impact_days
+        writer.writerow(
+            [
+                window.index,
+                window.from_label,
+                window.to_label,
+                window.from_data_date.isoformat() if window.from_data_date else "",
+                window.to_data_date.isoformat() if window.to_data_date else "",
+                "" if window.period_days is None else window.period_days,
+                window.from_finish.isoformat() if window.from_finish else "",
+                window.to_finish.isoformat() if window.to_finish else "",
+                window.finish_movement_days,
+                window.cumulative_movement_days,
+                window.summary.changed_tasks,
+                window.summary.added_tasks,
+                window.summary.removed_tasks,
+                window.summary.action_required_tasks,
+                project.client_days,
+                project.contractor_days,
+                project.neutral_days,
+                project.unassigned_days,
+                project.excluded_low_confidence_days,
+            ]
+        )
+
+    writer.writerow([])
+    writer.writerow(["Combined Fault Allocation"])
+    writer.writerow(["metric", "field", "value"])
+    for row in _metric_rows("project_finish_impact_days", report.fault_allocation.project_finish_impact_days):
+        writer.writerow(row)
+    for row in _metric_rows("task_slippage_days", report.fault_allocation.task_slippage_days):
+        writer.writerow(row)
+
+    writer.writerow([])
+    writer.writerow(["Total finish movement days", report.total_finish_movement_days])
+    writer.writerow(["SCL Reference", SCL_NOTE])
 
     return buffer.getvalue().encode("utf-8")
 
@@ -112,10 +203,98 @@ def _draw_fault_metric(c: canvas.Canvas, y: float, title: str, metric: FaultMetr
     return y - 16
 
 
-def build_pdf(result: CompareResult, output_path: Path) -> Path:
-    c = canvas.Canvas(str(output_path), pagesize=A4)
+PageCallback = Callable[[int, float], None]
+
+EVIDENCE_TITLE = "Task-Level Evidence"
+PAGE_TOP_MARGIN = 40
+PAGE_BREAK_Y = 90
+PAGE_FOOTER_Y = 30
+# Rows per page group. Each group starts on a fresh page, so an edit re-renders only its own group.
+PDF_GROUP_ROWS = 200
+
+# ("page", row_index, rows_done) opens a page; ("text", font, size, x, y, text) draws a line.
+LayoutItem = tuple
+
+
+def _evidence_layout(diffs: Sequence[TaskDiff], height: float) -> Iterator[LayoutItem]:
+    """Lay out the task-level evidence section as page breaks and text lines.
+
+    A page item's `row_index` is the row that opens the page, or None when the
+    previous row's field changes run over. Rendering any row-opened page onwards
+    lays out exactly as it does within the whole section, which is what lets
+    chunks be rendered independently.
+    """
+
+    def new_page(row_index: int | None, rows_done: int) -> Iterator[LayoutItem]:
+        yield ("page", row_index, rows_done)
+        yield ("text", "Helvetica-Bold", 12, 40, height - PAGE_TOP_MARGIN, EVIDENCE_TITLE)
+
+    y = height - PAGE_TOP_MARGIN - 20
+    for row_index, diff in enumerate(diffs):
+        if row_index == 0 or y < PAGE_BREAK_Y:
+            yield from new_page(row_index, row_index)
+            y = height - PAGE_TOP_MARGIN - 20
+
+        name = diff.left_name or diff.right_name or "Unknown"
+        yield (
+            "text",
+            "Helvetica-Bold",
+            9,
+            40,
+            y,
+            (
+                f"[{diff.status.upper()}] {name} | Category: {diff.change_category} | "
+                f"Action required: {diff.requires_user_input} | Attr: {diff.attribution_status}"
+            )[:150],
+        )
+        y -= 12
+
+        yield (
+            "text",
+            "Helvetica",
+            8,
+            55,
+            y,
+            (
+                f"Cause: {diff.cause_tag} | Reason code: {diff.reason_code or '-'} | "
+                f"Slippage days: {diff.task_slippage_days}"
+            )[:130],
+        )
+        y -= 11
+
+        if diff.auto_reason:
+            yield ("text", "Helvetica", 8, 55, y, f"Auto reason: {diff.auto_reason}"[:130])
+            y -= 11
+
+        if not diff.evidence:
+            yield ("text", "Helvetica", 8, 55, y, "No field-level differences.")
+            y -= 12
+            continue
+
+        for change_index, change in enumerate(diff.evidence):
+            if change_index and y < PAGE_BREAK_Y:
+                yield from new_page(None, row_index)
+                y = height - PAGE_TOP_MARGIN - 20
+            line = f"- {change.field}: {change.left_value} -> {change.right_value}"
+            yield ("text", "Helvetica", 8, 55, y, line[:130])
+            y -= 11
+
+
+def _render_footers(total_pages: int) -> bytes:
+    """One footer-only page per page of the pack, stamped over the merged pages."""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    for page_number in range(1, total_pages + 1):
+        c.setFont("Helvetica", 8)
+        c.drawRightString(A4[0] - 40, PAGE_FOOTER_Y, f"Page {page_number} of {total_pages}")
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def _draw_summary_page(c: canvas.Canvas, result: CompareResult) -> None:
     _, height = A4
-    y = height - 40
+    y = height - PAGE_TOP_MARGIN
 
     c.setFont("Helvetica-Bold", 14)
     c.drawString(40, y, "Programme Difference Evidence Pack")
@@ -149,61 +328,150 @@ def build_pdf(result: CompareResult, output_path: Path) -> Path:
 
     c.setFont("Helvetica-Oblique", 8)
     c.drawString(40, max(y, 60), SCL_NOTE)
-
     c.showPage()
-    y = height - 40
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(40, y, "Task-Level Evidence")
-    y -= 20
-
-    for diff in result.diffs:
-        if y < 90:
-            c.showPage()
-            y = height - 40
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(40, y, "Task-Level Evidence")
-            y -= 20
 
-        name = diff.left_name or diff.right_name or "Unknown"
-        c.setFont("Helvetica-Bold", 9)
-        c.drawString(
-            40,
-            y,
-            (
-                f"[{diff.status.upper()}] {name} | Category: {diff.change_category} | "
-                f"Action required: {diff.requires_user_input} | Attr: {diff.attribution_status}"
-            )[:150],
-        )
-        y -= 12
 
-        c.setFont("Helvetica", 8)
-        c.drawString(
-            55,
-            y,
-            (
-                f"Cause: {diff.cause_tag} | Reason code: {diff.reason_code or '-'} | "
-                f"Slippage days: {diff.task_slippage_days}"
-            )[:130],
+def _draw_evidence(
+    c: canvas.Canvas,
+    items: Sequence[LayoutItem],
+    on_page: Callable[[int], None] | None = None,
+) -> None:
+    """Draw laid-out evidence items; page footers are stamped later, after merging.
+
+    `on_page(rows_done)` runs after each finished page but the last, with rows
+    counted from the start of `items`.
+    """
+    started = False
+    font: tuple[str, int] | None = None
+    for item in items:
+        if item[0] == "page":
+            if started:
+                c.showPage()
+                if on_page is not None:
+                    on_page(item[2])
+            started = True
+            font = None
+            continue
+        _kind, font_name, size, x, y, text = item
+        if font != (font_name, size):
+            c.setFont(font_name, size)
+            font = (font_name, size)
+        c.drawString(x, y, text)
+    if started:
+        c.showPage()
+
+
+def _render_group(items: Sequence[LayoutItem], on_page: Callable[[int], None] | None = None) -> bytes:
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    _draw_evidence(c, items, on_page)
+    c.save()
+    return buffer.getvalue()
+
+
+@dataclass
+class _PageGroup:
+    """One run of evidence rows that always starts on a fresh page."""
+
+    row_count: int
+    items: list[LayoutItem]
+    page_count: int
+    cache_key: str
+
+
+def _page_groups(diffs: Sequence[TaskDiff]) -> list[_PageGroup]:
+    groups = []
+    for start in range(0, len(diffs), PDF_GROUP_ROWS):
+        items = list(_evidence_layout(diffs[start : start + PDF_GROUP_ROWS], A4[1]))
+        digest = hashlib.sha256()
+        for item in items:
+            digest.update(repr(item).encode("utf-8"))
+        groups.append(
+            _PageGroup(
+                row_count=min(PDF_GROUP_ROWS, len(diffs) - start),
+                items=items,
+                page_count=sum(1 for item in items if item[0] == "page"),
+                cache_key=digest.hexdigest(),
+            )
         )
-        y -= 11
+    return groups
 
-        if diff.auto_reason:
-            c.drawString(55, y, f"Auto reason: {diff.auto_reason}"[:130])
-            y -= 11
 
-        if not diff.evidence:
-            c.drawString(55, y, "No field-level differences.")
-            y -= 12
-            continue
+def build_pdf(
+    result: CompareResult,
+    output_path: Path,
+    on_page: PageCallback | None = None,
+    workers: int = 1,
+    page_cache: PageGroupCache | None = None,
+) -> Path:
+    """Render the evidence pack to `output_path`.
 
-        for change in diff.evidence:
-            line = f"- {change.field}: {change.left_value} -> {change.right_value}"
-            c.drawString(55, y, line[:130])
-            y -= 11
-            if y < 90:
-                c.showPage()
-                y = height - 40
-                c.setFont("Helvetica", 8)
+    Evidence is laid out in groups of `PDF_GROUP_ROWS` rows. Each rendered group is
+    cached in `page_cache` under a hash of its laid-out rows only, so a re-export
+    after a few edits re-renders only the groups that changed (plus the summary
+    page), even when an edit shifts the page numbers of later groups. The
+    "Page n of N" footers are rendered separately and stamped over the merged
+    pages. With `workers > 1`, uncached groups render in a process pool.
 
+    `on_page(pages_done, fraction_of_rows_done)` runs after every finished page
+    (after every finished group when rendering in a pool); an exception raised
+    from it aborts rendering.
+    """
+    groups = _page_groups(result.diffs)
+    total_pages = 1 + sum(group.page_count for group in groups)
+    row_count = max(1, len(result.diffs))
+
+    summary_buffer = io.BytesIO()
+    c = canvas.Canvas(summary_buffer, pagesize=A4)
+    _draw_summary_page(c, result)
     c.save()
+    parts: list[bytes | None] = [summary_buffer.getvalue()]
+    pages_done, rows_done = 1, 0
+    if on_page is not None:
+        on_page(pages_done, 0.0)
+
+    def group_finished(group: _PageGroup, rendered: bytes | None = None) -> None:
+        nonlocal pages_done, rows_done
+        if rendered is not None and page_cache is not None:
+            page_cache.put(group.cache_key, rendered)
+        pages_done += group.page_count
+        rows_done += group.row_count
+        if on_page is not None:
+            on_page(pages_done, rows_done / row_count)
+
+    pending: list[tuple[int, _PageGroup]] = []
+    for group in groups:
+        cached = page_cache.get(group.cache_key) if page_cache is not None else None
+        parts.append(cached)
+        if cached is None:
+            pending.append((len(parts) - 1, group))
+        else:
+            group_finished(group)
+
+    if workers > 1 and len(pending) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(pending)))
+        try:
+            futures = {
+                executor.submit(_render_group, group.items): (position, group)
+                for position, group in pending
+            }
+            for future in as_completed(futures):
+                position, group = futures[future]
+                parts[position] = future.result()
+                group_finished(group, parts[position])
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    else:
+        for position, group in pending:
+            pages_before, rows_before = pages_done, rows_done
+            pages_in_group = itertools.count(1)
+
+            def page_finished(group_rows_done: int) -> None:
+                if on_page is not None:
+                    on_page(pages_before + next(pages_in_group), (rows_before + group_rows_done) / row_count)
+
+            parts[position] = _render_group(group.items, page_finished)
+            group_finished(group, parts[position])
+
+    output_path.write_bytes(merge_pdfs(parts, overlay=_render_footers(total_pages)))
     return output_path
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from .schemas import CompareResult, TaskDiff
+
+
+def diff_result_rows(
+    previous: CompareResult | None,
+    current: CompareResult,
+) -> tuple[list[TaskDiff], list[TaskDiff], list[str]]:
+    """Return `(added, changed, removed_row_keys)` between two results keyed by `row_key`."""
+    previous_by_key = {diff.row_key: diff for diff in previous.diffs} if previous is not None else {}
+
+    added: list[TaskDiff] = []
+    changed: list[TaskDiff] = []
+    seen: set[str] = set()
+    for diff in current.diffs:
+        seen.add(diff.row_key)
+        before = previous_by_key.get(diff.row_key)
+        if before is None:
+            added.append(diff)
+        elif before != diff:
+            changed.append(diff)
+
+    removed = [row_key for row_key in previous_by_key if row_key not in seen]
+    return added, changed, removed
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from .schemas import TaskDiff
+
+STORE_TTL_SECONDS = 60 * 60
+MAX_STORES = 8
+WRITE_BATCH_SIZE = 500
+
+
+class ResultStore:
+    """On-disk SQLite store for streamed compare results.
+
+    Diffs are appended in generation order and buffered into batched inserts; reads
+    page rows back in the same order `compare_tasks` sorts its in-memory diffs.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.result_id = uuid.uuid4().hex[:16]
+        if path is None:
+            handle = tempfile.NamedTemporaryFile(prefix="eot-result-", suffix=".sqlite3", delete=False)
+            handle.close()
+            path = Path(handle.name)
+        self.path = path
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self._lock = threading.Lock()
+        self._pending: list[tuple[int, str, str, str, str]] = []
+        self._seq = 0
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS diffs ("
+            "seq INTEGER PRIMARY KEY, sort_status TEXT NOT NULL, sort_name TEXT NOT NULL, "
+            "row_key TEXT NOT NULL, payload TEXT NOT NULL)"
+        )
+
+    def append_diff(self, diff: TaskDiff, *, sort_key: tuple[str, str]) -> None:
+        with self._lock:
+            self._pending.append((self._seq, sort_key[0], sort_key[1], diff.row_key, diff.model_dump_json()))
+            self._seq += 1
+            if len(self._pending) >= WRITE_BATCH_SIZE:
+                self._flush_locked()
+
+    def finalize(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.execute("CREATE INDEX IF NOT EXISTS diffs_order ON diffs (sort_status, sort_name, seq)")
+            self._conn.commit()
+
+    def count_diffs(self) -> int:
+        with self._lock:
+            self._flush_locked()
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM diffs").fetchone()
+            return int(count)
+
+    def page_diffs(self, offset: int, limit: int) -> list[TaskDiff]:
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(
+                "SELECT payload FROM diffs ORDER BY sort_status, sort_name, seq LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+            self.updated_at = time.time()
+        return [TaskDiff.model_validate_json(payload) for (payload,) in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._conn.close()
+        self.path.unlink(missing_ok=True)
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        self._conn.executemany(
+            "INSERT INTO diffs (seq, sort_status, sort_name, row_key, payload) VALUES (?, ?, ?, ?, ?)",
+            self._pending,
+        )
+        self._conn.commit()
+        self._pending.clear()
+
+
+RESULT_STORES: dict[str, ResultStore] = {}
+_RESULT_STORES_LOCK = threading.Lock()
+
+
+def cleanup_result_stores(now: float | None = None) -> None:
+    now = now or time.time()
+    with _RESULT_STORES_LOCK:
+        expired = [
+            result_id
+            for result_id, store in RESULT_STORES.items()
+            if now - store.updated_at > STORE_TTL_SECONDS
+        ]
+        removed = [RESULT_STORES.pop(result_id) for result_id in expired]
+
+        while len(RESULT_STORES) > MAX_STORES:
+            oldest = min(RESULT_STORES.values(), key=lambda item: item.updated_at)
+            removed.append(RESULT_STORES.pop(oldest.result_id))
+
+    for store in removed:
+        store.close()
+
+
+def create_result_store() -> ResultStore:
+    store = ResultStore()
+    with _RESULT_STORES_LOCK:
+        RESULT_STORES[store.result_id] = store
+    cleanup_result_stores()
+    return store
+
+
+def get_result_store(result_id: str) -> ResultStore:
+    cleanup_result_stores()
+    with _RESULT_STORES_LOCK:
+        store = RESULT_STORES.get(result_id)
+    if store is None:
+        raise KeyError("Result store not found or expired")
+    return store
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .attribution import allocation_bucket
+from .matching import normalize_task_name
+from .schemas import RollupNode, TaskDiff, TaskRecord
+
+ROOT_NODE_ID = 0
+
+
+def summary_parents(tasks: list[TaskRecord]) -> dict[int, TaskRecord | None]:
+    """Map each task UID to its parent summary task.
+
+    Outline levels (in file order) are authoritative when present; otherwise dotted
+    WBS codes are used. Tasks with neither sit at the top level.
+    """
+    parents: dict[int, TaskRecord | None] = {}
+    if any(task.outline_level is not None for task in tasks):
+        stack: list[tuple[int, TaskRecord]] = []
+        for task in tasks:
+            level = task.outline_level if task.outline_level is not None else (stack[-1][0] + 1 if stack else 1)
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            parents[task.uid] = stack[-1][1] if stack else None
+            if task.is_summary:
+                stack.append((level, task))
+        return parents
+
+    summaries_by_wbs = {task.wbs: task for task in tasks if task.is_summary and task.wbs}
+    for task in tasks:
+        parent = None
+        wbs = task.wbs or ""
+        while "." in wbs and parent is None:
+            wbs = wbs.rsplit(".", 1)[0]
+            parent = summaries_by_wbs.get(wbs)
+        parents[task.uid] = parent
+    return parents
+
+
+def summary_paths(tasks: list[TaskRecord]) -> dict[int, tuple[str, ...]]:
+    """Map each task UID to the chain of summary names above it, root first."""
+    parents = summary_parents(tasks)
+    paths: dict[int, tuple[str, ...]] = {}
+
+    def path_for(uid: int) -> tuple[str, ...]:
+        cached = paths.get(uid)
+        if cached is not None:
+            return cached
+        chain: list[TaskRecord] = []
+        parent = parents.get(uid)
+        seen: set[int] = set()
+        while parent is not None and parent.uid not in seen:
+            seen.add(parent.uid)
+            chain.append(parent)
+            parent = parents.get(parent.uid)
+        path = tuple(task.name for task in reversed(chain))
+        paths[uid] = path
+        return path
+
+    for task in tasks:
+        path_for(task.uid)
+    return paths
+
+
+@dataclass
+class _Node:
+    node_id: int
+    name: str
+    path: tuple[str, ...]
+    children: list[int] = field(default_factory=list)
+    row_keys: list[str] = field(default_factory=list)
+    row_count: int = 0
+    action_required: int = 0
+    slippage_days: float = 0.0
+    category_counts: Counter[str] = field(default_factory=Counter)
+    cause_days: Counter[str] = field(default_factory=Counter)
+
+    def add_diff(self, diff: TaskDiff) -> None:
+        self.row_keys.append(diff.row_key)
+        self.row_count += 1
+        self.category_counts[diff.change_category] += 1
+        self.slippage_days += diff.task_slippage_days
+        if diff.requires_user_input:
+            self.action_required += 1
+        bucket = allocation_bucket(diff)
+        if bucket is not None:
+            self.cause_days[bucket] += diff.task_slippage_days
+
+    def absorb(self, child: _Node) -> None:
+        self.row_count += child.row_count
+        self.action_required += child.action_required
+        self.slippage_days += child.slippage_days
+        self.category_counts.update(child.category_counts)
+        self.cause_days.update(child.cause_days)
+
+
+class RollupTree:
+    """Summary-level aggregation of leaf diffs over the outline/WBS hierarchy.
+
+    Right-side summaries place matched and added rows; removed rows use the
+    left-side hierarchy. Summaries are merged across sides by normalized name path.
+    """
+
+    def __init__(
+        self,
+        diffs: list[TaskDiff],
+        left_tasks: list[TaskRecord],
+        right_tasks: list[TaskRecord],
+    ) -> None:
+        self._nodes: list[_Node] = [_Node(node_id=ROOT_NODE_ID, name="All tasks", path=())]
+        self._by_path: dict[tuple[str, ...], int] = {(): ROOT_NODE_ID}
+
+        left_paths = summary_paths(left_tasks)
+        right_paths = summary_paths(right_tasks)
+        for diff in diffs:
+            if diff.right_uid is not None:
+                path = right_paths.get(diff.right_uid, ())
+            else:
+                path = left_paths.get(diff.left_uid, ()) if diff.left_uid is not None else ()
+            self._nodes[self._node_for(path)].add_diff(diff)
+
+        self._aggregate()
+
+    def _node_for(self, path: tuple[str, ...]) -> int:
+        key = tuple(normalize_task_name(name) for name in path)
+        node_id = self._by_path.get(key)
+        if node_id is not None:
+            return node_id
+        parent_id = self._node_for(path[:-1])
+        node_id = len(self._nodes)
+        self._nodes.append(_Node(node_id=node_id, name=path[-1], path=path))
+        self._nodes[parent_id].children.append(node_id)
+        self._by_path[key] = node_id
+        return node_id
+
+    def _aggregate(self) -> None:
+        # Single iterative post-order pass: children are folded into parents once.
+        stack: list[tuple[int, bool]] = [(ROOT_NODE_ID, False)]
+        while stack:
+            node_id, expanded = stack.pop()
+            node = self._nodes[node_id]
+            if expanded:
+                for child_id in node.children:
+                    node.absorb(self._nodes[child_id])
+                continue
+            stack.append((node_id, True))
+            stack.extend((child_id, False) for child_id in node.children)
+
+    def node(self, node_id: int) -> RollupNode:
+        if node_id < 0 or node_id >= len(self._nodes):
+            raise KeyError(f"Unknown rollup node: {node_id}")
+        return self._to_model(self._nodes[node_id])
+
+    def children(self, node_id: int) -> list[RollupNode]:
+        if node_id < 0 or node_id >= len(self._nodes):
+            raise KeyError(f"Unknown rollup node: {node_id}")
+        return [self._to_model(self._nodes[child_id]) for child_id in self._nodes[node_id].children]
+
+    def row_keys(self, node_id: int) -> list[str]:
+        if node_id < 0 or node_id >= len(self._nodes):
+            raise KeyError(f"Unknown rollup node: {node_id}")
+        return list(self._nodes[node_id].row_keys)
+
+    def _to_model(self, node: _Node) -> RollupNode:
+        return RollupNode(
+            node_id=node.node_id,
+            name=node.name,
+            path=list(node.path),
+            child_count=len(node.children),
+            direct_row_count=len(node.row_keys),
+            row_count=node.row_count,
+            action_required_tasks=node.action_required,
+            slippage_days=round(node.slippage_days, 3),
+            category_counts=dict(sorted(node.category_counts.items())),
+            cause_days={bucket: round(days, 3) for bucket, days in sorted(node.cause_days.items())},
+        )
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+
+from .assignment_store import is_default_assignment
+from .attribution import ATTRIBUTION_SCOPE, AttributionAggregates
+from .diff_query import DiffIndex, FilterNode, evaluate_filter, name_tokens, parse_filter
+from .rollup import summary_paths
+from .schemas import AttributionAssignment, AttributionRule, AttributionRulesReport, TaskDiff, TaskRecord
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    rule: AttributionRule
+    node: FilterNode
+
+
+def compile_rules(rules: list[AttributionRule]) -> list[CompiledRule]:
+    """Parse every rule condition once; rule order is the precedence order."""
+    compiled: list[CompiledRule] = []
+    seen: set[str] = set()
+    for rule in rules:
+        if rule.rule_id in seen:
+            raise ValueError(f"Duplicate rule id: {rule.rule_id}")
+        seen.add(rule.rule_id)
+        if rule.cause_tag is None and rule.reason_code is None:
+            raise ValueError(f"Rule {rule.rule_id} must set a cause_tag or reason_code")
+        try:
+            node = parse_filter(rule.when)
+        except ValueError as exc:
+            raise ValueError(f"Rule {rule.rule_id}: {exc}") from exc
+        compiled.append(CompiledRule(rule=rule, node=node))
+    return compiled
+
+
+def _wbs_prefixes(wbs: str | None) -> set[str]:
+    if not wbs:
+        return set()
+    parts = wbs.strip().split(".")
+    return {".".join(parts[: index + 1]).lower() for index in range(len(parts))}
+
+
+def index_hierarchy(
+    index: DiffIndex,
+    diffs: list[TaskDiff],
+    left_tasks: list[TaskRecord],
+    right_tasks: list[TaskRecord],
+) -> None:
+    """Add `wbs` (every dotted prefix) and `summary` (parent summary name tokens) to the index.
+
+    Rows with a right-side task use the right programme's hierarchy; removed rows
+    fall back to the left programme.
+    """
+    sides = {
+        "left": ({task.uid: task for task in left_tasks}, summary_paths(left_tasks)),
+        "right": ({task.uid: task for task in right_tasks}, summary_paths(right_tasks)),
+    }
+    wbs_values: dict[str, set[str]] = {}
+    summary_values: dict[str, set[str]] = {}
+    for diff in diffs:
+        side, uid = ("right", diff.right_uid) if diff.right_uid is not None else ("left", diff.left_uid)
+        if uid is None:
+            continue
+        tasks_by_uid, paths = sides[side]
+        task = tasks_by_uid.get(uid)
+        wbs_values[diff.row_key] = _wbs_prefixes(task.wbs if task else None)
+        tokens: set[str] = set()
+        for name in paths.get(uid, ()):
+            tokens |= name_tokens(name)
+        summary_values[diff.row_key] = tokens
+    index.add_static("wbs", wbs_values)
+    index.add_static("summary", summary_values)
+
+
+def plan_rule_assignments(
+    compiled: list[CompiledRule],
+    aggregates: AttributionAggregates,
+    assignment_map: dict[str, dict],
+) -> tuple[list[AttributionAssignment], dict[str, list[str]], AttributionRulesReport]:
+    """Evaluate rules through the diff index and derive assignments for rule-owned rows.
+
+    A row is rule-owned when it has no user assignment or its current tag came
+    from rules (the ``rule_hits`` kept on its stored entry). The first matching
+    rule that sets a cause wins the cause, and the first that sets a reason wins
+    the reason; every matching rule id is recorded.
+    """
+    memo: dict = {}
+    hits_by_key: dict[str, list[str]] = defaultdict(list)
+    report = AttributionRulesReport()
+    for compiled_rule in compiled:
+        keys = evaluate_filter(compiled_rule.node, aggregates.index, memo)
+        report.rule_counts[compiled_rule.rule.rule_id] = len(keys)
+        for key in keys:
+            hits_by_key[key].append(compiled_rule.rule.rule_id)
+
+    rules_by_id = {compiled_rule.rule.rule_id: compiled_rule.rule for compiled_rule in compiled}
+    candidates = set(hits_by_key)
+    candidates.update(diff.row_key for diff in aggregates.result.diffs if diff.rule_hits)
+
+    assignments: list[AttributionAssignment] = []
+    rule_hits: dict[str, list[str]] = {}
+    for key in candidates:
+        diff = aggregates.diff_by_key[key]
+        existing = assignment_map.get(key, {})
+        if diff.status not in ATTRIBUTION_SCOPE or not (diff.rule_hits or is_default_assignment(existing)):
+            continue
+        hits = hits_by_key.get(key, [])
+        if hits:
+            report.rows_matched += 1
+        matched_rules = [rules_by_id[rule_id] for rule_id in hits]
+        cause_rule = next((rule for rule in matched_rules if rule.cause_tag is not None), None)
+        reason_rule = next((rule for rule in matched_rules if rule.reason_code is not None), None)
+        entry = {
+            "cause_tag": cause_rule.cause_tag if cause_rule else "unassigned",
+            "reason_code": reason_rule.reason_code if reason_rule else "",
+            "confirm_low_confidence": cause_rule.confirm_low_confidence if cause_rule else False,
+            "override_auto": bool(existing.get("override_auto", diff.auto_overridden)),
+        }
+        stored = {**entry, "rule_hits": hits} if hits else entry
+        if hits == diff.rule_hits and stored == existing:
+            continue
+        assignments.append(AttributionAssignment(row_key=key, **entry))
+        rule_hits[key] = hits
+    report.rows_updated = len(assignments)
+    return assignments, rule_hits, report
@@ -100,6 +100,7 @@ class TaskDiff(BaseModel):
     auto_reason: str | None = None
     flow_on_from_right_uids: list[int] = Field(default_factory=list)
     auto_overridden: bool = False
+    rule_hits: list[str] = Field(default_factory=list)
 
 
 class CompareSummary(BaseModel):
@@ -142,6 +143,65 @@ class CompareResult(BaseModel):
     import_warnings: list[str] = Field(default_factory=list)
 
 
+class StreamedCompareResult(BaseModel):
+    result_id: str
+    summary: CompareSummary
+    fault_allocation: FaultAllocation = Field(default_factory=FaultAllocation)
+    import_warnings: list[str] = Field(default_factory=list)
+    total_rows: int = 0
+
+
+class ResultDiffPage(BaseModel):
+    result_id: str
+    offset: int = 0
+    limit: int = 200
+    total_rows: int = 0
+    has_more: bool = False
+    diffs: list[TaskDiff] = Field(default_factory=list)
+
+
+class WindowResult(BaseModel):
+    index: int
+    from_label: str
+    to_label: str
+    from_data_date: date | None = None
+    to_data_date: date | None = None
+    period_days: int | None = None
+    from_finish: date | None = None
+    to_finish: date | None = None
+    finish_movement_days: float = 0.0
+    cumulative_movement_days: float = 0.0
+    summary: CompareSummary
+    fault_allocation: FaultAllocation = Field(default_factory=FaultAllocation)
+
+
+class WindowsReport(BaseModel):
+    windows: list[WindowResult] = Field(default_factory=list)
+    total_finish_movement_days: float = 0.0
+    total_period_days: int | None = None
+    fault_allocation: FaultAllocation = Field(default_factory=FaultAllocation)
+    import_warnings: list[str] = Field(default_factory=list)
+
+
+class RollupNode(BaseModel):
+    node_id: int
+    name: str
+    path: list[str] = Field(default_factory=list)
+    child_count: int = 0
+    direct_row_count: int = 0
+    row_count: int = 0
+    action_required_tasks: int = 0
+    slippage_days: float = 0.0
+    category_counts: dict[str, int] = Field(default_factory=dict)
+    cause_days: dict[str, float] = Field(default_factory=dict)
+
+
+class RollupResponse(BaseModel):
+    node: RollupNode
+    children: list[RollupNode] = Field(default_factory=list)
+    rows: list[TaskDiff] = Field(default_factory=list)
+
+
 class AttributionAssignment(BaseModel):
     row_key: str
     cause_tag: CauseTag
@@ -154,6 +214,7 @@ class AttributionBulkFilter(BaseModel):
     row_keys: list[str] | None = None
     statuses: list[Literal["changed", "added", "removed", "unchanged"]] | None = None
     confidence_bands: list[Literal["green", "amber", "red"]] | None = None
+    query: str | None = None
     cause_tag: CauseTag = "unassigned"
     reason_code: ReasonCode = ""
     confirm_low_confidence: bool = False
@@ -162,6 +223,101 @@ class AttributionBulkFilter(BaseModel):
 class AttributionApplyRequest(BaseModel):
     assignments: list[AttributionAssignment] = Field(default_factory=list)
     bulk: AttributionBulkFilter | None = None
+    response_mode: Literal["full", "patch"] = "full"
+
+
+class AttributionPatch(BaseModel):
+    version: int
+    base_version: int
+    rows: list[TaskDiff] = Field(default_factory=list)
+    summary: CompareSummary
+    fault_allocation: FaultAllocation = Field(default_factory=FaultAllocation)
+
+
+class CauseWeights(BaseModel):
+    client: float = Field(default=1.0, ge=0)
+    contractor: float = Field(default=1.0, ge=0)
+    neutral: float = Field(default=1.0, ge=0)
+
+
+class WhatIfRequest(BaseModel):
+    samples: int = Field(default=10000, ge=1, le=200000)
+    seed: int | None = None
+    default_weights: CauseWeights = Field(default_factory=CauseWeights)
+    category_weights: dict[str, CauseWeights] = Field(default_factory=dict)
+    row_weights: dict[str, CauseWeights] = Field(default_factory=dict)
+    percentiles: list[float] = Field(default_factory=lambda: [5.0, 50.0, 95.0])
+
+
+class WhatIfBand(BaseModel):
+    mean: float
+    percentiles: dict[str, float]
+
+
+class WhatIfResult(BaseModel):
+    samples: int
+    uncertain_rows: int
+    engine: Literal["numpy", "python"]
+    project_finish_impact_days: dict[str, WhatIfBand]
+    task_slippage_days: dict[str, WhatIfBand]
+
+
+class AttributionRule(BaseModel):
+    rule_id: str
+    when: str
+    cause_tag: CauseTag | None = None
+    reason_code: ReasonCode | None = None
+    confirm_low_confidence: bool = False
+
+
+class AttributionRulesRequest(BaseModel):
+    rules: list[AttributionRule] = Field(default_factory=list)
+    dry_run: bool = False
+
+
+class AttributionRulesReport(BaseModel):
+    rule_counts: dict[str, int] = Field(default_factory=dict)
+    rows_matched: int = 0
+    rows_updated: int = 0
+    version: int = 0
+
+
+class AttributionRulesResponse(BaseModel):
+    rules: list[AttributionRule] = Field(default_factory=list)
+    report: AttributionRulesReport | None = None
+
+
+class CarryForwardItem(BaseModel):
+    source_row_key: str
+    target_row_key: str | None = None
+    task_name: str | None = None
+    method: Literal["uid_name", "name", "fuzzy"] | None = None
+    similarity: float | None = None
+    reason: str = ""
+
+
+class CarryForwardReport(BaseModel):
+    carried: list[CarryForwardItem] = Field(default_factory=list)
+    dropped: list[CarryForwardItem] = Field(default_factory=list)
+    conflicted: list[CarryForwardItem] = Field(default_factory=list)
+    version: int = 0
+
+
+class CarryForwardRequest(BaseModel):
+    min_similarity: float = Field(default=0.85, gt=0, le=1)
+    dry_run: bool = False
+
+
+class AttributionHistoryEntry(BaseModel):
+    entry_id: int
+    label: str
+    row_count: int
+    created_at: float
+
+
+class AttributionHistoryResponse(BaseModel):
+    undo: list[AttributionHistoryEntry] = Field(default_factory=list)
+    redo: list[AttributionHistoryEntry] = Field(default_factory=list)
 
 
 class PreviewTask(BaseModel):
@@ -209,8 +365,16 @@ class PreviewSessionMeta(BaseModel):
     import_warnings: list[str] = Field(default_factory=list)
 
 
+DateFormat = Literal["iso", "dmy", "mdy"]
+DurationConvention = Literal["minutes", "units"]
+
+
 class CsvImportDiagnostics(BaseModel):
     resolved_column_map: dict[str, str] = Field(default_factory=dict)
+    date_formats: dict[str, DateFormat] = Field(default_factory=dict)
+    duration_convention: DurationConvention | None = None
+    header_signature: str = ""
+    profile_applied: bool = False
     inferred_fields: list[str] = Field(default_factory=list)
     warnings: list[str] = Field(default_factory=list)
     synthetic_uid: bool = False
@@ -218,6 +382,21 @@ class CsvImportDiagnostics(BaseModel):
     skipped_invalid_rows: int = 0
 
 
+class CsvMappingProfile(BaseModel):
+    signature: str
+    headers: list[str] = Field(default_factory=list)
+    column_map: dict[str, str] = Field(default_factory=dict)
+    date_formats: dict[str, DateFormat] = Field(default_factory=dict)
+    duration_convention: DurationConvention | None = None
+    pinned: bool = False
+    use_count: int = 0
+    updated_at: str = ""
+
+
+class CsvProfilePinRequest(BaseModel):
+    pinned: bool = True
+
+
 class PreviewRowsResponse(BaseModel):
     session: PreviewSessionMeta
     rows: list[PreviewRow] = Field(default_factory=list)
@@ -243,3 +422,54 @@ class PreviewMatchEditRequest(BaseModel):
 
 class PreviewAnalyzeRequest(BaseModel):
     session_id: str
+    response_mode: Literal["full", "delta"] = "full"
+    base_version: int | None = None
+
+
+class CompareResultDelta(BaseModel):
+    session_id: str
+    version: int
+    base_version: int = 0
+    added: list[TaskDiff] = Field(default_factory=list)
+    changed: list[TaskDiff] = Field(default_factory=list)
+    removed_row_keys: list[str] = Field(default_factory=list)
+    # Omitted (None) when the match candidates are unchanged since `base_version`.
+    candidates: list[MatchCandidate] | None = None
+    summary: CompareSummary
+    fault_allocation: FaultAllocation = Field(default_factory=FaultAllocation)
+    import_warnings: list[str] = Field(default_factory=list)
+    # Version of the active result for attribution patches (see `CompareResultResponse`).
+    result_version: int = 0
+
+
+class CompareResultResponse(BaseModel):
+    version: int
+    result: CompareResult
+
+
+class PreviewResultResponse(BaseModel):
+    session_id: str
+    version: int
+    result: CompareResult
+
+
+class InputFileRecord(BaseModel):
+    side: Literal["left", "right"]
+    filename: str | None = None
+    sha256: str
+    size_bytes: int
+
+
+class BundleMember(BaseModel):
+    name: str
+    sha256: str
+    size_bytes: int
+
+
+class BundleManifest(BaseModel):
+    generated_at: str
+    app_version: str
+    comparison_id: str = ""
+    result_version: int = 0
+    inputs: list[InputFileRecord] = Field(default_factory=list)
+    members: list[BundleMember] = Field(default_factory=list)
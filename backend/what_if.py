@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+from .attribution import _is_project_contributor, allocation_bucket
+from .schemas import CauseWeights, CompareResult, WhatIfBand, WhatIfRequest, WhatIfResult
+
+try:  # NumPy is declared, but a pure-Python sampler (bounded per request) covers its absence.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+PARTIES = ("client", "contractor", "neutral")
+UNCERTAIN_BUCKETS = {"unassigned", "excluded_low_confidence"}
+SAMPLE_CHUNK_CELLS = 4_000_000
+# Samples x uncertain rows the pure-Python sampler may run inside a request (about a second).
+PYTHON_SAMPLE_CELL_LIMIT = 4_000_000
+
+
+@dataclass
+class WhatIfInputs:
+    """Plain-data snapshot of one result, safe to simulate outside the result lock."""
+
+    fixed_task_days: dict[str, float]
+    fixed_project_weight: dict[str, float]
+    share: float
+    task_days: list[float]
+    project_days: list[float]
+    probabilities: list[tuple[float, float, float]]
+
+
+def _normalized(weights: CauseWeights) -> tuple[float, float, float]:
+    values = (weights.client, weights.contractor, weights.neutral)
+    total = sum(values)
+    if total <= 0:
+        raise ValueError("Cause weights must include at least one positive value")
+    return tuple(value / total for value in values)
+
+
+def collect_what_if_inputs(result: CompareResult, request: WhatIfRequest) -> WhatIfInputs:
+    """Split rows into fixed allocations and uncertain rows with party probabilities.
+
+    Uncertain rows are those currently counted as unassigned or excluded for low
+    confidence; weights resolve per row, then per change category, then default.
+    Without NumPy, requests over `PYTHON_SAMPLE_CELL_LIMIT` samples x rows are rejected.
+    """
+    if any(pct < 0 or pct > 100 for pct in request.percentiles):
+        raise ValueError("Percentiles must be between 0 and 100")
+    fixed_task = {party: 0.0 for party in PARTIES}
+    fixed_project = {party: 0.0 for party in PARTIES}
+    total_project_weight = 0.0
+    task_days: list[float] = []
+    project_days: list[float] = []
+    probabilities: list[tuple[float, float, float]] = []
+    default = _normalized(request.default_weights)
+    category_weights = {key: _normalized(value) for key, value in request.category_weights.items()}
+    row_weights = {key: _normalized(value) for key, value in request.row_weights.items()}
+
+    for diff in result.diffs:
+        contributor = _is_project_contributor(diff)
+        if contributor:
+            total_project_weight += diff.task_slippage_days
+        bucket = allocation_bucket(diff)
+        if bucket is None or diff.task_slippage_days == 0:
+            continue
+        if bucket in UNCERTAIN_BUCKETS:
+            task_days.append(diff.task_slippage_days)
+            project_days.append(diff.task_slippage_days if contributor else 0.0)
+            probabilities.append(
+                row_weights.get(diff.row_key) or category_weights.get(diff.change_category) or default
+            )
+            continue
+        fixed_task[bucket] += diff.task_slippage_days
+        if contributor:
+            fixed_project[bucket] += diff.task_slippage_days
+
+    if np is None and request.samples * len(task_days) > PYTHON_SAMPLE_CELL_LIMIT:
+        raise ValueError(
+            f"{request.samples} samples over {len(task_days)} uncertain rows is too many without NumPy; "
+            f"use at most {PYTHON_SAMPLE_CELL_LIMIT // max(1, len(task_days))} samples"
+        )
+
+    base_delay = result.summary.project_finish_delay_days
+    share = base_delay / total_project_weight if base_delay > 0 and total_project_weight > 0 else 0.0
+    return WhatIfInputs(
+        fixed_task_days=fixed_task,
+        fixed_project_weight=fixed_project,
+        share=share,
+        task_days=task_days,
+        project_days=project_days,
+        probabilities=probabilities,
+    )
+
+
+def _sample_numpy(inputs: WhatIfInputs, samples: int, seed: int | None):
+    rng = np.random.default_rng(seed)
+    probabilities = np.asarray(inputs.probabilities, dtype=np.float64).reshape(-1, 3)
+    cumulative = np.cumsum(probabilities, axis=1)[:, :2]
+    weights = np.column_stack((inputs.task_days, inputs.project_days)) if inputs.task_days else np.zeros((0, 2))
+    row_count = len(inputs.task_days)
+    # Per party, per metric totals for every sample: shape (samples, parties, metrics).
+    totals = np.zeros((samples, len(PARTIES), 2))
+    chunk = max(1, SAMPLE_CHUNK_CELLS // max(1, row_count))
+    for start in range(0, samples, chunk):
+        stop = min(samples, start + chunk)
+        draws = rng.random((stop - start, row_count))
+        choice = (draws >= cumulative[:, 0]).astype(np.int8) + (draws >= cumulative[:, 1])
+        for party_index in range(len(PARTIES)):
+            totals[start:stop, party_index, :] = (choice == party_index).astype(np.float64) @ weights
+    return totals
+
+
+def _sample_python(inputs: WhatIfInputs, samples: int, seed: int | None):
+    rng = random.Random(seed)
+    rows = list(zip(inputs.task_days, inputs.project_days, inputs.probabilities))
+    totals = []
+    for _ in range(samples):
+        sample = [[0.0, 0.0] for _ in PARTIES]
+        for task_days, project_days, (client, contractor, _neutral) in rows:
+            draw = rng.random()
+            party_index = 0 if draw < client else 1 if draw < client + contractor else 2
+            sample[party_index][0] += task_days
+            sample[party_index][1] += project_days
+        totals.append(sample)
+    return totals
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _band(values: list[float], percentiles: list[float]) -> WhatIfBand:
+    ordered = sorted(values)
+    return WhatIfBand(
+        mean=round(sum(ordered) / len(ordered), 3),
+        percentiles={f"p{pct:g}": round(_percentile(ordered, pct), 3) for pct in percentiles},
+    )
+
+
+def run_what_if(inputs: WhatIfInputs, request: WhatIfRequest) -> WhatIfResult:
+    """Sample party assignments for uncertain rows and report percentile bands per cause."""
+    use_numpy = np is not None
+    if use_numpy:
+        raw = _sample_numpy(inputs, request.samples, request.seed)
+        columns = {
+            (party, metric): raw[:, party_index, metric].tolist()
+            for party_index, party in enumerate(PARTIES)
+            for metric in (0, 1)
+        }
+    else:
+        raw = _sample_python(inputs, request.samples, request.seed)
+        columns = {
+            (party, metric): [sample[party_index][metric] for sample in raw]
+            for party_index, party in enumerate(PARTIES)
+            for metric in (0, 1)
+        }
+
+    task_bands: dict[str, WhatIfBand] = {}
+    project_bands: dict[str, WhatIfBand] = {}
+    for party in PARTIES:
+        task_values = [inputs.fixed_task_days[party] + value for value in columns[(party, 0)]]
+        project_values = [
+            (inputs.fixed_project_weight[party] + value) * inputs.share for value in columns[(party, 1)]
+        ]
+        task_bands[party] = _band(task_values, request.percentiles)
+        project_bands[party] = _band(project_values, request.percentiles)
+
+    return WhatIfResult(
+        samples=request.samples,
+        uncertain_rows=len(inputs.task_days),
+        engine="numpy" if use_numpy else "python",
+        task_slippage_days=task_bands,
+        project_finish_impact_days=project_bands,
+    )
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+
+from .attribution import merge_fault_allocations
+from .comparison import PreparedProgramme, compare_prepared
+from .schemas import CompareSummary, FaultAllocation, TaskRecord, WindowResult, WindowsReport
+
+
+@dataclass
+class ProgrammeUpdate:
+    label: str
+    tasks: list[TaskRecord]
+    data_date: date | None = None
+
+
+def _programme_finish(programme: PreparedProgramme) -> date | None:
+    finishes = [task.finish for task in programme.leaf if task.finish is not None]
+    return max(finishes) if finishes else None
+
+
+def _analyze_window(
+    left: PreparedProgramme,
+    right: PreparedProgramme,
+    include_baseline: bool,
+    assignment_map: dict[str, dict] | None,
+) -> tuple[CompareSummary, FaultAllocation]:
+    result = compare_prepared(left, right, include_baseline, assignment_map=assignment_map)
+    return result.summary, result.fault_allocation
+
+
+# Per-process state installed by the pool initializer, so each update is pickled
+# once per worker rather than once per window it bounds.
+_WORKER_STATE: tuple[list[PreparedProgramme], bool, list[dict[str, dict] | None]] | None = None
+
+
+def _init_window_worker(
+    prepared: list[PreparedProgramme],
+    include_baseline: bool,
+    assignment_maps: list[dict[str, dict] | None],
+) -> None:
+    global _WORKER_STATE
+    _WORKER_STATE = (prepared, include_baseline, assignment_maps)
+
+
+def _analyze_window_at(index: int) -> tuple[CompareSummary, FaultAllocation]:
+    prepared, include_baseline, assignment_maps = _WORKER_STATE
+    return _analyze_window(prepared[index], prepared[index + 1], include_baseline, assignment_maps[index])
+
+
+def _resolve_workers(max_workers: int, window_count: int) -> int:
+    return max(1, min(max_workers, window_count))
+
+
+def analyze_windows(
+    updates: list[ProgrammeUpdate],
+    *,
+    include_baseline: bool = False,
+    assignment_maps: list[dict[str, dict] | None] | None = None,
+    max_workers: int = 1,
+) -> WindowsReport:
+    """Run a windowed time-impact analysis over a chronological series of updates.
+
+    Each consecutive pair of updates forms a window, and `assignment_maps[i]` holds
+    the tags recorded for window i's own pair of files (row keys only mean
+    something within one comparison). Every update is prepared once (leaf split,
+    UID index, successor graph) and shared by the two windows it bounds.
+
+    Matching is recomputed per window: the shared update is the right side of one
+    window and the left side of the next, so no pairing from one window applies
+    to another. Windows are independent, so with `max_workers > 1` they fan out to
+    a process pool that receives the prepared updates once per worker.
+    """
+    if len(updates) < 2:
+        raise ValueError("Windows analysis needs at least two programme updates")
+    window_count = len(updates) - 1
+    if assignment_maps is None:
+        assignment_maps = [None] * window_count
+    if len(assignment_maps) != window_count:
+        raise ValueError(f"Expected {window_count} assignment map(s), one per window")
+
+    dated = [update.data_date for update in updates if update.data_date is not None]
+    if dated != sorted(dated):
+        raise ValueError("Programme updates must be supplied in chronological data-date order")
+
+    prepared = [PreparedProgramme(update.tasks) for update in updates]
+    for programme in prepared[1:]:
+        # Build once here so each worker receives the graph instead of rebuilding it.
+        programme.successor_graph
+    finishes = [_programme_finish(programme) for programme in prepared]
+
+    workers = _resolve_workers(max_workers, window_count)
+    if workers == 1:
+        outcomes = [
+            _analyze_window(prepared[index], prepared[index + 1], include_baseline, assignment_maps[index])
+            for index in range(window_count)
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_window_worker,
+            initargs=(prepared, include_baseline, assignment_maps),
+        ) as executor:
+            outcomes = list(executor.map(_analyze_window_at, range(window_count)))
+
+    windows: list[WindowResult] = []
+    cumulative = 0.0
+    for index, (summary, allocation) in enumerate(outcomes):
+        before, after = updates[index], updates[index + 1]
+        from_finish, to_finish = finishes[index], finishes[index + 1]
+        movement = float((to_finish - from_finish).days) if from_finish and to_finish else 0.0
+        cumulative += movement
+        period_days = None
+        if before.data_date is not None and after.data_date is not None:
+            period_days = (after.data_date - before.data_date).days
+        windows.append(
+            WindowResult(
+                index=index + 1,
+                from_label=before.label,
+                to_label=after.label,
+                from_data_date=before.data_date,
+                to_data_date=after.data_date,
+                period_days=period_days,
+                from_finish=from_finish,
+                to_finish=to_finish,
+                finish_movement_days=movement,
+                cumulative_movement_days=cumulative,
+                summary=summary,
+                fault_allocation=allocation,
+            )
+        )
+
+    total_period_days = None
+    if updates[0].data_date is not None and updates[-1].data_date is not None:
+        total_period_days = (updates[-1].data_date - updates[0].data_date).days
+
+    return WindowsReport(
+        windows=windows,
+        total_finish_movement_days=cumulative,
+        total_period_days=total_period_days,
+        fault_allocation=merge_fault_allocations(window.fault_allocation for window in windows),
+    )
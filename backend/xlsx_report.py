@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date
+from xml.sax.saxutils import escape
+
+from .reporting import SCL_NOTE, _metric_rows
+from .schemas import CompareResult, TaskDiff
+from .zip_stream import iter_zip
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+XLSX_MAX_ROWS = 1_048_576
+XLSX_CHUNK_ROWS = 500
+
+_EXCEL_EPOCH = date(1899, 12, 30)
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+_STYLE_DATE = 1
+_STYLE_HEADER = 2
+
+# Column kinds: "s" text, "n" number, "b" boolean, "d" date.
+Column = tuple[str, str, float, Callable[[TaskDiff], object]]
+
+EVIDENCE_COLUMNS: list[Column] = [
+    ("status", "s", 11, lambda diff: diff.status),
+    ("change_category", "s", 26, lambda diff: diff.change_category),
+    ("requires_user_input", "b", 10, lambda diff: diff.requires_user_input),
+    ("auto_reason", "s", 40, lambda diff: diff.auto_reason),
+    ("flow_on_from_right_uids", "s", 18, lambda diff: ",".join(str(uid) for uid in diff.flow_on_from_right_uids)),
+    ("auto_overridden", "b", 10, lambda diff: diff.auto_overridden),
+    ("left_uid", "n", 10, lambda diff: diff.left_uid),
+    ("right_uid", "n", 10, lambda diff: diff.right_uid),
+    ("left_name", "s", 36, lambda diff: diff.left_name),
+    ("right_name", "s", 36, lambda diff: diff.right_name),
+    ("left_finish", "d", 12, lambda diff: diff.left_finish),
+    ("right_finish", "d", 12, lambda diff: diff.right_finish),
+    ("confidence", "n", 11, lambda diff: diff.confidence),
+    ("confidence_band", "s", 11, lambda diff: diff.confidence_band),
+    ("cause_tag", "s", 12, lambda diff: diff.cause_tag),
+    ("reason_code", "s", 24, lambda diff: diff.reason_code),
+    ("attribution_status", "s", 22, lambda diff: diff.attribution_status),
+    ("task_slippage_days", "n", 12, lambda diff: diff.task_slippage_days),
+    ("included_in_totals", "b", 10, lambda diff: diff.included_in_totals),
+    ("protocol_hint", "s", 40, lambda diff: diff.protocol_hint),
+    (
+        "changed_fields",
+        "s",
+        60,
+        lambda diff: ", ".join(
+            f"{change.field}: {change.left_value} -> {change.right_value}" for change in diff.evidence
+        ),
+    ),
+]
+
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_SHEETS = ("Evidence", "Fault Allocation", "Flow-on Provenance")
+
+_CONTENT_TYPES = (
+    _XML_HEADER
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    + "".join(
+        f'<Override PartName="/xl/worksheets/sheet{index}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for index in range(1, len(_SHEETS) + 1)
+    )
+    + "</Types>"
+)
+
+_ROOT_RELS = (
+    _XML_HEADER
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+_WORKBOOK = (
+    _XML_HEADER
+    + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>'
+    + "".join(
+        f'<sheet name="{escape(name)}" sheetId="{index}" r:id="rId{index}"/>'
+        for index, name in enumerate(_SHEETS, start=1)
+    )
+    + "</sheets></workbook>"
+)
+
+_WORKBOOK_RELS = (
+    _XML_HEADER
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    + "".join(
+        f'<Relationship Id="rId{index}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{index}.xml"/>'
+        for index in range(1, len(_SHEETS) + 1)
+    )
+    + f'<Relationship Id="rId{len(_SHEETS) + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+    "</Relationships>"
+)
+
+# Cell styles: 0 default, 1 ISO date, 2 bold header.
+_STYLES = (
+    _XML_HEADER
+    + f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    "</styleSheet>"
+)
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _cell(ref: str, kind: str, value: object) -> str:
+    if value is None or value == "":
+        return ""
+    if kind == "n":
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if kind == "b":
+        return f'<c r="{ref}" t="b"><v>{int(bool(value))}</v></c>'
+    if kind == "d":
+        return f'<c r="{ref}" s="{_STYLE_DATE}"><v>{(value - _EXCEL_EPOCH).days}</v></c>'
+    text = escape(_ILLEGAL_XML.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _iter_sheet(
+    headers: list[tuple[str, str, float]],
+    rows: Iterable[list[object]],
+    chunk_rows: int = XLSX_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """Write one worksheet with a bold, frozen, filterable header row, `chunk_rows` rows at a time."""
+    letters = [_column_letter(index) for index in range(len(headers))]
+    kinds = [kind for _header, kind, _width in headers]
+    parts = [
+        _XML_HEADER,
+        f'<worksheet xmlns="{_MAIN_NS}">',
+        '<sheetViews><sheetView workbookViewId="0">'
+        '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+        "</sheetView></sheetViews><cols>",
+        *(
+            f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
+            for index, (_header, _kind, width) in enumerate(headers, start=1)
+        ),
+        '</cols><sheetData><row r="1">',
+        *(
+            f'<c r="{letter}1" t="inlineStr" s="{_STYLE_HEADER}"><is><t>{escape(header)}</t></is></c>'
+            for letter, (header, _kind, _width) in zip(letters, headers)
+        ),
+        "</row>",
+    ]
+    row_number = 1
+    for values in rows:
+        row_number += 1
+        if row_number > XLSX_MAX_ROWS:
+            raise ValueError(f"XLSX sheets hold at most {XLSX_MAX_ROWS - 1} data rows")
+        number = str(row_number)
+        parts.append(f'<row r="{number}">')
+        parts.extend(_cell(letter + number, kind, value) for letter, kind, value in zip(letters, kinds, values))
+        parts.append("</row>")
+        if row_number % chunk_rows == 0:
+            yield "".join(parts).encode("utf-8")
+            parts.clear()
+    parts.append(f'</sheetData><autoFilter ref="A1:{letters[-1]}{row_number}"/></worksheet>')
+    yield "".join(parts).encode("utf-8")
+
+
+def _evidence_rows(result: CompareResult) -> Iterator[list[object]]:
+    getters = [getter for _header, _kind, _width, getter in EVIDENCE_COLUMNS]
+    for diff in result.diffs:
+        yield [getter(diff) for getter in getters]
+
+
+def _fault_allocation_rows(result: CompareResult) -> Iterator[list[object]]:
+    allocation = result.fault_allocation
+    yield from _metric_rows("project_finish_impact_days", allocation.project_finish_impact_days)
+    yield from _metric_rows("task_slippage_days", allocation.task_slippage_days)
+    yield ["project_finish_delay_days", "base", result.summary.project_finish_delay_days]
+    yield ["SCL Reference", SCL_NOTE, None]
+
+
+def _provenance_rows(result: CompareResult) -> Iterator[list[object]]:
+    """One row per (flow-on task, driving task) pair."""
+    by_right_uid = {diff.right_uid: diff for diff in result.diffs if diff.right_uid is not None}
+    for diff in result.diffs:
+        for source_uid in diff.flow_on_from_right_uids:
+            source = by_right_uid.get(source_uid)
+            yield [
+                diff.right_uid,
+                diff.right_name or diff.left_name,
+                diff.task_slippage_days,
+                source_uid,
+                source.right_name if source else None,
+                source.change_category if source else None,
+                source.cause_tag if source else None,
+                source.task_slippage_days if source else None,
+            ]
+
+
+_FAULT_HEADERS = [("metric", "s", 28), ("field", "s", 30), ("value", "n", 12)]
+_PROVENANCE_HEADERS = [
+    ("right_uid", "n", 10),
+    ("task_name", "s", 36),
+    ("task_slippage_days", "n", 12),
+    ("source_right_uid", "n", 10),
+    ("source_task_name", "s", 36),
+    ("source_change_category", "s", 26),
+    ("source_cause_tag", "s", 12),
+    ("source_task_slippage_days", "n", 12),
+]
+
+
+def iter_xlsx_chunks(result: CompareResult) -> Iterator[bytes]:
+    """Yield an XLSX evidence workbook as zip chunks, writing rows as they are consumed.
+
+    Strings are written inline rather than to a shared-strings table so no part
+    of the workbook needs the whole result in memory at once.
+    """
+    if len(result.diffs) >= XLSX_MAX_ROWS:
+        raise ValueError(f"XLSX sheets hold at most {XLSX_MAX_ROWS - 1} data rows")
+    evidence_headers = [(header, kind, width) for header, kind, width, _getter in EVIDENCE_COLUMNS]
+    return iter_zip(
+        [
+            ("[Content_Types].xml", [_CONTENT_TYPES.encode("utf-8")]),
+            ("_rels/.rels", [_ROOT_RELS.encode("utf-8")]),
+            ("xl/workbook.xml", [_WORKBOOK.encode("utf-8")]),
+            ("xl/_rels/workbook.xml.rels", [_WORKBOOK_RELS.encode("utf-8")]),
+            ("xl/styles.xml", [_STYLES.encode("utf-8")]),
+            ("xl/worksheets/sheet1.xml", _iter_sheet(evidence_headers, _evidence_rows(result))),
+            ("xl/worksheets/sheet2.xml", _iter_sheet(_FAULT_HEADERS, _fault_allocation_rows(result))),
+            ("xl/worksheets/sheet3.xml", _iter_sheet(_PROVENANCE_HEADERS, _provenance_rows(result))),
+        ]
+    )
+
+
+def build_xlsx(result: CompareResult) -> bytes:
+    return b"".join(iter_xlsx_chunks(result))
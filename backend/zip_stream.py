@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import zipfile
+from collections.abc import Iterable, Iterator
+
+# Compressed bytes are handed to the caller once this much has accumulated.
+ZIP_FLUSH_BYTES = 64 * 1024
+
+
+class _ChunkSink:
+    """Write-only file object; zipfile falls back to data descriptors since it cannot seek."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self.pending = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self.pending += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.pending = 0
+        return data
+
+
+def iter_zip(
+    entries: Iterable[tuple[str, Iterable[bytes]]],
+    *,
+    compression: int = zipfile.ZIP_DEFLATED,
+) -> Iterator[bytes]:
+    """Stream a zip archive built from `(name, chunks)` entries, deflated by default.
+
+    Entry content is pulled from each chunk iterator only as the archive is
+    consumed, so memory stays bounded by one chunk plus the compressor's window.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=compression) as archive:
+        for name, chunks in entries:
+            with archive.open(name, "w") as handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+                    if sink.pending >= ZIP_FLUSH_BYTES:
+                        yield sink.drain()
+    data = sink.drain()
+    if data:
+        yield data
@@ -13,7 +13,7 @@ from pathlib import Path
 from typing import Any
 
 from .paths import resource_path
-from .prereq import BACKEND_LOG_PATH, log_event
+from .prereq import APP_SUPPORT_DIR, BACKEND_LOG_PATH, log_event
 
 
 @dataclass
@@ -162,6 +162,7 @@ def _apply_runtime_env(target_env: dict[str, str]) -> dict[str, str]:
 
     target_env["EOT_PARSER_JAR"] = str(parser_jar)
     target_env["EOT_FRONTEND_DIR"] = str(frontend_dir)
+    target_env.setdefault("EOT_DATA_DIR", str(APP_SUPPORT_DIR))
 
     # Prefer Homebrew OpenJDK locations if available.
     extra_java_paths = [
@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 import json
 import math
+import multiprocessing
 import subprocess
 import sys
 import time
@@ -330,4 +331,6 @@ def main(argv: Sequence[str] | None = None) -> int:
 
 
 if __name__ == "__main__":
+    # Frozen builds re-launch this executable for process-pool workers.
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -29,7 +29,10 @@ hiddenimports = []
 hiddenimports += collect_submodules("uvicorn")
 hiddenimports += collect_submodules("fastapi")
 hiddenimports += collect_submodules("reportlab")
+hiddenimports += collect_submodules("pypdf")
 hiddenimports += collect_submodules("webview")
+# backend/ ships as data, so its optional NumPy import is not discovered by analysis.
+hiddenimports += ["numpy"]
 
 jar_path = ROOT / "java-parser" / "target" / "mpp-extractor-1.0.0-jar-with-dependencies.jar"
 if not jar_path.exists():
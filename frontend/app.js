@@ -57,6 +57,8 @@ const state = {
   selectedRightUid: null,
   syncGuard: false,
   currentResult: null,
+  previewResultVersion: 0,
+  resultVersion: null,
   analysisStatus: {
     pairs: new Map(),
     leftOnly: new Map(),
@@ -151,6 +153,9 @@ async function startJobAndPoll(startUrl, requestInit, options = {}) {
       if (statusJson.status === "failed") {
         throw new Error(statusJson.error || "Operation failed");
       }
+      if (statusJson.status === "cancelled") {
+        throw new Error("Operation cancelled");
+      }
       await sleep(pollMs);
     }
   } finally {
@@ -712,6 +717,7 @@ async function runPreviewInit(files, includeBaseline) {
   );
 
   state.previewSessionId = json.session.session_id;
+  state.previewResultVersion = 0;
   state.previewRows = json.rows || [];
   state.previewMeta = json.session;
   state.previewLeftOptions = json.left_leaf_options || [];
@@ -778,14 +784,49 @@ async function runPreviewAnalysis() {
     {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ session_id: state.previewSessionId }),
+      body: JSON.stringify({
+        session_id: state.previewSessionId,
+        response_mode: "delta",
+        base_version: state.currentResult ? state.previewResultVersion : 0,
+      }),
     },
     {
       initialStage: "Running analysis",
       initialDetail: "Analyzing selected preview matches",
     }
   );
-  renderResult(json);
+  state.resultVersion = json.result_version;
+  renderResult(applyResultDelta(json));
+}
+
+function diffSortKey(diff) {
+  return `${diff.status}\u0000${diff.left_name || diff.right_name || ""}`;
+}
+
+function applyResultDelta(delta) {
+  const previous = delta.base_version && state.currentResult ? state.currentResult : null;
+  const base = previous ? previous.diffs || [] : [];
+  const removed = new Set(delta.removed_row_keys || []);
+  const changed = new Map((delta.changed || []).map((diff) => [diff.row_key, diff]));
+  const diffs = base
+    .filter((diff) => !removed.has(diff.row_key))
+    .map((diff) => changed.get(diff.row_key) || diff)
+    .concat(delta.added || []);
+  diffs.sort((a, b) => {
+    const left = diffSortKey(a);
+    const right = diffSortKey(b);
+    return left < right ? -1 : left > right ? 1 : 0;
+  });
+
+  state.previewResultVersion = delta.version;
+  return {
+    summary: delta.summary,
+    // Candidates are only sent when they changed since the base version.
+    candidates: delta.candidates || (previous ? previous.candidates || [] : []),
+    diffs,
+    fault_allocation: delta.fault_allocation,
+    import_warnings: delta.import_warnings || [],
+  };
 }
 
 async function runAutoCompare(files, includeBaseline) {
@@ -808,21 +849,59 @@ async function runAutoCompare(files, includeBaseline) {
       initialDetail: "Matching tasks and preparing evidence",
     }
   );
+  state.previewResultVersion = 0;
+  state.resultVersion = json.version;
   renderResult(json);
 }
 
+async function refreshCurrentResult() {
+  const response = await fetch(`${apiBase}/api/result`);
+  const json = await response.json();
+  if (!response.ok) {
+    throw new Error(json.error || "Failed to load current result");
+  }
+  state.resultVersion = json.version;
+  renderResult(json.result);
+}
+
+async function applyAttributionPatch(patch) {
+  // Patch local rows only when they are known to match the server's pre-edit version.
+  if (state.resultVersion === null || patch.base_version !== state.resultVersion) {
+    await refreshCurrentResult();
+    return;
+  }
+  const rows = new Map((patch.rows || []).map((diff) => [diff.row_key, diff]));
+  const result = state.currentResult;
+  state.resultVersion = patch.version;
+  renderResult({
+    ...result,
+    summary: patch.summary,
+    fault_allocation: patch.fault_allocation,
+    diffs: (result.diffs || []).map((diff) => rows.get(diff.row_key) || diff),
+  });
+}
+
 async function applyAttribution(payload) {
   const response = await fetch(`${apiBase}/api/attribution/apply`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify(payload),
+    body: JSON.stringify({ ...payload, response_mode: "patch" }),
   });
 
   const json = await response.json();
   if (!response.ok) {
     throw new Error(json.error || "Attribution update failed");
   }
-  renderResult(json);
+  await applyAttributionPatch(json);
+}
+
+async function stepAttributionHistory(step) {
+  const response = await fetch(`${apiBase}/api/attribution/${step}?response_mode=patch`, { method: "POST" });
+  const json = await response.json();
+  if (!response.ok) {
+    throw new Error(json.error || `Attribution ${step} failed`);
+  }
+  await applyAttributionPatch(json);
 }
 
 compareForm.addEventListener("submit", async (event) => {
@@ -1021,12 +1100,14 @@ document.getElementById("apply-bulk").addEventListener("click", async () => {
     rowKeys.push(checkbox.getAttribute("data-row-key"));
   });
 
-  if (!rowKeys.length) {
+  const query = document.getElementById("bulk-query").value.trim();
+  if (!rowKeys.length && !query) {
     return;
   }
 
   const bulk = {
-    row_keys: rowKeys,
+    row_keys: rowKeys.length ? rowKeys : null,
+    query: query || null,
     cause_tag: document.getElementById("bulk-cause").value,
     reason_code: document.getElementById("bulk-reason").value,
     confirm_low_confidence: document.getElementById("bulk-confirm-red").checked,
@@ -1040,4 +1121,58 @@ document.getElementById("apply-bulk").addEventListener("click", async () => {
   }
 });
 
+document.getElementById("attribution-carry-forward").addEventListener("click", async () => {
+  if (!state.currentResult) {
+    return;
+  }
+  clearError();
+  try {
+    const report = await postJson(`${apiBase}/api/attribution/carry-forward`, {});
+    const describe = (item) => `${item.task_name || item.source_row_key}: ${item.reason}`;
+    renderWarnings(document.getElementById("carry-forward-report"), [
+      `Carried ${report.carried.length}, dropped ${report.dropped.length}, conflicted ${report.conflicted.length}.`,
+      ...report.conflicted.map(describe),
+      ...report.dropped.map(describe),
+    ]);
+    await refreshCurrentResult();
+  } catch (error) {
+    showError(error.message);
+  }
+});
+
+document.getElementById("loading-cancel").addEventListener("click", async () => {
+  if (!state.loadingJobId) {
+    return;
+  }
+  await fetch(`${apiBase}/api/progress/jobs/${encodeURIComponent(state.loadingJobId)}/cancel`, { method: "POST" });
+});
+
+document.getElementById("export-pdf").addEventListener("click", async () => {
+  clearError();
+  try {
+    const result = await startJobAndPoll(
+      `${apiBase}/api/progress/export/pdf`,
+      { method: "POST" },
+      { initialStage: "Rendering PDF", initialDetail: "Preparing evidence pack" },
+    );
+    window.open(`${apiBase}${result.download_url}`, "_blank");
+  } catch (error) {
+    showError(error.message);
+  }
+});
+
+["undo", "redo"].forEach((step) => {
+  document.getElementById(`attribution-${step}`).addEventListener("click", async () => {
+    if (!state.currentResult) {
+      return;
+    }
+    clearError();
+    try {
+      await stepAttributionHistory(step);
+    } catch (error) {
+      showError(error.message);
+    }
+  });
+});
+
 setupScrollSync();
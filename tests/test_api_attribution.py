@@ -1,7 +1,20 @@
+import asyncio
+import io
 from datetime import date
 
+from starlette.datastructures import UploadFile
+
 import backend.app as app_module
-from backend.app import attribution_apply
+from backend.app import (
+    attribution_apply,
+    attribution_history,
+    attribution_redo,
+    attribution_undo,
+    compare_auto,
+    current_result,
+)
+from backend.assignment_store import open_assignment_store
+from backend.attribution_history import AttributionHistory
 from backend.comparison import compare_tasks
 from backend.schemas import AttributionApplyRequest, TaskRecord
 
@@ -19,13 +32,20 @@ def task(uid: int, name: str, start: date, finish: date):
     )
 
 
-def test_apply_attribution_endpoint_updates_result():
+def _install_result(monkeypatch, result):
+    monkeypatch.setattr(app_module, "LAST_RESULT", result)
+    monkeypatch.setattr(app_module, "LAST_ASSIGNMENTS", {})
+    monkeypatch.setattr(app_module, "LAST_AGGREGATES", None)
+    monkeypatch.setattr(app_module, "LAST_HISTORY", AttributionHistory())
+    monkeypatch.setattr(app_module, "LAST_RESULT_VERSION", app_module.LAST_RESULT_VERSION)
+
+
+def test_apply_attribution_endpoint_updates_result(monkeypatch):
     left = [task(1, "Task A", date(2025, 1, 1), date(2025, 1, 3))]
     right = [task(2, "Task A", date(2025, 1, 1), date(2025, 1, 6))]
 
     result = compare_tasks(left, right, include_baseline=False)
-    app_module.LAST_RESULT = result
-    app_module.LAST_ASSIGNMENTS = {}
+    _install_result(monkeypatch, result)
 
     row_key = result.diffs[0].row_key
     response = attribution_apply(
@@ -43,3 +63,141 @@ def test_apply_attribution_endpoint_updates_result():
 
     assert response["diffs"][0]["cause_tag"] == "client"
     assert response["fault_allocation"]["task_slippage_days"]["client_days"] == 3.0
+
+
+LEFT_CSV = b"""Unique ID,Task Name,Start,Finish,Duration (mins),% Complete,Predecessors,Summary
+1,Excavate,2025-01-01,2025-01-03,1440,100,,0
+2,Pour Concrete,2025-01-04,2025-01-06,1440,50,1FS,0
+"""
+
+RIGHT_CSV = b"""Unique ID,Task Name,Start,Finish,Duration (mins),% Complete,Predecessors,Summary
+1,Excavate,2025-01-01,2025-01-03,1440,100,,0
+2,Pour Concrete,2025-01-04,2025-01-09,2880,30,1FS,0
+"""
+
+
+def _compare_csv_pair(right_csv: bytes = RIGHT_CSV):
+    return asyncio.run(
+        compare_auto(
+            left_file=UploadFile(file=io.BytesIO(LEFT_CSV), filename="left.csv"),
+            right_file=UploadFile(file=io.BytesIO(right_csv), filename="right.csv"),
+            include_baseline=False,
+            overrides_json="[]",
+            left_column_map_json="",
+            right_column_map_json="",
+        )
+    )
+
+
+def test_assignments_survive_backend_restart(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "ASSIGNMENT_STORE", open_assignment_store(str(tmp_path)))
+    monkeypatch.setattr(app_module, "LAST_ASSIGNMENTS", {})
+    monkeypatch.setattr(app_module, "LAST_COMPARISON_ID", "")
+
+    payload = _compare_csv_pair()
+    row_key = next(diff["row_key"] for diff in payload["diffs"] if diff["left_name"] == "Pour Concrete")
+    attribution_apply(
+        AttributionApplyRequest(
+            assignments=[{"row_key": row_key, "cause_tag": "client", "confirm_low_confidence": True}]
+        )
+    )
+    app_module.ASSIGNMENT_STORE.close()
+
+    # Simulate a fresh process: empty in-memory cache, store reopened from disk.
+    monkeypatch.setattr(app_module, "ASSIGNMENT_STORE", open_assignment_store(str(tmp_path)))
+    monkeypatch.setattr(app_module, "LAST_ASSIGNMENTS", {})
+    monkeypatch.setattr(app_module, "LAST_COMPARISON_ID", "")
+    monkeypatch.setattr(app_module, "LAST_RESULT", None)
+
+    recovered = _compare_csv_pair()
+    row = next(diff for diff in recovered["diffs"] if diff["row_key"] == row_key)
+    assert row["cause_tag"] == "client"
+    assert app_module.LAST_ASSIGNMENTS[row_key]["confirm_low_confidence"] is True
+    app_module.ASSIGNMENT_STORE.close()
+
+
+def test_assignments_do_not_leak_into_a_different_comparison(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "ASSIGNMENT_STORE", open_assignment_store(str(tmp_path)))
+    monkeypatch.setattr(app_module, "LAST_ASSIGNMENTS", {})
+    monkeypatch.setattr(app_module, "LAST_COMPARISON_ID", "")
+
+    payload = _compare_csv_pair()
+    row_key = next(diff["row_key"] for diff in payload["diffs"] if diff["left_name"] == "Pour Concrete")
+    attribution_apply(
+        AttributionApplyRequest(
+            assignments=[{"row_key": row_key, "cause_tag": "client", "confirm_low_confidence": True}]
+        )
+    )
+
+    # Same UIDs and statuses (so the same row keys), but a different programme B.
+    other = _compare_csv_pair(RIGHT_CSV.replace(b"2025-01-09,2880,30", b"2025-01-10,2880,20"))
+    row = next(diff for diff in other["diffs"] if diff["row_key"] == row_key)
+    assert row["cause_tag"] == "unassigned"
+    assert row_key not in app_module.ASSIGNMENT_STORE.load(app_module.LAST_COMPARISON_ID)
+
+    again = _compare_csv_pair()
+    assert next(diff for diff in again["diffs"] if diff["row_key"] == row_key)["cause_tag"] == "client"
+    app_module.ASSIGNMENT_STORE.close()
+
+
+def test_undo_redo_restores_rows_and_totals(monkeypatch):
+    left = [task(1, "Task A", date(2025, 1, 1), date(2025, 1, 3)), task(3, "Task B", date(2025, 1, 1), date(2025, 1, 3))]
+    right = [task(2, "Task A", date(2025, 1, 1), date(2025, 1, 6)), task(4, "Task B", date(2025, 1, 1), date(2025, 1, 8))]
+    result = compare_tasks(left, right, include_baseline=False)
+    _install_result(monkeypatch, result)
+    initial = result.model_dump()
+    by_name = {diff.left_name: diff.row_key for diff in result.diffs}
+
+    first = attribution_apply(
+        AttributionApplyRequest(
+            assignments=[{"row_key": by_name["Task A"], "cause_tag": "client", "confirm_low_confidence": True}]
+        )
+    )
+    second = attribution_apply(
+        AttributionApplyRequest(
+            assignments=[
+                {"row_key": by_name["Task A"], "cause_tag": "contractor", "confirm_low_confidence": True},
+                {"row_key": by_name["Task B"], "cause_tag": "neutral", "confirm_low_confidence": True},
+            ]
+        )
+    )
+
+    history = attribution_history()
+    assert [entry["row_count"] for entry in history["undo"]] == [2, 1]
+    assert history["redo"] == []
+
+    assert attribution_undo() == first
+    assert attribution_undo() == initial
+    assert attribution_undo().status_code == 400
+    assert attribution_redo() == first
+    assert attribution_redo() == second
+    assert app_module.LAST_ASSIGNMENTS[by_name["Task B"]]["cause_tag"] == "neutral"
+
+
+def test_apply_patch_mode_returns_only_mutated_rows(monkeypatch):
+    left = [task(1, "Task A", date(2025, 1, 1), date(2025, 1, 3)), task(3, "Task B", date(2025, 1, 1), date(2025, 1, 3))]
+    right = [task(2, "Task A", date(2025, 1, 1), date(2025, 1, 6)), task(4, "Task B", date(2025, 1, 1), date(2025, 1, 8))]
+    result = compare_tasks(left, right, include_baseline=False)
+    _install_result(monkeypatch, result)
+    version = current_result()["version"]
+    row_key = next(diff.row_key for diff in result.diffs if diff.left_name == "Task A")
+
+    patch = attribution_apply(
+        AttributionApplyRequest(
+            assignments=[{"row_key": row_key, "cause_tag": "client", "confirm_low_confidence": True}],
+            response_mode="patch",
+        )
+    )
+
+    assert patch["base_version"] == version
+    assert patch["version"] == version + 1
+    assert [row["row_key"] for row in patch["rows"]] == [row_key]
+    assert "diffs" not in patch
+    full = current_result()
+    assert full["version"] == patch["version"]
+    assert patch["summary"] == full["result"]["summary"]
+    assert patch["fault_allocation"] == full["result"]["fault_allocation"]
+
+    undone = attribution_undo(response_mode="patch")
+    assert undone["base_version"] == patch["version"]
+    assert undone["rows"][0]["cause_tag"] == "unassigned"
@@ -5,7 +5,7 @@ import json
 from fastapi.responses import JSONResponse
 from starlette.datastructures import UploadFile
 
-from backend.app import compare_auto
+from backend.app import compare_auto, current_result
 
 
 LEFT_CSV = """Unique ID,Task Name,Start,Finish,Duration (mins),% Complete,Predecessors,Summary,Baseline Start,Baseline Finish
@@ -85,6 +85,7 @@ def test_auto_compare_accepts_csv_pair():
     assert response["summary"]["total_left_leaf_tasks"] == 2
     assert response["summary"]["total_right_leaf_tasks"] == 2
     assert "fault_allocation" in response
+    assert response["version"] == current_result()["version"]
 
 
 def test_auto_compare_accepts_real_style_csv_and_emits_import_warnings():
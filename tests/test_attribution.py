@@ -1,8 +1,8 @@
 from datetime import date
 
-from backend.attribution import apply_assignments
+from backend.attribution import AttributionAggregates, apply_assignments, compute_fault_allocation
 from backend.comparison import compare_tasks
-from backend.schemas import AttributionAssignment, TaskRecord
+from backend.schemas import AttributionAssignment, AttributionBulkFilter, TaskRecord
 
 
 def task(
@@ -156,3 +156,87 @@ def test_auto_flow_on_rows_are_not_counted_until_overridden():
     promoted = next(diff for diff in updated.diffs if diff.row_key == flow_on.row_key)
     assert promoted.change_category == "manual_override_actionable"
     assert promoted.requires_user_input is True
+
+
+def test_incremental_aggregates_match_full_recompute():
+    left = [
+        task(1, "Root", date(2025, 1, 1), date(2025, 1, 2), duration=480),
+        task(2, "Downstream", date(2025, 1, 3), date(2025, 1, 4), duration=480, predecessors=[1]),
+        task(3, "Facade", date(2025, 1, 1), date(2025, 1, 5)),
+        task(4, "Roofing", date(2025, 1, 1), date(2025, 1, 6)),
+    ]
+    right = [
+        task(1, "Root", date(2025, 1, 1), date(2025, 1, 4), duration=960),
+        task(22, "Downstream", date(2025, 1, 5), date(2025, 1, 6), duration=480, predecessors=[1]),
+        task(33, "Facade", date(2025, 1, 1), date(2025, 1, 9)),
+        task(44, "Roofing", date(2025, 1, 1), date(2025, 1, 12)),
+    ]
+    result = compare_tasks(left, right, include_baseline=False)
+    aggregates = AttributionAggregates(result)
+    by_name = {diff.left_name: diff.row_key for diff in result.diffs}
+
+    steps = [
+        AttributionAssignment(row_key=by_name["Facade"], cause_tag="client", confirm_low_confidence=True),
+        AttributionAssignment(row_key=by_name["Roofing"], cause_tag="contractor", confirm_low_confidence=True),
+        AttributionAssignment(
+            row_key=by_name["Downstream"], cause_tag="neutral", confirm_low_confidence=True, override_auto=True
+        ),
+        AttributionAssignment(row_key=by_name["Facade"], cause_tag="unassigned"),
+    ]
+    assignment_map = None
+    for step in steps:
+        result, assignment_map = apply_assignments(
+            result, [step], assignment_map=assignment_map, aggregates=aggregates
+        )
+        summary_counts = (
+            result.summary.action_required_tasks,
+            result.summary.auto_resolved_tasks,
+            result.summary.auto_flow_on_tasks,
+            result.summary.identity_conflict_tasks,
+        )
+        assert summary_counts == (
+            sum(1 for diff in result.diffs if diff.requires_user_input),
+            sum(1 for diff in result.diffs if not diff.requires_user_input),
+            sum(1 for diff in result.diffs if diff.change_category == "date_shift_flow_on"),
+            sum(1 for diff in result.diffs if diff.change_category == "identity_conflict"),
+        )
+        assert result.fault_allocation == compute_fault_allocation(result)
+
+    assert result.fault_allocation.task_slippage_days.contractor_days == 6
+    assert result.fault_allocation.task_slippage_days.neutral_days == 2
+
+
+def test_bulk_query_touches_only_matching_rows():
+    left = [
+        task(1, "Zone C Slab Pour", date(2025, 1, 1), date(2025, 1, 2), duration=480),
+        task(2, "Zone C Walls", date(2025, 1, 1), date(2025, 1, 2), duration=480),
+        task(3, "Zone A Slab Pour", date(2025, 1, 1), date(2025, 1, 2), duration=480),
+    ]
+    right = [
+        task(1, "Zone C Slab Pour", date(2025, 1, 1), date(2025, 1, 4), duration=960),
+        task(2, "Zone C Walls", date(2025, 1, 1), date(2025, 1, 4), duration=960),
+        task(3, "Zone A Slab Pour", date(2025, 1, 1), date(2025, 1, 4), duration=960),
+    ]
+    result = compare_tasks(left, right, include_baseline=False)
+    aggregates = AttributionAggregates(result)
+
+    updated, assignment_map = apply_assignments(
+        result,
+        assignments=[],
+        bulk=AttributionBulkFilter(
+            query='status:changed name:"zone c" not name:walls',
+            cause_tag="client",
+            confirm_low_confidence=True,
+        ),
+        aggregates=aggregates,
+    )
+
+    tagged = {diff.left_name for diff in updated.diffs if diff.cause_tag == "client"}
+    assert tagged == {"Zone C Slab Pour"}
+    assert aggregates.index.lookup("cause", "client") == {
+        diff.row_key for diff in updated.diffs if diff.cause_tag == "client"
+    }
+    assert aggregates.index.lookup("cause", "unassigned") == {
+        diff.row_key for diff in updated.diffs if diff.cause_tag == "unassigned"
+    }
+    assert set(assignment_map) == {diff.row_key for diff in updated.diffs}
@@ -0,0 +1,65 @@
+import asyncio
+import hashlib
+import io
+import json
+import zipfile
+
+from starlette.datastructures import UploadFile
+
+import backend.app as app_module
+from backend.app import attribution_apply, compare_auto, export_bundle
+from backend.pdf_cache import PdfCache
+from backend.schemas import AttributionApplyRequest
+
+LEFT_CSV = b"""Unique ID,Task Name,Start,Finish,Duration (mins),% Complete,Predecessors,Summary
+1,Excavate,2025-01-01,2025-01-03,1440,100,,0
+2,Pour Concrete,2025-01-04,2025-01-06,1440,50,1FS,0
+"""
+
+RIGHT_CSV = b"""Unique ID,Task Name,Start,Finish,Duration (mins),% Complete,Predecessors,Summary
+1,Excavate,2025-01-01,2025-01-03,1440,100,,0
+2,Pour Concrete,2025-01-04,2025-01-09,2880,30,1FS,0
+"""
+
+
+async def _read_body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+def test_bundle_streams_reports_result_json_and_manifest(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "PDF_CACHE", PdfCache(tmp_path))
+    monkeypatch.setattr(app_module, "ASSIGNMENT_STORE", None)
+    monkeypatch.setattr(app_module, "LAST_ASSIGNMENTS", {})
+    payload = asyncio.run(
+        compare_auto(
+            left_file=UploadFile(file=io.BytesIO(LEFT_CSV), filename="left.csv"),
+            right_file=UploadFile(file=io.BytesIO(RIGHT_CSV), filename="right.csv"),
+            include_baseline=False,
+            overrides_json="[]",
+            left_column_map_json="",
+            right_column_map_json="",
+        )
+    )
+    row_key = next(diff["row_key"] for diff in payload["diffs"] if diff["left_name"] == "Pour Concrete")
+    attribution_apply(
+        AttributionApplyRequest(assignments=[{"row_key": row_key, "cause_tag": "client", "confirm_low_confidence": True}])
+    )
+
+    archive = zipfile.ZipFile(io.BytesIO(asyncio.run(_read_body(export_bundle()))))
+    assert archive.namelist() == ["evidence-pack.csv", "result.json", "evidence-pack.pdf", "manifest.json"]
+    assert archive.read("evidence-pack.pdf").startswith(b"%PDF")
+
+    result = json.loads(archive.read("result.json"))
+    assert len(result["diffs"]) == len(payload["diffs"])
+    assert result["assignments"][row_key]["cause_tag"] == "client"
+    assert set(result["assignments"]) == {row_key}
+
+    manifest = json.loads(archive.read("manifest.json"))
+    assert [(item["side"], item["filename"], item["sha256"]) for item in manifest["inputs"]] == [
+        ("left", "left.csv", hashlib.sha256(LEFT_CSV).hexdigest()),
+        ("right", "right.csv", hashlib.sha256(RIGHT_CSV).hexdigest()),
+    ]
+    for member in manifest["members"]:
+        data = archive.read(member["name"])
+        assert member["size_bytes"] == len(data)
+        assert member["sha256"] == hashlib.sha256(data).hexdigest()
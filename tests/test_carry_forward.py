@@ -0,0 +1,131 @@
+from datetime import date
+
+import backend.app as app_module
+from backend.app import attribution_carry_forward
+from backend.attribution import apply_assignments
+from backend.carry_forward import carry_forward_assignments
+from backend.comparison import compare_tasks
+from backend.schemas import AttributionAssignment, CarryForwardRequest, TaskRecord
+
+
+def task(uid: int, name: str, finish_day: int, duration: int = 480):
+    return TaskRecord(
+        uid=uid,
+        name=name,
+        start=date(2025, 1, 1),
+        finish=date(2025, 1, finish_day),
+        duration_minutes=duration,
+        percent_complete=0,
+        predecessors=[],
+    )
+
+
+REVISION_A = [
+    task(1, "Pour Slab L1", 2),
+    task(2, "Erect Steel", 2),
+    task(3, "Fit-out Zone A", 2),
+    task(4, "Demolish Shed", 2),
+]
+REVISION_B = [
+    task(1, "Pour Slab L1", 4, duration=960),
+    task(2, "Erect Steel", 4, duration=960),
+    task(3, "Fit-out Zone A", 4, duration=960),
+]
+# The next comparison's left side: B re-exported with a renumbered UID and a renamed task.
+REVISION_B_REEXPORT = [
+    task(1, "Pour Slab L1", 4, duration=960),
+    task(20, "Erect Steel", 4, duration=960),
+    task(3, "Fit out Zone A", 4, duration=960),
+]
+REVISION_C = [
+    task(1, "Pour Slab L1", 8, duration=1440),
+    task(20, "Erect Steel", 8, duration=1440),
+    task(3, "Fit out Zone A", 8, duration=1440),
+]
+
+
+def _tagged_previous():
+    previous = compare_tasks(REVISION_A, REVISION_B, include_baseline=False)
+    by_name = {diff.left_name: diff.row_key for diff in previous.diffs}
+    tags = {
+        "Pour Slab L1": "client",
+        "Erect Steel": "contractor",
+        "Fit-out Zone A": "neutral",
+        "Demolish Shed": "client",
+    }
+    return apply_assignments(
+        previous,
+        [
+            AttributionAssignment(row_key=by_name[name], cause_tag=cause, confirm_low_confidence=True)
+            for name, cause in tags.items()
+        ],
+    )
+
+
+def test_carry_forward_matches_by_identity_name_then_fuzzy():
+    previous, previous_map = _tagged_previous()
+    current = compare_tasks(REVISION_B_REEXPORT, REVISION_C, include_baseline=False)
+
+    assignments, report = carry_forward_assignments(previous, previous_map, current, {})
+
+    carried = {item.task_name: item.method for item in report.carried}
+    assert carried == {"Pour Slab L1": "uid_name", "Erect Steel": "name", "Fit-out Zone A": "fuzzy"}
+    assert [item.task_name for item in report.dropped] == ["Demolish Shed"]
+    assert report.conflicted == []
+    by_target = {diff.row_key: diff.left_name for diff in current.diffs}
+    assert {by_target[item.row_key]: item.cause_tag for item in assignments} == {
+        "Pour Slab L1": "client",
+        "Erect Steel": "contractor",
+        "Fit out Zone A": "neutral",
+    }
+
+
+def test_carry_forward_reports_every_source_when_identical_entries_share_a_target():
+    left = [task(1, "Pour Slab L1", 2), task(5, "Pour slab L1", 2)]
+    right = [task(1, "Pour Slab L1", 4, duration=960), task(5, "Pour slab  L1", 4, duration=960)]
+    previous = compare_tasks(left, right, include_baseline=False)
+    previous, previous_map = apply_assignments(
+        previous,
+        [
+            AttributionAssignment(row_key=diff.row_key, cause_tag="client", confirm_low_confidence=True)
+            for diff in previous.diffs
+        ],
+    )
+    current = compare_tasks(REVISION_B_REEXPORT[:1], REVISION_C[:1], include_baseline=False)
+
+    assignments, report = carry_forward_assignments(previous, previous_map, current, {})
+
+    assert sorted(item.source_row_key for item in report.carried) == sorted(diff.row_key for diff in previous.diffs)
+    assert {item.target_row_key for item in report.carried} == {current.diffs[0].row_key}
+    assert report.dropped == [] and report.conflicted == []
+    assert [item.cause_tag for item in assignments] == ["client"]
+
+
+def test_carry_forward_reports_conflicts_with_existing_assignments():
+    previous, previous_map = _tagged_previous()
+    current = compare_tasks(REVISION_B_REEXPORT, REVISION_C, include_baseline=False)
+    slab_key = next(diff.row_key for diff in current.diffs if diff.left_name == "Pour Slab L1")
+    current_map = {slab_key: {"cause_tag": "neutral", "reason_code": "", "confirm_low_confidence": True, "override_auto": False}}
+
+    assignments, report = carry_forward_assignments(previous, previous_map, current, current_map)
+
+    assert [item.target_row_key for item in report.conflicted] == [slab_key]
+    assert slab_key not in {item.row_key for item in assignments}
+
+
+def test_carry_forward_endpoint_applies_carried_tags(monkeypatch):
+    previous, previous_map = _tagged_previous()
+    current = compare_tasks(REVISION_B_REEXPORT, REVISION_C, include_baseline=False)
+    monkeypatch.setattr(app_module, "PREVIOUS_RESULT", previous)
+    monkeypatch.setattr(app_module, "PREVIOUS_ASSIGNMENTS", previous_map)
+    monkeypatch.setattr(app_module, "LAST_RESULT", current)
+    monkeypatch.setattr(app_module, "LAST_ASSIGNMENTS", {})
+
+    preview = attribution_carry_forward(CarryForwardRequest(dry_run=True))
+    assert len(preview["carried"]) == 3
+    assert all(diff.cause_tag == "unassigned" for diff in app_module.LAST_RESULT.diffs)
+
+    report = attribution_carry_forward(CarryForwardRequest())
+    assert len(report["carried"]) == 3
+    tags = {diff.left_name: diff.cause_tag for diff in app_module.LAST_RESULT.diffs}
+    assert tags == {"Pour Slab L1": "client", "Erect Steel": "contractor", "Fit out Zone A": "neutral"}
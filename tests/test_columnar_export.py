@@ -0,0 +1,156 @@
+import ast
+import io
+import struct
+import zipfile
+from datetime import date
+
+import pytest
+
+from backend import columnar_export
+from backend.columnar_export import columnar_tables, export_columnar, resolve_format
+from backend.comparison import compare_tasks
+from backend.schemas import TaskRecord
+from backend.zip_stream import iter_zip
+
+
+def task(uid: int, name: str, start: date, finish: date, minutes: int, predecessors: list[int] | None = None):
+    return TaskRecord(
+        uid=uid,
+        name=name,
+        is_summary=False,
+        start=start,
+        finish=finish,
+        duration_minutes=minutes,
+        percent_complete=0,
+        predecessors=predecessors or [],
+    )
+
+
+def _result():
+    left = [
+        task(1, "Excavate", date(2025, 1, 1), date(2025, 1, 3), 1440),
+        task(2, "Pour", date(2025, 1, 4), date(2025, 1, 6), 1440, [1]),
+    ]
+    right = [
+        task(1, "Excavate", date(2025, 1, 1), date(2025, 1, 5), 2400),
+        task(2, "Pour", date(2025, 1, 6), date(2025, 1, 8), 1440, [1]),
+        task(3, "Install handrails", date(2025, 1, 9), date(2025, 1, 10), 480, [2]),
+    ]
+    return compare_tasks(left, right, include_baseline=False)
+
+
+def test_columnar_tables_are_typed_and_linked():
+    result = _result()
+    tables = columnar_tables(result)
+
+    diffs = tables["diffs"]
+    assert len(diffs["row_key"].values) == len(result.diffs)
+    assert diffs["status"].kind == "category"
+    codes, categories = diffs["status"].encoded()
+    assert [categories[code] for code in codes] == [diff.status for diff in result.diffs]
+    changed = next(index for index, diff in enumerate(result.diffs) if diff.left_uid == 1)
+    assert diffs["right_finish"].values[changed] == date(2025, 1, 5).toordinal() - date(1970, 1, 1).toordinal()
+    added = next(index for index, diff in enumerate(result.diffs) if diff.status == "added")
+    assert diffs["left_uid"].values[added] is None
+    assert diffs["left_finish"].values[added] is None
+
+    evidence = tables["evidence"]
+    rows = [
+        {name: column.values[index] for name, column in evidence.items()}
+        for index in range(len(evidence["diff_index"].values))
+    ]
+    finish = next(row for row in rows if row["diff_index"] == changed and row["field"] == "finish")
+    assert finish["right_value"].startswith("2025-01-05")
+    assert finish["right_date"] == diffs["right_finish"].values[changed]
+    assert finish["right_number"] is None
+    duration = next(row for row in rows if row["diff_index"] == changed and row["field"] == "duration_minutes")
+    assert (duration["left_number"], duration["right_number"]) == (1440.0, 2400.0)
+    assert duration["left_date"] is None
+
+    allocation = tables["fault_allocation"]
+    assert len(allocation["value"].values) == 16
+    assert set(allocation["basis"].values) == {"project_finish_impact_days", "task_slippage_days"}
+
+
+def test_resolve_format_rejects_unknown_or_unavailable(monkeypatch):
+    with pytest.raises(ValueError, match="Unknown columnar format"):
+        resolve_format("feather")
+    monkeypatch.setattr(columnar_export, "pa", None)
+    assert resolve_format("auto") == "npz"
+    with pytest.raises(ValueError, match="needs pyarrow"):
+        resolve_format("parquet")
+
+
+def test_stored_zip_entries_round_trip():
+    archive = zipfile.ZipFile(
+        io.BytesIO(b"".join(iter_zip([("a.arrow", [b"abc", b"def"])], compression=zipfile.ZIP_STORED)))
+    )
+    assert archive.getinfo("a.arrow").compress_type == zipfile.ZIP_STORED
+    assert archive.read("a.arrow") == b"abcdef"
+
+
+def _read_npy(data: bytes) -> tuple[str, list]:
+    """Decode a one-dimensional .npy member without numpy; returns its dtype and values."""
+    assert data.startswith(b"\x93NUMPY\x01\x00")
+    (header_length,) = struct.unpack("<H", data[8:10])
+    assert (10 + header_length) % 64 == 0
+    header = ast.literal_eval(data[10 : 10 + header_length].decode("latin-1"))
+    assert header["fortran_order"] is False
+    (count,) = header["shape"]
+    body, descr = data[10 + header_length :], header["descr"]
+    if descr.startswith("<U"):
+        width = 4 * int(descr[2:])
+        return descr, [body[i * width : (i + 1) * width].decode("utf-32-le").rstrip("\0") for i in range(count)]
+    if descr == "|b1":
+        return descr, [bool(byte) for byte in body]
+    code = {"<i4": "i", "<i8": "q", "<f8": "d", "<M8[D]": "q"}[descr]
+    return descr, list(struct.unpack(f"<{count}{code}", body))
+
+
+def test_npz_export_needs_no_optional_dependency(monkeypatch):
+    monkeypatch.setattr(columnar_export, "pa", None)
+    result = _result()
+    export = export_columnar(result)
+    assert (export.filename, export.media_type) == ("evidence-columns.npz", "application/octet-stream")
+
+    archive = zipfile.ZipFile(io.BytesIO(export.content))
+    assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
+    arrays = {name[: -len(".npy")]: _read_npy(archive.read(name)) for name in archive.namelist()}
+    assert arrays["diffs.__columns__"][1] == list(columnar_tables(result)["diffs"])
+    codes = arrays["diffs.status"][1]
+    categories = arrays["diffs.status.categories"][1]
+    assert [categories[code] for code in codes] == [diff.status for diff in result.diffs]
+
+    added = next(index for index, diff in enumerate(result.diffs) if diff.status == "added")
+    descr, left_finish = arrays["diffs.left_finish"]
+    assert descr == "<M8[D]" and left_finish[added] == -(2**63)
+    assert arrays["diffs.left_uid.valid"][1][added] is False
+    assert arrays["diffs.right_name"][1] == [diff.right_name or "" for diff in result.diffs]
+    assert arrays["fault_allocation.value"][0] == "<f8"
+
+
+def test_npz_export_round_trips_without_pickle(monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(columnar_export, "pa", None)
+    result = _result()
+    export = export_columnar(result)
+    assert export.filename.endswith(".npz")
+
+    arrays = np.load(io.BytesIO(export.content), allow_pickle=False)
+    assert list(arrays["diffs.__columns__"]) == list(columnar_tables(result)["diffs"])
+    statuses = arrays["diffs.status.categories"][arrays["diffs.status"]]
+    assert list(statuses) == [diff.status for diff in result.diffs]
+    assert arrays["diffs.right_finish"].dtype == np.dtype("datetime64[D]")
+    assert "diffs.left_uid.valid" in arrays.files
+
+
+def test_arrow_export_uses_dictionary_and_date_types():
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc as ipc
+
+    export = export_columnar(_result(), "arrow")
+    archive = zipfile.ZipFile(io.BytesIO(export.content))
+    assert sorted(archive.namelist()) == ["diffs.arrow", "evidence.arrow", "fault_allocation.arrow"]
+    table = ipc.open_file(pa.BufferReader(archive.read("diffs.arrow"))).read_all()
+    assert pa.types.is_dictionary(table.schema.field("status").type)
+    assert table.schema.field("right_finish").type == pa.date32()
@@ -189,3 +189,79 @@ def test_added_and_removed_detection_and_actionable_flags():
     added_diff = next(diff for diff in added_result.diffs if diff.status == "added")
     assert added_diff.requires_user_input is True
     assert added_diff.change_category == "added"
+
+
+def test_partitioned_compare_matches_serial_output():
+    def programme(shift: int, *, right: bool) -> list[TaskRecord]:
+        tasks: list[TaskRecord] = []
+        for zone in range(3):
+            summary_uid = 1000 + zone
+            tasks.append(
+                task(summary_uid, f"Zone {zone}", date(2025, 1, 1), date(2025, 3, 1), summary=True).model_copy(
+                    update={"outline_level": 1}
+                )
+            )
+            for step in range(4):
+                uid = zone * 10 + step + 1
+                # Chain crosses zones: the first task of each zone follows the last task of the previous one.
+                predecessors = [uid - 1] if uid > 1 else []
+                duration = 960 if right and zone == 0 and step == 1 else 480
+                start = date(2025, 1, 1 + zone * 5 + step + (shift if uid > 2 else 0))
+                tasks.append(
+                    task(
+                        uid if not (right and step == 3) else uid + 500,
+                        f"Zone {zone} step {step}",
+                        start,
+                        date(2025, 1, 2 + zone * 5 + step + (shift if uid > 2 else 0)),
+                        duration=duration,
+                        predecessors=predecessors,
+                    ).model_copy(update={"outline_level": 2})
+                )
+        return tasks
+
+    left = programme(0, right=False)
+    right = programme(2, right=True)
+
+    serial = compare_tasks(left, right, include_baseline=False)
+    partitioned = compare_tasks(left, right, include_baseline=False, max_workers=3)
+
+    assert partitioned.model_dump() == serial.model_dump()
+    assert serial.summary.auto_flow_on_tasks > 0
+
+    # A task moved to another branch under a new UID is still matched as on the serial path.
+    moved = next(item for item in right if item.name == "Zone 0 step 2")
+    reshuffled = [item for item in right if item is not moved]
+    zone_one_at = next(index for index, item in enumerate(reshuffled) if item.name == "Zone 1")
+    reshuffled.insert(zone_one_at + 1, moved.model_copy(update={"uid": 900}))
+    serial = compare_tasks(left, reshuffled, include_baseline=False)
+    partitioned = compare_tasks(left, reshuffled, include_baseline=False, max_workers=3)
+
+    assert partitioned.model_dump() == serial.model_dump()
+    assert (3, 900) in {(diff.left_uid, diff.right_uid) for diff in partitioned.diffs}
+
+
+def test_partitioned_compare_matches_serial_for_cross_branch_moves_and_overrides():
+    def branch(uid: int, name: str) -> TaskRecord:
+        return task(uid, name, date(2025, 1, 1), date(2025, 3, 1), summary=True).model_copy(update={"outline_level": 1})
+
+    def leaf(uid: int, name: str, day: int = 1) -> TaskRecord:
+        return task(uid, name, date(2025, 1, day), date(2025, 1, day + 1)).model_copy(update={"outline_level": 2})
+
+    # UID 1 keeps its identity but moves from branch A to B, while a new "Pour" (UID 9)
+    # appears in A. Branch-local matching would pair 1 with 9.
+    left = [branch(100, "A"), leaf(1, "Pour"), leaf(2, "x"), branch(101, "B"), leaf(3, "y")]
+    right = [branch(100, "A"), leaf(9, "Pour"), leaf(2, "x"), branch(101, "B"), leaf(1, "Pour"), leaf(3, "y")]
+
+    serial = compare_tasks(left, right, include_baseline=False)
+    partitioned = compare_tasks(left, right, include_baseline=False, max_workers=2)
+
+    assert partitioned.model_dump() == serial.model_dump()
+    pairs = {(diff.left_uid, diff.right_uid, diff.status) for diff in partitioned.diffs}
+    assert (1, 1, "unchanged") in pairs and (None, 9, "added") in pairs
+
+    overrides = [MatchOverride(left_uid=2, right_uid=3), MatchOverride(left_uid=3, right_uid=2)]
+    serial = compare_tasks(left, right, include_baseline=False, overrides=overrides)
+    partitioned = compare_tasks(left, right, include_baseline=False, overrides=overrides, max_workers=2)
+
+    assert partitioned.model_dump() == serial.model_dump()
+    assert {(2, 3), (3, 2)} <= {(diff.left_uid, diff.right_uid) for diff in partitioned.diffs}
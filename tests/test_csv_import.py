@@ -1,4 +1,7 @@
-from backend.csv_import import parse_tasks_from_csv_bytes
+from datetime import date
+
+from backend import csv_import
+from backend.csv_import import infer_date_format, parse_tasks_from_csv_bytes, profile_column
 
 
 def test_parse_tasks_from_csv_bytes_with_explicit_mapping():
@@ -122,3 +125,93 @@ Task B,06/01/2025,10/01/2025,75
     assert diagnostics.resolved_column_map["name"] == "Name"
     assert diagnostics.resolved_column_map["finish"] == "Finish"
     assert any("recovered task rows" in warning for warning in diagnostics.warnings)
+
+
+def test_fallback_recovery_reads_the_rows_once(monkeypatch):
+    rows = "".join(f"Task {index},01/01/2025,05/01/2025,{index}\n" for index in range(1000))
+    csv_text = "Name,Start,Finish,Percent complete\n" + rows
+    yielded = 0
+    iter_data_rows = csv_import._iter_data_rows
+
+    def counting_rows(data):
+        nonlocal yielded
+        for row in iter_data_rows(data):
+            yielded += 1
+            yield row
+
+    monkeypatch.setattr(csv_import, "_iter_data_rows", counting_rows)
+    tasks, diagnostics = parse_tasks_from_csv_bytes(
+        csv_text.encode("utf-8"),
+        column_map={"name": "Start", "start": "Start", "finish": "Name"},
+        return_diagnostics=True,
+    )
+
+    assert len(tasks) == 1000
+    assert diagnostics.skipped_invalid_rows == 0
+    assert any("recovered task rows" in warning for warning in diagnostics.warnings)
+    # One full pass plus bounded samples for inference, the sample check and the fallback mapping.
+    assert yielded < 1000 + 4 * csv_import.SAMPLE_ROW_LIMIT
+
+
+def test_parse_tasks_from_csv_bytes_streams_ragged_rows_by_column_index():
+    csv_text = (
+        "\ufeffID,Name,Start,Finish,Notes,Name\r\n"
+        "1,Ignored,2026-01-10,2026-01-20,,Excavate\r\n"
+        "ID,Name,Start,Finish,Notes,Name\r\n"
+        "2,Ignored,2026-01-10,2026-01-21,note,Pour,extra\r\n"
+        "3,Short row,2026-01-10\r\n"
+        ",,,,,\r\n"
+    )
+
+    tasks, diagnostics = parse_tasks_from_csv_bytes(
+        csv_text.encode("utf-8"),
+        column_map={"uid": "ID", "name": "Name", "start": "Start", "finish": "Finish"},
+        allow_inference=False,
+        return_diagnostics=True,
+    )
+
+    # A repeated header resolves to its last column, matching the header-keyed lookup it replaced.
+    assert [(task.uid, task.name) for task in tasks] == [(1, "Excavate"), (2, "Pour")]
+    assert tasks[0].start == tasks[1].start
+    assert diagnostics.skipped_duplicate_header_rows == 1
+    assert diagnostics.skipped_invalid_rows == 1
+
+
+def test_parse_tasks_from_csv_bytes_infers_month_first_dates_per_column():
+    csv_text = """ID,Name,Start,Finish,Baseline Start
+1,Excavate,03/04/2025,03/15/2025 17:00,04/01/2025
+2,Pour,04/02/2025,04/20/2025 17:00,04/03/2025
+3,Cure,2025-04-21,04/30/2025 17:00,
+"""
+
+    tasks, diagnostics = parse_tasks_from_csv_bytes(csv_text.encode("utf-8"), return_diagnostics=True)
+
+    # Finish pins month-first; Start and Baseline Start are ambiguous and follow the file's order.
+    assert diagnostics.date_formats == {"start": "mdy", "finish": "mdy", "baseline_start": "mdy"}
+    assert tasks[0].start == date(2025, 3, 4)
+    assert tasks[0].finish == date(2025, 3, 15)
+    assert tasks[1].baseline_start == date(2025, 4, 3)
+    assert tasks[2].start == date(2025, 4, 21)  # outliers still take the general parser
+
+
+def test_infer_date_format_defaults_to_day_first():
+    assert infer_date_format(["01/02/2025", "03/04/2025"]) == "dmy"
+    assert infer_date_format(["13/02/2025", "01/02/2025"]) == "dmy"
+    assert infer_date_format(["2025-02-01", "2025-02-03T08:00:00"]) == "iso"
+    assert infer_date_format(["n/a", ""]) is None
+
+
+def test_profile_column_types_each_cell_once_and_tracks_uniqueness():
+    ids = profile_column(["1", "2", "3", " "])
+    assert (ids.non_empty, ids.ints, ids.unique) == (3, 3, True)
+    assert ids.value_score("uid") == 1.0
+
+    repeated = profile_column(["5", "5", "5", "10"])
+    assert repeated.unique is False
+    assert repeated.value_score("uid") == 0.5
+    assert repeated.value_score("duration_minutes") == 1.0
+
+    dates = profile_column(["03/15/2025", "04/02/2025", "tbc"])
+    assert dates.date_format == "mdy"
+    assert dates.value_score("start") == 2 / 3
+    assert dates.value_score("name") == 1 / 3
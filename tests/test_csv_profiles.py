@@ -0,0 +1,106 @@
+import asyncio
+import io
+
+from starlette.datastructures import UploadFile
+
+import backend.app as app_module
+from backend.app import compare_auto, csv_profile_delete, csv_profile_pin, csv_profiles_list
+from backend.csv_import import header_signature, parse_tasks_from_csv_bytes, read_csv_headers
+from backend.csv_profiles import CsvProfileStore
+from backend.schemas import CsvProfilePinRequest
+
+ASTA_LEFT = """Name,Duration,Start,Finish,Percent complete
+Contract Programme,88w 1d,01/11/2024,21/08/2026,6.82
+Enabling Works,41w 3d,31/03/2025,04/02/2026,85.29
+"""
+
+ASTA_RIGHT = """NAME,Duration,Start,Finish,Percent Complete
+Contract Programme,89w 0d,01/11/2024,22/08/2026,6.90
+Enabling Works,41w 3d,31/03/2025,04/02/2026,86.00
+"""
+
+
+def _upload(filename: str, content: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+def _profile_for(data: bytes, store: CsvProfileStore):
+    headers = read_csv_headers(data)
+    _tasks, diagnostics = parse_tasks_from_csv_bytes(data, return_diagnostics=True)
+    return store.record_import(headers, diagnostics)
+
+
+def test_saved_profile_skips_inference_for_same_header_layout():
+    store = CsvProfileStore(None)
+    profile = _profile_for(ASTA_LEFT.encode("utf-8"), store)
+    assert profile.date_formats == {"start": "dmy", "finish": "dmy"}
+    assert profile.duration_convention == "units"
+
+    right = ASTA_RIGHT.encode("utf-8")
+    assert header_signature(read_csv_headers(right)) == profile.signature
+    tasks, diagnostics = parse_tasks_from_csv_bytes(right, return_diagnostics=True, saved_profile=profile)
+
+    assert diagnostics.profile_applied is True
+    assert diagnostics.inferred_fields == []
+    assert diagnostics.resolved_column_map["name"] == "NAME"
+    assert [task.finish.isoformat() for task in tasks] == ["2026-08-22", "2026-02-04"]
+
+
+def test_saved_profile_is_revalidated_against_a_sample():
+    store = CsvProfileStore(None)
+    profile = _profile_for(ASTA_LEFT.encode("utf-8"), store)
+    month_first = """Name,Duration,Start,Finish,Percent complete
+Contract Programme,88w 1d,11/01/2024,08/21/2026,6.82
+"""
+
+    tasks, diagnostics = parse_tasks_from_csv_bytes(
+        month_first.encode("utf-8"), return_diagnostics=True, saved_profile=profile
+    )
+
+    assert diagnostics.profile_applied is False
+    assert diagnostics.date_formats["finish"] == "mdy"
+    assert any("no longer matches" in warning for warning in diagnostics.warnings)
+    assert tasks[0].finish.isoformat() == "2026-08-21"
+
+
+def test_pinned_profile_keeps_its_mapping():
+    store = CsvProfileStore(None)
+    profile = _profile_for(ASTA_LEFT.encode("utf-8"), store)
+    store.set_pinned(profile.signature, True)
+    store.save(store.get(profile.signature).model_copy(update={"column_map": {**profile.column_map, "uid": ""}}))
+
+    _tasks, diagnostics = parse_tasks_from_csv_bytes(ASTA_LEFT.encode("utf-8"), return_diagnostics=True)
+    diagnostics.resolved_column_map["uid"] = "Duration"
+    kept = store.record_import(read_csv_headers(ASTA_LEFT.encode("utf-8")), diagnostics)
+
+    assert kept.pinned is True
+    assert kept.column_map["uid"] == ""
+    assert kept.use_count == 2
+
+
+def test_csv_profile_api_records_pins_and_deletes(monkeypatch):
+    monkeypatch.setattr(app_module, "CSV_PROFILES", CsvProfileStore(None))
+    response = asyncio.run(
+        compare_auto(
+            left_file=_upload("left.csv", ASTA_LEFT.encode("utf-8")),
+            right_file=_upload("right.csv", ASTA_RIGHT.encode("utf-8")),
+            include_baseline=False,
+            overrides_json="[]",
+            left_column_map_json="",
+            right_column_map_json="",
+        )
+    )
+    assert isinstance(response, dict)
+    # Programme B shares Programme A's template, so its import reuses the profile A just saved.
+    assert "Programme B: Applied saved column mapping profile for this header layout." in response["import_warnings"]
+    assert not any(warning.startswith("Programme B: Auto-mapped") for warning in response["import_warnings"])
+
+    profiles = csv_profiles_list()["profiles"]
+    assert len(profiles) == 1
+    assert profiles[0]["use_count"] == 2
+    signature = profiles[0]["signature"]
+
+    assert csv_profile_pin(signature, CsvProfilePinRequest(pinned=True))["pinned"] is True
+    assert csv_profile_pin("0" * 64, CsvProfilePinRequest()).status_code == 404
+    assert csv_profile_delete(signature) == {"deleted": signature}
+    assert csv_profiles_list()["profiles"] == []
@@ -0,0 +1,64 @@
+import pytest
+
+from backend.diff_query import And, DiffIndex, Not, Or, Term, parse_filter
+from backend.schemas import TaskDiff
+
+
+def diff(row_key: str, name: str, *, status="changed", band="green", category="duration_change", cause="unassigned"):
+    return TaskDiff(
+        row_key=row_key,
+        left_uid=1,
+        right_uid=1,
+        left_name=name,
+        right_name=name,
+        status=status,
+        confidence_band=band,
+        change_category=category,
+        cause_tag=cause,
+        confidence=1.0,
+    )
+
+
+def test_parse_filter_precedence_and_aliases():
+    node = parse_filter('band:amber,red change_category:duration_change or not (name:"zone c")')
+    assert node == Or(
+        (
+            And((Term("band", ("amber", "red")), Term("category", ("duration_change",)))),
+            Not(Term("name", ("zone c",))),
+        )
+    )
+    assert parse_filter("input:yes") == Term("input", ("true",))
+
+
+def test_parse_filter_keeps_apostrophes_inside_unquoted_values():
+    assert parse_filter("name:O'Brien") == Term("name", ("o'brien",))
+    assert parse_filter("(name:O'Brien's)") == Term("name", ("o'brien's",))
+    assert parse_filter("name:'zone c',\"slab (east)\"") == Term("name", ("zone c", "slab (east)"))
+
+
+@pytest.mark.parametrize(
+    "text", ["", "band", "colour:red", "band:", "(band:red", "band:red)", "input:maybe", 'name:"zone c']
+)
+def test_parse_filter_rejects_invalid_expressions(text):
+    with pytest.raises(ValueError):
+        parse_filter(text)
+
+
+def test_index_evaluation_and_refresh():
+    rows = [
+        diff("a", "Zone C Slab Pour", band="amber"),
+        diff("b", "Zone C Walls", band="amber", category="date_shift_flow_on"),
+        diff("c", "Zone A Slab Pour", band="amber"),
+        diff("d", "Zone C-Slab pour", band="green"),
+    ]
+    index = DiffIndex(rows)
+
+    assert parse_filter('band:amber category:duration_change name:"zone c"').evaluate(index) == {"a"}
+    assert parse_filter('name:"slab pour" not band:green').evaluate(index) == {"a", "c"}
+    assert parse_filter("cause:client").evaluate(index) == set()
+    assert parse_filter("name:O'Brien").evaluate(DiffIndex([diff("e", "O'Brien Street Works")])) == {"e"}
+
+    rows[2].cause_tag = "client"
+    index.refresh(rows[2])
+    assert parse_filter("cause:client").evaluate(index) == {"c"}
+    assert "c" not in parse_filter("cause:unassigned").evaluate(index)
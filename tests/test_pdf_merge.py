@@ -0,0 +1,44 @@
+import io
+
+import pytest
+from pypdf import PdfReader
+from reportlab.pdfgen import canvas
+
+from backend.pdf_merge import merge_pdfs
+
+
+def _reportlab_pdf(lines: list[str], title: str = "untitled") -> bytes:
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer)
+    c.setTitle(title)
+    for line in lines:
+        c.drawString(72, 720, line)
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def _texts(data: bytes) -> list[list[str]]:
+    return [page.extract_text().split() for page in PdfReader(io.BytesIO(data), strict=True).pages]
+
+
+def test_merge_keeps_every_page_in_order_and_the_first_document_info():
+    parts = [_reportlab_pdf(["Page one text"], title="Notes (3 0 R)"), _reportlab_pdf(["Page two", "Page three"])]
+    merged = merge_pdfs(parts)
+
+    assert _texts(merged) == [["Page", "one", "text"], ["Page", "two"], ["Page", "three"]]
+    assert PdfReader(io.BytesIO(merged)).metadata.title == "Notes (3 0 R)"
+
+
+def test_overlay_is_stamped_on_top_of_each_merged_page():
+    parts = [_reportlab_pdf(["first"]), _reportlab_pdf(["second"])]
+    stamped = merge_pdfs(parts, overlay=_reportlab_pdf(["footer 1", "footer 2"]))
+
+    assert _texts(stamped) == [["first", "footer", "1"], ["second", "footer", "2"]]
+    with pytest.raises(ValueError, match="1 page\\(s\\) for 2 merged"):
+        merge_pdfs(parts, overlay=_reportlab_pdf(["footer 1"]))
+
+
+def test_merge_rejects_parts_it_cannot_read():
+    with pytest.raises(ValueError, match="Cannot read PDF part 2"):
+        merge_pdfs([_reportlab_pdf(["first"]), b"%PDF-1.4\nnot a pdf"])
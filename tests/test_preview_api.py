@@ -5,7 +5,7 @@ import json
 from fastapi.responses import JSONResponse
 from starlette.datastructures import UploadFile
 
-from backend.app import preview_analyze, preview_init, preview_matches_apply, preview_rows
+from backend.app import current_result, preview_analyze, preview_init, preview_matches_apply, preview_result, preview_rows
 from backend.schemas import PreviewAnalyzeRequest, PreviewMatchEditRequest
 
 
@@ -112,6 +112,37 @@ def test_preview_apply_edit_updates_alignment_and_analyze_uses_override():
     )
 
 
+def test_preview_analyze_delta_returns_only_changed_rows():
+    init_response = _init_preview()
+    session_id = init_response["session"]["session_id"]
+
+    first = preview_analyze(PreviewAnalyzeRequest(session_id=session_id, response_mode="delta"))
+    assert first["base_version"] == 0
+    assert first["version"] == 1
+    assert len(first["added"]) == 2
+    assert first["changed"] == [] and first["removed_row_keys"] == []
+    assert first["candidates"] is not None
+    assert first["result_version"] == current_result()["version"]
+
+    repeat = preview_analyze(PreviewAnalyzeRequest(session_id=session_id, response_mode="delta", base_version=1))
+    assert repeat["added"] == [] and repeat["candidates"] is None
+
+    preview_matches_apply(PreviewMatchEditRequest(session_id=session_id, edits=[{"left_uid": 1, "right_uid": 20}]))
+    second = preview_analyze(PreviewAnalyzeRequest(session_id=session_id, response_mode="delta", base_version=2))
+    assert second["base_version"] == 2
+    assert second["version"] == 3
+    assert {row["row_key"] for row in second["added"]} == {"1|20|changed", "2|10|changed"}
+    assert set(second["removed_row_keys"]) == {"1|10|unchanged", "2|20|changed"}
+
+    stale = preview_analyze(PreviewAnalyzeRequest(session_id=session_id, response_mode="delta", base_version=2))
+    assert stale["base_version"] == 0
+    assert len(stale["added"]) == 2
+
+    full = preview_result(session_id=session_id)
+    assert full["version"] == 4
+    assert len(full["result"]["diffs"]) == 2
+
+
 def test_preview_init_rejects_mixed_file_types():
     response = asyncio.run(
         preview_init(
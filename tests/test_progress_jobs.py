@@ -2,20 +2,29 @@ from __future__ import annotations
 
 import asyncio
 import io
+import os
+import threading
 import time
+from datetime import date
+from pathlib import Path
 
 from starlette.datastructures import UploadFile
 
 import backend.app as app_module
 from backend.app import (
     compare_auto_progress,
+    export_pdf_download,
+    export_pdf_progress,
     preview_analyze_progress,
     preview_init,
     preview_init_progress,
+    progress_job_cancel,
     progress_job_status,
 )
+from backend.comparison import compare_tasks
+from backend.pdf_cache import STALE_PARTIAL_SECONDS, PdfCache
 from backend.progress_jobs import ProgressJobStore
-from backend.schemas import PreviewAnalyzeRequest
+from backend.schemas import PreviewAnalyzeRequest, TaskRecord
 
 
 LEFT_CSV = """Unique ID,Task Name,Start,Finish,Duration (mins),% Complete,Predecessors,Summary,Baseline Start,Baseline Finish
@@ -39,7 +48,7 @@ def _wait_job(job_id: str, timeout_seconds: float = 4.0):
     while time.time() < deadline:
         payload = progress_job_status(job_id)
         snapshots.append(payload)
-        if payload["status"] in {"completed", "failed"}:
+        if payload["status"] in {"completed", "failed", "cancelled"}:
             return payload, snapshots
         time.sleep(0.02)
     raise AssertionError(f"Job did not complete in time: {job_id}")
@@ -160,3 +169,116 @@ def test_progress_store_ttl_cleanup():
     store._jobs[job_id].updated_at -= 2  # Force job to be older than TTL.
     store.cleanup()
     assert store.get_job(job_id) is None
+
+
+def test_progress_job_cancel_stops_runner_at_next_update(monkeypatch):
+    release = threading.Event()
+    finished = threading.Event()
+
+    def fake_operation(*, progress=None, **_kwargs):
+        try:
+            progress(10, "Comparing", "Waiting")
+            release.wait(2)
+            progress(60, "Comparing", "Never reported")
+            return {"ok": True}
+        finally:
+            finished.set()
+
+    monkeypatch.setattr(app_module, "_compare_auto_operation", fake_operation)
+    started = asyncio.run(
+        compare_auto_progress(
+            left_file=_upload("left.csv", LEFT_CSV.encode("utf-8")),
+            right_file=_upload("right.csv", RIGHT_CSV.encode("utf-8")),
+            include_baseline=False,
+            overrides_json="[]",
+            left_column_map_json="",
+            right_column_map_json="",
+        )
+    )
+    job_id = started["job_id"]
+    assert progress_job_cancel(job_id)["cancelled"] is True
+    release.set()
+    assert finished.wait(2)
+
+    payload = progress_job_status(job_id)
+    assert payload["status"] == "cancelled"
+    assert payload["result"] is None
+    assert progress_job_cancel(job_id)["cancelled"] is False
+
+
+def _pdf_result(task_count: int):
+    def record(uid: int, finish_day: int) -> TaskRecord:
+        return TaskRecord(
+            uid=uid,
+            name=f"Task {uid}",
+            is_summary=False,
+            start=date(2025, 1, 1),
+            finish=date(2025, 1, finish_day),
+            duration_minutes=480,
+            percent_complete=0,
+            predecessors=[],
+        )
+
+    left = [record(uid, 2) for uid in range(1, task_count + 1)]
+    right = [record(uid, 4) for uid in range(1, task_count + 1)]
+    return compare_tasks(left, right, include_baseline=False)
+
+
+def test_pdf_export_job_reuses_cached_render(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "PDF_CACHE", PdfCache(tmp_path, max_entries=2))
+    monkeypatch.setattr(app_module, "LAST_RESULT", _pdf_result(80))
+    monkeypatch.setattr(app_module, "LAST_ASSIGNMENTS", {})
+    monkeypatch.setattr(app_module, "LAST_RESULT_VERSION", 7)
+
+    payload, _snapshots = _wait_job(export_pdf_progress()["job_id"])
+    assert payload["status"] == "completed"
+    assert payload["result"]["cached"] is False
+    response = export_pdf_download(payload["result"]["cache_key"])
+    assert Path(response.path).read_bytes().startswith(b"%PDF")
+
+    again, _snapshots = _wait_job(export_pdf_progress()["job_id"])
+    assert again["result"] == {**payload["result"], "cached": True}
+    assert [path.name for path in tmp_path.iterdir()] == [Path(response.path).name]
+
+
+def test_pdf_cache_key_follows_result_content_not_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "PDF_CACHE", PdfCache(tmp_path))
+    monkeypatch.setattr(app_module, "LAST_ASSIGNMENTS", {})
+    monkeypatch.setattr(app_module, "LAST_RESULT_VERSION", 1)
+    monkeypatch.setattr(app_module, "LAST_RESULT", _pdf_result(20))
+    first, _snapshots = _wait_job(export_pdf_progress()["job_id"])
+
+    # Same version number after a restart, but a different comparison result.
+    monkeypatch.setattr(app_module, "LAST_RESULT", _pdf_result(21))
+    other, _snapshots = _wait_job(export_pdf_progress()["job_id"])
+    assert other["result"]["cached"] is False
+    assert other["result"]["cache_key"] != first["result"]["cache_key"]
+
+    # Identical content at a different version reuses the rendered file.
+    monkeypatch.setattr(app_module, "LAST_RESULT", _pdf_result(20))
+    monkeypatch.setattr(app_module, "LAST_RESULT_VERSION", 9)
+    again, _snapshots = _wait_job(export_pdf_progress()["job_id"])
+    assert again["result"] == {**first["result"], "cached": True}
+
+
+def test_pdf_cache_evicts_least_recently_used(tmp_path):
+    cache = PdfCache(tmp_path, max_entries=2)
+    for key in ("aa", "bb", "cc"):
+        partial = cache.reserve(key)
+        partial.write_bytes(b"%PDF")
+        cache.commit(key, partial)
+        time.sleep(0.01)
+    assert cache.get("aa") is None
+    assert cache.get("bb") is not None and cache.get("cc") is not None
+
+
+def test_pdf_cache_only_removes_partials_left_by_old_renders(tmp_path):
+    in_progress = PdfCache(tmp_path).reserve("aa")
+    abandoned = PdfCache(tmp_path).reserve("bb")
+    old = time.time() - STALE_PARTIAL_SECONDS - 60
+    os.utime(abandoned, (old, old))
+
+    PdfCache(tmp_path)
+
+    assert in_progress.exists()
+    assert not abandoned.exists()
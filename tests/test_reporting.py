@@ -1,8 +1,13 @@
+import io
 from datetime import date
 
-from backend.attribution import apply_assignments
+from pypdf import PdfReader
+
+from backend.attribution import AttributionAggregates, apply_assignments
+import backend.reporting as reporting_module
 from backend.comparison import compare_tasks
-from backend.reporting import build_csv
+from backend.pdf_cache import PageGroupCache
+from backend.reporting import build_csv, build_pdf, iter_csv_chunks
 from backend.schemas import AttributionAssignment, TaskRecord
 
 
@@ -54,3 +59,172 @@ def test_csv_contains_header_and_rows_with_attribution():
     assert "auto_reason" in csv_data
     assert "Fault Allocation Summary" in csv_data
     assert "SCL Reference" in csv_data
+
+
+def test_streamed_csv_matches_build_csv_and_ignores_later_edits():
+    left = [
+        TaskRecord(
+            uid=uid,
+            name=f"Task {uid}",
+            is_summary=False,
+            start=date(2025, 1, 1),
+            finish=date(2025, 1, 2),
+            duration_minutes=60,
+            percent_complete=0,
+            predecessors=[],
+        )
+        for uid in range(1, 6)
+    ]
+    right = [task.model_copy(update={"finish": date(2025, 1, 5)}) for task in left]
+    result = compare_tasks(left, right, include_baseline=False)
+    aggregates = AttributionAggregates(result)
+
+    snapshot = aggregates.snapshot()
+    expected = build_csv(result)
+    apply_assignments(
+        result,
+        assignments=[
+            AttributionAssignment(row_key=diff.row_key, cause_tag="client", confirm_low_confidence=True)
+            for diff in result.diffs
+        ],
+        aggregates=aggregates,
+    )
+
+    chunks = list(iter_csv_chunks(snapshot, chunk_rows=2))
+    assert len(chunks) == 3
+    assert b"".join(chunks) == expected
+    assert all(diff.cause_tag == "client" for diff in result.diffs)
+    assert b"client" in build_csv(result)
+
+
+def test_pdf_reports_progress_per_page(tmp_path):
+    left = [
+        TaskRecord(
+            uid=uid,
+            name=f"Task {uid}",
+            is_summary=False,
+            start=date(2025, 1, 1),
+            finish=date(2025, 1, 2),
+            duration_minutes=60,
+            percent_complete=0,
+            predecessors=[],
+        )
+        for uid in range(1, 81)
+    ]
+    right = [task.model_copy(update={"finish": date(2025, 1, 5)}) for task in left]
+    result = compare_tasks(left, right, include_baseline=False)
+    calls = []
+
+    build_pdf(result, tmp_path / "pack.pdf", on_page=lambda pages, fraction: calls.append((pages, fraction)))
+
+    assert [pages for pages, _fraction in calls[:-1]] == list(range(1, len(calls)))
+    assert calls[-1] == (len(calls), 1.0)
+    assert len(calls) > 3
+    assert [fraction for _pages, fraction in calls] == sorted(fraction for _pages, fraction in calls)
+
+
+def _page_texts(pdf_bytes: bytes) -> list[list[str]]:
+    """Text lines drawn on each page, the stamped footer last."""
+    return [page.extract_text().splitlines() for page in PdfReader(io.BytesIO(pdf_bytes)).pages]
+
+
+def test_parallel_pdf_matches_serial_pages(tmp_path, monkeypatch):
+    left = [
+        TaskRecord(
+            uid=uid,
+            name=f"Task {uid}",
+            is_summary=False,
+            start=date(2025, 1, 1),
+            finish=date(2025, 1, 2),
+            duration_minutes=60,
+            percent_complete=0,
+            predecessors=[],
+        )
+        for uid in range(1, 121)
+    ]
+    right = [task.model_copy(update={"finish": date(2025, 1, 5)}) for task in left]
+    result = compare_tasks(left, right, include_baseline=False)
+    monkeypatch.setattr(reporting_module, "PDF_GROUP_ROWS", 40)
+
+    serial = build_pdf(result, tmp_path / "serial.pdf").read_bytes()
+    progress = []
+    parallel = build_pdf(
+        result, tmp_path / "parallel.pdf", on_page=lambda pages, fraction: progress.append(pages), workers=2
+    ).read_bytes()
+
+    pages = _page_texts(serial)
+    assert _page_texts(parallel) == pages
+    assert pages[0][-1] == f"Page 1 of {len(pages)}"
+    assert len(progress) > 1 and progress[-1] == len(pages)
+
+
+def test_pdf_rerender_after_edit_only_renders_changed_group(tmp_path, monkeypatch):
+    left = [
+        TaskRecord(
+            uid=uid,
+            name=f"Task {uid}",
+            is_summary=False,
+            start=date(2025, 1, 1),
+            finish=date(2025, 1, 2),
+            duration_minutes=60,
+            percent_complete=0,
+            predecessors=[],
+        )
+        for uid in range(1, 91)
+    ]
+    right = [task.model_copy(update={"finish": date(2025, 1, 5)}) for task in left]
+    result = compare_tasks(left, right, include_baseline=False)
+    monkeypatch.setattr(reporting_module, "PDF_GROUP_ROWS", 30)
+    cache = PageGroupCache()
+
+    build_pdf(result, tmp_path / "first.pdf", page_cache=cache)
+    assert len(cache) == 3
+    apply_assignments(
+        result,
+        assignments=[
+            AttributionAssignment(row_key=result.diffs[40].row_key, cause_tag="client", confirm_low_confidence=True)
+        ],
+    )
+    rendered = []
+    original = reporting_module._render_group
+    monkeypatch.setattr(
+        reporting_module, "_render_group", lambda items, *args: rendered.append(items) or original(items, *args)
+    )
+    cached = build_pdf(result, tmp_path / "cached.pdf", page_cache=cache).read_bytes()
+
+    assert len(rendered) == 1 and len(cache) == 4
+    assert _page_texts(cached) == _page_texts(build_pdf(result, tmp_path / "fresh.pdf").read_bytes())
+
+
+def test_pdf_group_cache_ignores_page_numbering(tmp_path, monkeypatch):
+    left = [
+        TaskRecord(
+            uid=uid,
+            name=f"Task {uid}",
+            is_summary=False,
+            start=date(2025, 1, 1),
+            finish=date(2025, 1, 2),
+            duration_minutes=60,
+            percent_complete=0,
+            predecessors=[],
+        )
+        for uid in range(1, 91)
+    ]
+    right = [task.model_copy(update={"finish": date(2025, 1, 5)}) for task in left]
+    result = compare_tasks(left, right, include_baseline=False)
+    monkeypatch.setattr(reporting_module, "PDF_GROUP_ROWS", 30)
+    cache = PageGroupCache()
+    build_pdf(result, tmp_path / "full.pdf", page_cache=cache)
+
+    # Dropping the first group shifts every later page number, but not the groups' content.
+    shorter = result.model_copy(update={"diffs": result.diffs[30:]})
+    rendered = []
+    original = reporting_module._render_group
+    monkeypatch.setattr(
+        reporting_module, "_render_group", lambda items, *args: rendered.append(items) or original(items, *args)
+    )
+    pages = _page_texts(build_pdf(shorter, tmp_path / "shorter.pdf", page_cache=cache).read_bytes())
+
+    assert rendered == []
+    assert [texts[-1] for texts in pages] == [f"Page {n} of {len(pages)}" for n in range(1, len(pages) + 1)]
+    assert pages == _page_texts(build_pdf(shorter, tmp_path / "fresh.pdf").read_bytes())
@@ -0,0 +1,94 @@
+import asyncio
+import io
+from datetime import date
+
+from starlette.datastructures import UploadFile
+
+from backend.app import compare_auto_stream, result_diffs
+from backend.comparison import compare_tasks, compare_tasks_to_store
+from backend.result_store import ResultStore
+from backend.schemas import TaskRecord
+
+
+LEFT_CSV = """Unique ID,Task Name,Start,Finish,Duration (mins),% Complete,Predecessors,Summary,Baseline Start,Baseline Finish
+1,Excavate,2025-01-01,2025-01-03,1440,100,,0,2025-01-01,2025-01-03
+2,Pour Concrete,2025-01-04,2025-01-06,1440,50,1FS,0,2025-01-04,2025-01-06
+3,Strip Formwork,2025-01-07,2025-01-08,480,0,2FS,0,2025-01-07,2025-01-08
+"""
+
+RIGHT_CSV = """Unique ID,Task Name,Start,Finish,Duration (mins),% Complete,Predecessors,Summary,Baseline Start,Baseline Finish
+10,Excavate,2025-01-01,2025-01-03,1440,100,,0,2025-01-01,2025-01-03
+20,Pour Concrete,2025-01-05,2025-01-07,1440,30,10FS,0,2025-01-05,2025-01-07
+40,Backfill,2025-01-09,2025-01-10,480,0,20FS,0,2025-01-09,2025-01-10
+"""
+
+
+def task(uid: int, name: str, start: date, finish: date, *, duration: int = 480, predecessors=None):
+    return TaskRecord(
+        uid=uid,
+        name=name,
+        start=start,
+        finish=finish,
+        duration_minutes=duration,
+        percent_complete=0,
+        predecessors=predecessors or [],
+    )
+
+
+def _upload(filename: str, content: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+def test_streamed_compare_matches_in_memory_compare():
+    left = [
+        task(1, "Root", date(2025, 1, 1), date(2025, 1, 2)),
+        task(2, "Downstream", date(2025, 1, 3), date(2025, 1, 4), predecessors=[1]),
+        task(3, "Removed", date(2025, 1, 3), date(2025, 1, 4)),
+        task(4, "Slipped", date(2025, 1, 3), date(2025, 1, 4)),
+    ]
+    right = [
+        task(1, "Root", date(2025, 1, 1), date(2025, 1, 4), duration=960),
+        task(22, "Downstream", date(2025, 1, 5), date(2025, 1, 6), predecessors=[1]),
+        task(44, "Slipped", date(2025, 1, 3), date(2025, 1, 9)),
+        task(5, "Added", date(2025, 1, 3), date(2025, 1, 4)),
+    ]
+    assignment_map = {"4|44|changed": {"cause_tag": "client", "confirm_low_confidence": True}}
+
+    expected = compare_tasks(left, right, include_baseline=False, assignment_map=assignment_map)
+    store = ResultStore()
+    try:
+        streamed = compare_tasks_to_store(left, right, include_baseline=False, store=store, assignment_map=assignment_map)
+        rows = store.page_diffs(0, 100)
+    finally:
+        store.close()
+
+    assert streamed.summary == expected.summary
+    assert streamed.fault_allocation == expected.fault_allocation
+    assert streamed.total_rows == len(expected.diffs)
+    assert [row.model_dump() for row in rows] == [diff.model_dump() for diff in expected.diffs]
+
+
+def test_compare_stream_endpoint_pages_from_store():
+    payload = asyncio.run(
+        compare_auto_stream(
+            left_file=_upload("left.csv", LEFT_CSV.encode("utf-8")),
+            right_file=_upload("right.csv", RIGHT_CSV.encode("utf-8")),
+            include_baseline=False,
+            overrides_json="[]",
+            left_column_map_json="",
+            right_column_map_json="",
+        )
+    )
+    assert payload["summary"]["total_left_leaf_tasks"] == 3
+    assert payload["total_rows"] == 3
+    assert "diffs" not in payload
+
+    first = result_diffs(payload["result_id"], offset=0, limit=2)
+    second = result_diffs(payload["result_id"], offset=2, limit=2)
+    assert first["has_more"] is True
+    assert second["has_more"] is False
+    keys = [row["row_key"] for row in first["diffs"] + second["diffs"]]
+    assert len(set(keys)) == 3
+
+    missing = result_diffs("does-not-exist")
+    assert missing.status_code == 404
@@ -0,0 +1,102 @@
+from datetime import date
+
+import backend.app as app_module
+from backend.app import rollup
+from backend.comparison import compare_tasks
+from backend.rollup import RollupTree, summary_paths
+from backend.schemas import TaskRecord
+
+
+def task(uid: int, name: str, finish: date, *, level: int, summary: bool = False, duration: int = 480):
+    return TaskRecord(
+        uid=uid,
+        name=name,
+        outline_level=level,
+        is_summary=summary,
+        start=date(2025, 1, 1),
+        finish=finish,
+        duration_minutes=duration,
+        percent_complete=0,
+    )
+
+
+LEFT = [
+    task(100, "Zone A", date(2025, 1, 10), level=1, summary=True),
+    task(1, "Excavate A", date(2025, 1, 5), level=2),
+    task(2, "Pour A", date(2025, 1, 10), level=2),
+    task(200, "Zone B", date(2025, 1, 10), level=1, summary=True),
+    task(210, "Level 1", date(2025, 1, 10), level=2, summary=True),
+    task(3, "Slab B1", date(2025, 1, 10), level=3),
+    task(4, "Demolish B1", date(2025, 1, 10), level=3),
+]
+
+RIGHT = [
+    task(100, "Zone A", date(2025, 1, 14), level=1, summary=True),
+    task(1, "Excavate A", date(2025, 1, 9), level=2),
+    task(2, "Pour A", date(2025, 1, 10), level=2),
+    task(200, "Zone B", date(2025, 1, 16), level=1, summary=True),
+    task(210, "Level 1", date(2025, 1, 16), level=2, summary=True),
+    task(3, "Slab B1", date(2025, 1, 16), level=3, duration=960),
+]
+
+
+def test_summary_paths_follow_outline_levels_and_wbs():
+    assert summary_paths(LEFT)[3] == ("Zone B", "Level 1")
+    assert summary_paths(LEFT)[1] == ("Zone A",)
+
+    by_wbs = [
+        TaskRecord(uid=10, name="Zone C", wbs="1", is_summary=True),
+        TaskRecord(uid=11, name="Fit out", wbs="1.1"),
+    ]
+    assert summary_paths(by_wbs)[11] == ("Zone C",)
+
+
+def test_rollup_aggregates_leaf_diffs_up_the_tree():
+    result = compare_tasks(LEFT, RIGHT, include_baseline=False)
+    tree = RollupTree(result.diffs, LEFT, RIGHT)
+
+    root = tree.node(0)
+    assert root.row_count == 4
+    assert root.slippage_days == 10.0
+
+    zones = {node.name: node for node in tree.children(0)}
+    assert set(zones) == {"Zone A", "Zone B"}
+    assert zones["Zone A"].row_count == 2
+    assert zones["Zone A"].slippage_days == 4.0
+    assert zones["Zone B"].row_count == 2
+    assert zones["Zone B"].category_counts.get("removed") == 1
+    assert zones["Zone B"].direct_row_count == 0
+
+    level_1 = tree.children(zones["Zone B"].node_id)[0]
+    assert level_1.path == ["Zone B", "Level 1"]
+    assert level_1.slippage_days == 6.0
+    assert level_1.cause_days["unassigned"] == 6.0
+
+
+def test_rollup_endpoint_expands_children_lazily(monkeypatch):
+    # _set_last_result rebinds these module globals; monkeypatch restores them afterwards.
+    for name in (
+        "LAST_RESULT",
+        "LAST_ASSIGNMENTS",
+        "LAST_TASKS",
+        "LAST_COMPARISON_ID",
+        "LAST_RESULT_VERSION",
+        "LAST_INPUT_FILES",
+        "LAST_AGGREGATES",
+        "LAST_HISTORY",
+        "PREVIOUS_RESULT",
+        "PREVIOUS_ASSIGNMENTS",
+    ):
+        monkeypatch.setattr(app_module, name, getattr(app_module, name))
+    result = compare_tasks(LEFT, RIGHT, include_baseline=False)
+    app_module._set_last_result(result, LEFT, RIGHT)
+
+    top = rollup(node_id=0)
+    assert top["node"]["row_count"] == 4
+    assert [child["name"] for child in top["children"]] == ["Zone A", "Zone B"]
+    assert top["rows"] == []
+
+    zone_a = rollup(node_id=top["children"][0]["node_id"], include_rows=True)
+    assert {row["left_name"] for row in zone_a["rows"]} == {"Excavate A", "Pour A"}
+
+    assert rollup(node_id=999).status_code == 404
@@ -0,0 +1,174 @@
+from datetime import date
+
+import pytest
+
+import backend.app as app_module
+from backend.app import attribution_rules, attribution_undo
+from backend.assignment_store import AssignmentStore
+from backend.attribution import AttributionAggregates, apply_assignments
+from backend.comparison import compare_tasks
+from backend.rules import compile_rules, index_hierarchy, plan_rule_assignments
+from backend.schemas import AttributionAssignment, AttributionRule, AttributionRulesRequest, TaskRecord
+
+
+def task(uid, name, finish, *, wbs, level, summary=False, duration=480, predecessors=None):
+    return TaskRecord(
+        uid=uid,
+        name=name,
+        wbs=wbs,
+        outline_level=level,
+        is_summary=summary,
+        start=date(2024, 11, 1),
+        finish=finish,
+        duration_minutes=duration,
+        percent_complete=0,
+        predecessors=predecessors or [],
+    )
+
+
+LEFT = [
+    task(1, "External Works", date(2024, 12, 20), wbs="1", level=1, summary=True),
+    task(10, "Paving", date(2024, 12, 10), wbs="1.1", level=2),
+    task(11, "Landscaping", date(2024, 12, 12), wbs="1.2", level=2),
+    task(2, "Client Package", date(2024, 12, 20), wbs="2", level=1, summary=True),
+    task(20, "Steel Erection", date(2024, 12, 10), wbs="2.1", level=2),
+    task(21, "Cladding", date(2024, 12, 12), wbs="2.2", level=2),
+]
+RIGHT = [
+    task(1, "External Works", date(2025, 1, 20), wbs="1", level=1, summary=True),
+    task(10, "Paving", date(2024, 12, 18), wbs="1.1", level=2, duration=960),
+    task(11, "Landscaping", date(2025, 6, 12), wbs="1.2", level=2, duration=960),
+    task(2, "Client Package", date(2025, 1, 20), wbs="2", level=1, summary=True),
+    task(20, "Steel Erection", date(2024, 12, 16), wbs="2.1", level=2, predecessors=[10]),
+    task(21, "Cladding", date(2024, 12, 18), wbs="2.2", level=2, predecessors=[11]),
+]
+
+RULES = [
+    AttributionRule(rule_id="winter-weather", when='summary:"external works" month:dec,jan,feb', reason_code="weather"),
+    AttributionRule(
+        rule_id="client-package-logic",
+        when="wbs:2 category:predecessor_change",
+        cause_tag="client",
+        reason_code="instruction_change",
+        confirm_low_confidence=True,
+    ),
+    AttributionRule(rule_id="steel", when="name:steel", cause_tag="contractor"),
+]
+
+
+def _prepared():
+    result = compare_tasks(LEFT, RIGHT, include_baseline=False)
+    aggregates = AttributionAggregates(result)
+    index_hierarchy(aggregates.index, result.diffs, LEFT, RIGHT)
+    return result, aggregates
+
+
+def test_rules_resolve_cause_and_reason_by_precedence():
+    result, aggregates = _prepared()
+    by_name = {diff.left_name: diff for diff in result.diffs}
+    assert by_name["Steel Erection"].change_category == "predecessor_change"
+
+    assignments, rule_hits, report = plan_rule_assignments(compile_rules(RULES), aggregates, {})
+
+    planned = {item.row_key: item for item in assignments}
+    paving = planned[by_name["Paving"].row_key]
+    steel = planned[by_name["Steel Erection"].row_key]
+    assert (paving.cause_tag, paving.reason_code) == ("unassigned", "weather")
+    assert (steel.cause_tag, steel.reason_code) == ("client", "instruction_change")
+    assert rule_hits[by_name["Steel Erection"].row_key] == ["client-package-logic", "steel"]
+    assert by_name["Landscaping"].row_key not in planned
+    assert report.rule_counts == {"winter-weather": 1, "client-package-logic": 2, "steel": 1}
+
+
+def test_rules_skip_user_assignments_and_release_rows_when_rules_change():
+    result, aggregates = _prepared()
+    by_name = {diff.left_name: diff.row_key for diff in result.diffs}
+    result, assignment_map = apply_assignments(
+        result,
+        [AttributionAssignment(row_key=by_name["Cladding"], cause_tag="neutral", confirm_low_confidence=True)],
+        aggregates=aggregates,
+    )
+
+    assignments, rule_hits, _ = plan_rule_assignments(compile_rules(RULES), aggregates, assignment_map)
+    assert by_name["Cladding"] not in {item.row_key for item in assignments}
+    result, assignment_map = apply_assignments(
+        result, assignments, assignment_map=assignment_map, aggregates=aggregates, rule_hits=rule_hits
+    )
+    steel = aggregates.diff_by_key[by_name["Steel Erection"]]
+    assert steel.cause_tag == "client"
+    assert steel.rule_hits == ["client-package-logic", "steel"]
+
+    assignments, rule_hits, _ = plan_rule_assignments(compile_rules(RULES[2:]), aggregates, assignment_map)
+    apply_assignments(result, assignments, assignment_map=assignment_map, aggregates=aggregates, rule_hits=rule_hits)
+    assert (steel.cause_tag, steel.reason_code, steel.rule_hits) == ("contractor", "", ["steel"])
+    paving = aggregates.diff_by_key[by_name["Paving"]]
+    assert (paving.reason_code, paving.rule_hits) == ("", [])
+
+
+def test_compile_rules_rejects_invalid_rules():
+    with pytest.raises(ValueError, match="must set"):
+        compile_rules([AttributionRule(rule_id="empty", when="band:red")])
+    with pytest.raises(ValueError, match="Duplicate"):
+        compile_rules([RULES[2], RULES[2]])
+    with pytest.raises(ValueError, match="Rule broken"):
+        compile_rules([AttributionRule(rule_id="broken", when="colour:red", cause_tag="client")])
+
+
+def _isolate_app_state(monkeypatch):
+    monkeypatch.setattr(app_module, "ACTIVE_RULES", [])
+    # _set_last_result rebinds these module globals; monkeypatch restores them afterwards.
+    for name in (
+        "LAST_RESULT",
+        "LAST_ASSIGNMENTS",
+        "LAST_TASKS",
+        "LAST_COMPARISON_ID",
+        "LAST_RESULT_VERSION",
+        "LAST_INPUT_FILES",
+        "LAST_AGGREGATES",
+        "LAST_HISTORY",
+        "PREVIOUS_RESULT",
+        "PREVIOUS_ASSIGNMENTS",
+    ):
+        monkeypatch.setattr(app_module, name, getattr(app_module, name))
+
+
+def test_rules_endpoint_applies_and_undoes(monkeypatch):
+    _isolate_app_state(monkeypatch)
+    app_module._set_last_result(compare_tasks(LEFT, RIGHT, include_baseline=False), LEFT, RIGHT)
+
+    response = attribution_rules(AttributionRulesRequest(rules=RULES))
+    assert response["report"]["rows_updated"] == 3
+    assert [rule["rule_id"] for rule in app_module.attribution_rules_list()["rules"]] == [rule.rule_id for rule in RULES]
+    tags = {diff.left_name: diff.cause_tag for diff in app_module.LAST_RESULT.diffs}
+    assert tags["Steel Erection"] == "client"
+
+    attribution_undo()
+    assert all(not diff.rule_hits for diff in app_module.LAST_RESULT.diffs)
+
+
+def test_rule_provenance_and_rule_set_survive_a_restart(monkeypatch, tmp_path):
+    _isolate_app_state(monkeypatch)
+    store = AssignmentStore(tmp_path / "assignments.sqlite3")
+    monkeypatch.setattr(app_module, "ASSIGNMENT_STORE", store)
+    app_module._set_last_result(compare_tasks(LEFT, RIGHT, include_baseline=False), LEFT, RIGHT, "cmp")
+    attribution_rules(AttributionRulesRequest(rules=RULES))
+    store.close()
+
+    # A restart reopens the store and re-compares: the tags must still belong to the rules.
+    store = AssignmentStore(tmp_path / "assignments.sqlite3")
+    monkeypatch.setattr(app_module, "ASSIGNMENT_STORE", store)
+    monkeypatch.setattr(app_module, "ACTIVE_RULES", app_module._load_active_rules())
+    monkeypatch.setattr(app_module, "LAST_RESULT", None)
+    assert [compiled.rule for compiled in app_module.ACTIVE_RULES] == RULES
+    assignment_map = app_module._get_assignment_map("cmp")
+    result = compare_tasks(LEFT, RIGHT, include_baseline=False, assignment_map=assignment_map)
+    app_module._set_last_result(result, LEFT, RIGHT, "cmp", assignment_map)
+    steel = next(diff for diff in app_module.LAST_RESULT.diffs if diff.left_name == "Steel Erection")
+    assert (steel.cause_tag, steel.rule_hits) == ("client", ["client-package-logic", "steel"])
+
+    response = attribution_rules(AttributionRulesRequest(rules=RULES[2:]))
+    assert response["report"]["rows_updated"] == 3
+    rows = {diff.left_name: diff for diff in app_module.LAST_RESULT.diffs}
+    assert (rows["Steel Erection"].cause_tag, rows["Steel Erection"].reason_code) == ("contractor", "")
+    assert (rows["Paving"].reason_code, rows["Paving"].rule_hits) == ("", [])
+    store.close()
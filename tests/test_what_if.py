@@ -0,0 +1,123 @@
+from datetime import date
+
+import pytest
+
+from backend import what_if
+from backend.attribution import apply_assignments
+from backend.comparison import compare_tasks
+from backend.schemas import AttributionAssignment, CauseWeights, TaskRecord, WhatIfRequest
+from backend.what_if import collect_what_if_inputs, run_what_if
+
+
+def task(uid: int, name: str, start: date, finish: date, duration: int = 480):
+    return TaskRecord(
+        uid=uid,
+        name=name,
+        start=start,
+        finish=finish,
+        duration_minutes=duration,
+        percent_complete=0,
+        predecessors=[],
+    )
+
+
+def _result():
+    left = [task(index, f"Task {index}", date(2025, 1, 1), date(2025, 1, 2)) for index in range(1, 7)]
+    right = [
+        task(index, f"Task {index}", date(2025, 1, 1), date(2025, 1, 2 + index), duration=480 * (index + 1))
+        for index in range(1, 7)
+    ]
+    result = compare_tasks(left, right, include_baseline=False)
+    by_name = {diff.left_name: diff.row_key for diff in result.diffs}
+    result, _ = apply_assignments(
+        result,
+        [AttributionAssignment(row_key=by_name["Task 1"], cause_tag="contractor", confirm_low_confidence=True)],
+    )
+    return result, by_name
+
+
+def _run(result, request: WhatIfRequest):
+    return run_what_if(collect_what_if_inputs(result, request), request)
+
+
+def test_what_if_bands_bracket_uncertain_rows():
+    result, _ = _result()
+    report = _run(result, WhatIfRequest(samples=400, seed=7))
+
+    assert report.uncertain_rows == 5
+    assert report.engine == ("numpy" if what_if.np is not None else "python")
+    total_unassigned = result.fault_allocation.task_slippage_days.unassigned_days
+    total = sum(band.mean for band in report.task_slippage_days.values())
+    assert total == pytest.approx(total_unassigned + 1.0, abs=0.01)
+    for band in report.task_slippage_days.values():
+        assert band.percentiles["p5"] <= band.percentiles["p50"] <= band.percentiles["p95"]
+    # The contractor-tagged row is fixed, so contractor can never fall below it.
+    assert report.task_slippage_days["contractor"].percentiles["p5"] >= 1.0
+
+
+def test_what_if_row_and_category_weights_take_precedence():
+    result, by_name = _result()
+    request = WhatIfRequest(
+        samples=50,
+        seed=1,
+        default_weights=CauseWeights(client=0, contractor=0, neutral=1),
+        row_weights={by_name["Task 6"]: CauseWeights(client=1, contractor=0, neutral=0)},
+    )
+    report = _run(result, request)
+
+    client = report.task_slippage_days["client"]
+    assert client.percentiles["p5"] == client.percentiles["p95"] == 6.0
+    assert report.task_slippage_days["neutral"].mean == 2.0 + 3.0 + 4.0 + 5.0
+
+
+def test_what_if_rejects_invalid_weights():
+    result, _ = _result()
+    with pytest.raises(ValueError):
+        collect_what_if_inputs(result, WhatIfRequest(default_weights=CauseWeights(client=0, contractor=0, neutral=0)))
+    with pytest.raises(ValueError):
+        collect_what_if_inputs(result, WhatIfRequest(percentiles=[150]))
+
+
+def test_numpy_and_python_samplers_agree_on_deterministic_weights(monkeypatch):
+    pytest.importorskip("numpy")
+    result, _ = _result()
+    request = WhatIfRequest(samples=20, default_weights=CauseWeights(client=1, contractor=0, neutral=0))
+    vectorized = _run(result, request)
+    monkeypatch.setattr(what_if, "np", None)
+    assert _run(result, request).task_slippage_days == vectorized.task_slippage_days
+
+
+def test_python_sampler_is_capped_per_request(monkeypatch):
+    result, _ = _result()
+    monkeypatch.setattr(what_if, "np", None)
+    monkeypatch.setattr(what_if, "PYTHON_SAMPLE_CELL_LIMIT", 100)
+    assert collect_what_if_inputs(result, WhatIfRequest(samples=20)).task_days
+    with pytest.raises(ValueError, match="at most 20 samples"):
+        collect_what_if_inputs(result, WhatIfRequest(samples=21))
+
+
+def test_python_sampler_is_repeatable_for_one_seed(monkeypatch):
+    result, _ = _result()
+    request = WhatIfRequest(samples=500, seed=11)
+    monkeypatch.setattr(what_if, "np", None)
+    first = _run(result, request)
+    assert first.engine == "python"
+    assert _run(result, request) == first
+    assert _run(result, request.model_copy(update={"seed": 12})) != first
+
+
+def test_numpy_and_python_samplers_agree_for_one_seed(monkeypatch):
+    pytest.importorskip("numpy")
+    result, _ = _result()
+    request = WhatIfRequest(samples=4000, seed=11)
+    vectorized = _run(result, request)
+    assert _run(result, request) == vectorized
+    monkeypatch.setattr(what_if, "np", None)
+    fallback = _run(result, request)
+
+    assert (vectorized.engine, fallback.engine) == ("numpy", "python")
+    for party in what_if.PARTIES:
+        # Different generators, same distribution: means agree to well within sampling error.
+        assert fallback.task_slippage_days[party].mean == pytest.approx(
+            vectorized.task_slippage_days[party].mean, abs=0.4
+        )
@@ -0,0 +1,126 @@
+import asyncio
+import io
+import json
+from datetime import date
+
+from starlette.datastructures import UploadFile
+
+import backend.app as app_module
+from backend.app import export_windows_csv, windows_analyze
+from backend.assignment_store import comparison_identity
+from backend.comparison import compare_tasks
+from backend.schemas import TaskRecord
+from backend.windows import ProgrammeUpdate, analyze_windows
+
+
+def task(uid: int, name: str, start: date, finish: date, *, duration: int = 480, predecessors=None):
+    return TaskRecord(
+        uid=uid,
+        name=name,
+        start=start,
+        finish=finish,
+        duration_minutes=duration,
+        percent_complete=0,
+        predecessors=predecessors or [],
+    )
+
+
+def _updates() -> list[ProgrammeUpdate]:
+    return [
+        ProgrammeUpdate(
+            label="Update 1",
+            data_date=date(2025, 1, 1),
+            tasks=[
+                task(1, "Excavate", date(2025, 1, 1), date(2025, 1, 5)),
+                task(2, "Pour", date(2025, 1, 6), date(2025, 1, 10), predecessors=[1]),
+            ],
+        ),
+        ProgrammeUpdate(
+            label="Update 2",
+            data_date=date(2025, 2, 1),
+            tasks=[
+                task(1, "Excavate", date(2025, 1, 1), date(2025, 1, 8), duration=960),
+                task(2, "Pour", date(2025, 1, 9), date(2025, 1, 13), predecessors=[1]),
+            ],
+        ),
+        ProgrammeUpdate(
+            label="Update 3",
+            data_date=date(2025, 3, 1),
+            tasks=[
+                task(1, "Excavate", date(2025, 1, 1), date(2025, 1, 8), duration=960),
+                task(2, "Pour", date(2025, 1, 9), date(2025, 1, 20), duration=960, predecessors=[1]),
+            ],
+        ),
+    ]
+
+
+def test_windows_report_tracks_movement_per_window_and_matches_pairwise_compare():
+    updates = _updates()
+    report = analyze_windows(updates, max_workers=1)
+
+    assert [window.period_days for window in report.windows] == [31, 28]
+    assert [window.finish_movement_days for window in report.windows] == [3.0, 7.0]
+    assert report.total_finish_movement_days == 10.0
+    assert report.total_period_days == 59
+
+    for window, (before, after) in zip(report.windows, zip(updates, updates[1:])):
+        expected = compare_tasks(before.tasks, after.tasks, include_baseline=False)
+        assert window.summary == expected.summary
+        assert window.fault_allocation == expected.fault_allocation
+
+
+def test_windows_parallel_matches_serial():
+    serial = analyze_windows(_updates(), max_workers=1)
+    parallel = analyze_windows(_updates(), max_workers=2)
+    assert parallel == serial
+
+
+def test_windows_endpoint_and_csv_export():
+    header = "Unique ID,Task Name,Start,Finish,Duration (mins),% Complete,Predecessors,Summary\n"
+    files = [
+        UploadFile(file=io.BytesIO((header + "1,Excavate,2025-01-01,2025-01-05,480,0,,0\n").encode()), filename="u1.csv"),
+        UploadFile(file=io.BytesIO((header + "1,Excavate,2025-01-01,2025-01-09,960,0,,0\n").encode()), filename="u2.csv"),
+    ]
+    payload = asyncio.run(
+        windows_analyze(
+            files=files,
+            data_dates_json=json.dumps(["2025-01-01", "2025-01-15"]),
+            include_baseline=False,
+            column_map_json="",
+        )
+    )
+    assert payload["windows"][0]["period_days"] == 14
+    assert payload["windows"][0]["finish_movement_days"] == 4.0
+
+    response = export_windows_csv()
+    text = response.body.decode("utf-8")
+    assert "finish_movement_days" in text
+    assert "Combined Fault Allocation" in text
+
+
+def test_windows_only_use_tags_recorded_for_their_own_files(monkeypatch):
+    header = "Unique ID,Task Name,Start,Finish,Duration (mins),% Complete,Predecessors,Summary\n"
+    first = (header + "1,Excavate,2025-01-01,2025-01-05,480,0,,0\n").encode()
+    second = (header + "1,Excavate,2025-01-01,2025-01-09,960,0,,0\n").encode()
+    client = {"cause_tag": "client", "reason_code": "", "confirm_low_confidence": True, "override_auto": False}
+    monkeypatch.setattr(app_module, "ASSIGNMENT_STORE", None)
+    monkeypatch.setattr(app_module, "LAST_WINDOWS_REPORT", None)
+    monkeypatch.setattr(app_module, "LAST_ASSIGNMENTS", {"1|1|changed": client})
+
+    def client_days() -> float:
+        files = [UploadFile(file=io.BytesIO(data), filename=f"u{n}.csv") for n, data in ((1, first), (2, second))]
+        payload = asyncio.run(
+            windows_analyze(
+                files=files,
+                data_dates_json=json.dumps(["2025-01-01", "2025-01-15"]),
+                include_baseline=False,
+                column_map_json="",
+            )
+        )
+        return payload["fault_allocation"]["task_slippage_days"]["client_days"]
+
+    # Same row key, but the tag belongs to an unrelated comparison.
+    monkeypatch.setattr(app_module, "LAST_COMPARISON_ID", "unrelated")
+    assert client_days() == 0.0
+    monkeypatch.setattr(app_module, "LAST_COMPARISON_ID", comparison_identity(first, second))
+    assert client_days() == 4.0
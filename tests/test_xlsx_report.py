@@ -0,0 +1,76 @@
+import io
+import zipfile
+from datetime import date
+from xml.etree import ElementTree
+
+from backend.comparison import compare_tasks
+from backend.schemas import TaskRecord
+from backend.xlsx_report import build_xlsx, iter_xlsx_chunks
+
+NS = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def task(uid: int, name: str, start: date, finish: date, minutes: int, predecessors: list[int] | None = None):
+    return TaskRecord(
+        uid=uid,
+        name=name,
+        is_summary=False,
+        start=start,
+        finish=finish,
+        duration_minutes=minutes,
+        percent_complete=0,
+        predecessors=predecessors or [],
+    )
+
+
+def _result():
+    left = [
+        task(1, "Excavate <zone A>", date(2025, 1, 1), date(2025, 1, 3), 1440),
+        task(2, "Pour", date(2025, 1, 4), date(2025, 1, 6), 1440, [1]),
+    ]
+    right = [
+        task(1, "Excavate <zone A>", date(2025, 1, 1), date(2025, 1, 5), 2400),
+        task(20, "Pour", date(2025, 1, 6), date(2025, 1, 8), 1440, [1]),
+    ]
+    return compare_tasks(left, right, include_baseline=False)
+
+
+def _sheet(archive: zipfile.ZipFile, index: int) -> ElementTree.Element:
+    return ElementTree.fromstring(archive.read(f"xl/worksheets/sheet{index}.xml"))
+
+
+def test_xlsx_has_typed_columns_frozen_header_and_extra_sheets():
+    result = _result()
+    archive = zipfile.ZipFile(io.BytesIO(build_xlsx(result)))
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    assert [sheet.get("name") for sheet in workbook.iter(f"{{{NS['m']}}}sheet")] == [
+        "Evidence",
+        "Fault Allocation",
+        "Flow-on Provenance",
+    ]
+
+    evidence = _sheet(archive, 1)
+    assert evidence.find("m:sheetViews/m:sheetView/m:pane", NS).get("state") == "frozen"
+    rows = evidence.findall("m:sheetData/m:row", NS)
+    assert len(rows) == 1 + len(result.diffs)
+    header = {cell.get("r")[:-1]: "".join(cell.itertext()) for cell in rows[0]}
+    cells = {header[cell.get("r")[:-1]]: cell for cell in rows[1]}
+    assert cells["requires_user_input"].get("t") == "b"
+    assert cells["task_slippage_days"].get("t") is None
+    assert cells["right_finish"].get("s") == "1"
+    assert cells["right_finish"].find("m:v", NS).text == str((date(2025, 1, 5) - date(1899, 12, 30)).days)
+    assert "".join(cells["left_name"].itertext()) == "Excavate <zone A>"
+
+    fault_rows = _sheet(archive, 2).findall("m:sheetData/m:row", NS)
+    assert ["".join(cell.itertext()) for cell in fault_rows[1]][:2] == ["project_finish_impact_days", "client_days"]
+
+    provenance = _sheet(archive, 3).findall("m:sheetData/m:row", NS)
+    assert len(provenance) == 2
+    assert ["".join(cell.itertext()) for cell in provenance[1]][:2] == ["20", "Pour"]
+
+
+def test_xlsx_streams_in_bounded_chunks():
+    result = _result()
+    chunks = list(iter_xlsx_chunks(result))
+    assert b"".join(chunks) == build_xlsx(result)
+    assert zipfile.ZipFile(io.BytesIO(b"".join(chunks))).testzip() is None